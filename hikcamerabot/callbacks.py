@@ -26,7 +26,7 @@ from hikcamerabot.event_engine.events.inbound import (
     IrcutConfEvent,
     StreamEvent,
 )
-from hikcamerabot.utils.shared import bold, send_text
+from hikcamerabot.utils.shared import bold, format_stats, send_text
 
 log = logging.getLogger(__name__)
 
@@ -152,6 +152,16 @@ async def cmd_app_version(bot: CameraBot, message: Message) -> None:  # noqa: AR
     await send_text(text=text, message=message, quote=True)
 
 
+@authorization_check
+async def cmd_stats(bot: CameraBot, message: Message) -> None:
+    """Show runtime stats of queues, processes, alert streams and API clients."""
+    text = '\n\n'.join(
+        f'{bold(section)}\n{format_stats(stats) or "-"}'
+        for section, stats in bot.get_stats().items()
+    )
+    await send_text(text=text, message=message, quote=True)
+
+
 @authorization_check
 async def cmd_list_group_cams(bot: CameraBot, message: Message) -> None:
     meta = bot.cam_registry.get_group(message.command[0])
@@ -441,6 +451,7 @@ async def cmd_help(
     text = (
         'Use /list_cams to show cameras and their commands\n'
         'Use /groups to show camera groups\n'
-        'Use /version to check the bot version'
+        'Use /version to check the bot version\n'
+        'Use /stats to show runtime stats'
     )
     await send_text(text=text, message=message, quote=True)
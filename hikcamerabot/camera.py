@@ -1,6 +1,5 @@
 """Hikvision camera module."""
 
-import asyncio
 import logging
 from datetime import datetime
 from io import BytesIO
@@ -10,9 +9,10 @@ from pyrogram.types import Message
 
 from hikcamerabot.clients.hikvision import HikvisionAPI, HikvisionAPIClient
 from hikcamerabot.clients.hikvision.enums import IrcutFilterType
+from hikcamerabot.common.snapshot import SnapshotCoalescer
 from hikcamerabot.common.video.videogif_recorder import VideoGifRecorder
 from hikcamerabot.config.schemas.main_config import CameraConfigSchema
-from hikcamerabot.enums import VideoGifType
+from hikcamerabot.enums import PictureType, VideoGifType
 from hikcamerabot.exceptions import HikvisionAPIError, HikvisionCamError
 from hikcamerabot.services.abstract import AbstractService
 from hikcamerabot.services.alarm import AlarmService
@@ -114,8 +114,11 @@ class HikvisionCam:
         self.is_behind_nvr = conf.nvr.is_behind
         self.nvr_channel_name = conf.nvr.channel_name
 
-        self._api = HikvisionAPI(api_client=HikvisionAPIClient(conf=conf.api))
+        self._api = HikvisionAPI(
+            api_client=HikvisionAPIClient.get_shared(conf=conf.api)
+        )
         self._img_processor = ImageProcessor()
+        self._snapshots = SnapshotCoalescer(cache_ttl=conf.picture.cache_ttl_ms / 1000)
 
         self.services = ServiceContainer(
             conf=conf,
@@ -142,13 +145,64 @@ class HikvisionCam:
     ) -> None:
         self._videogif.start_rec(video_type=video_type, rewind=rewind, message=message)
 
+    def follow_alert_event(self, event_end_at: float) -> None:
+        self._videogif.follow_alert_event(event_end_at)
+
+    async def start_video_rings(self) -> None:
+        await self._videogif.start_rings()
+
     async def set_ircut_filter(self, filter_type: IrcutFilterType) -> None:
         await self._api.set_ircut_filter(filter_type)
 
     async def take_snapshot(
-        self, channel: int, resize: bool = False
+        self,
+        channel: int,
+        resize: bool = False,
+        picture_type: PictureType = PictureType.ON_DEMAND,
+    ) -> tuple[BytesIO, int]:
+        """Take and return full or resized snapshot from the camera.
+
+        Snapshot is resized with the resize profile configured for the picture
+        type. Concurrent calls for the same channel share one API request.
+        """
+        raw_snapshot, taken_at = await self._snapshots.get(
+            key=(channel, None),
+            take=lambda: self._take_raw_snapshot(channel),
+        )
+        if not resize:
+            return BytesIO(raw_snapshot), taken_at
+
+        profile_name = self._get_resize_profile_name(picture_type)
+        resized_snapshot, _ = await self._snapshots.get(
+            key=(channel, profile_name, taken_at),
+            take=lambda: self._resize_snapshot(raw_snapshot, taken_at, profile_name),
+        )
+        return BytesIO(resized_snapshot), taken_at
+
+    async def process_snapshot(
+        self,
+        raw_snapshot: bytes,
+        taken_at: int,
+        resize: bool = False,
+        picture_type: PictureType = PictureType.ON_ALERT,
     ) -> tuple[BytesIO, int]:
-        """Take and return full or resized snapshot from the camera."""
+        """Return full or resized snapshot received without API request.
+
+        E.g. detection picture attached to alert stream event.
+        """
+        if not resize:
+            return BytesIO(raw_snapshot), taken_at
+        resized_snapshot, _ = await self._resize_snapshot(
+            raw_snapshot, taken_at, self._get_resize_profile_name(picture_type)
+        )
+        return BytesIO(resized_snapshot), taken_at
+
+    def _get_resize_profile_name(self, picture_type: PictureType) -> str:
+        return self.conf.picture.get_schema_by_type(
+            type_=picture_type.value
+        ).resize_profile
+
+    async def _take_raw_snapshot(self, channel: int) -> tuple[bytes, int]:
         self._log.debug('[%s] Taking snapshot', self.id)
         try:
             image_obj = await self._api.take_snapshot(channel=channel)
@@ -159,22 +213,20 @@ class HikvisionCam:
 
         taken_at = int(datetime.now().timestamp())
         self._increase_snapshot_count()
+        return image_obj.getvalue(), taken_at
 
+    async def _resize_snapshot(
+        self, raw_snapshot: bytes, taken_at: int, profile_name: str
+    ) -> tuple[bytes, int]:
         try:
-            return (
-                await asyncio.get_running_loop().run_in_executor(
-                    None, lambda: self._img_processor.resize(image_obj)
-                )
-                if resize
-                else image_obj,
-                taken_at,
-            )
+            resized = await self._img_processor.resize(raw_snapshot, profile_name)
         except Exception as err:
             err_msg = (
                 f'[{self.id}] Failed to resize snapshot taken from {self.description}'
             )
             self._log.exception(err_msg)
             raise HikvisionCamError(err_msg) from err
+        return resized, taken_at
 
     def _increase_snapshot_count(self) -> None:
         self.snapshots_taken += 1
@@ -2,17 +2,24 @@
 
 import asyncio
 import logging
+from typing import Any
 
 from pyrogram import Client
 
+from hikcamerabot.clients.hikvision.api_client import HikvisionAPIClient
 from hikcamerabot.config.config import main_conf
 from hikcamerabot.event_engine.dispatchers.inbound import InboundEventDispatcher
 from hikcamerabot.event_engine.dispatchers.outbound import OutboundEventDispatcher
+from hikcamerabot.event_engine.queue import get_result_queue
 from hikcamerabot.event_engine.workers.manager import ResultWorkerManager
 from hikcamerabot.registry import CameraRegistry
+from hikcamerabot.services.alarm.listener import AlertHttpListener
+from hikcamerabot.services.alarm.multiplexer import AlertStreamMultiplexer
 from hikcamerabot.services.alarm.nvr.tasks.alarm_monitoring_task import (
     NvrAlarmMonitoringTask,
 )
+from hikcamerabot.services.stream.supervisor import StreamProcessSupervisor
+from hikcamerabot.utils.process_scheduler import get_process_scheduler
 from hikcamerabot.utils.task import create_task
 
 
@@ -37,12 +44,32 @@ class CameraBot(Client):
         self.inbound_dispatcher = InboundEventDispatcher(bot=self)
         self.outbound_dispatcher = OutboundEventDispatcher(bot=self)
         self.result_worker_manager = ResultWorkerManager(self.outbound_dispatcher)
+        self.alert_stream_multiplexer = AlertStreamMultiplexer(
+            listener_conf=main_conf.alert_listener
+        )
+        self.alert_listener: AlertHttpListener | None = None
+        if main_conf.alert_listener.enabled:
+            self.alert_listener = AlertHttpListener(
+                conf=main_conf.alert_listener,
+                multiplexer=self.alert_stream_multiplexer,
+            )
+        self.stream_supervisor = StreamProcessSupervisor()
 
     def start_tasks(self) -> None:
         """Start and forget async launch per camera tasks. They start all
         enabled services on user cameras like motion detection etc.
         """
         self.result_worker_manager.start_worker_tasks()
+        self.alert_stream_multiplexer.start()
+        if self.alert_listener:
+            task_name = 'Alert listener task'
+            create_task(
+                self.alert_listener.start(),
+                task_name=task_name,
+                logger=self._log,
+                exception_message='Task "%s" raised an exception',
+                exception_message_args=(task_name,),
+            )
         self._start_nvr_services()
         for cam in self.cam_registry.get_instances():
             task_name = f'{cam.id} launch task'
@@ -53,6 +80,14 @@ class CameraBot(Client):
                 exception_message='Task "%s" raised an exception',
                 exception_message_args=(task_name,),
             )
+            task_name = f'{cam.id} video ring task'
+            create_task(
+                cam.start_video_rings(),
+                task_name=task_name,
+                logger=self._log,
+                exception_message='Task "%s" raised an exception',
+                exception_message_args=(task_name,),
+            )
 
     def _start_nvr_services(self) -> None:
         """Start NVR services which replace per-camera services due the nature of the setup."""
@@ -63,15 +98,20 @@ class CameraBot(Client):
                 nvr_host,
                 nvr_cameras,
             )
-            task_name = f'{NvrAlarmMonitoringTask.__name__}_{nvr_host}'
-            create_task(
-                NvrAlarmMonitoringTask(host=nvr_host, cameras=cameras).run(),
-                task_name=task_name,
-                logger=self._log,
-                exception_message='Task "%s" raised an exception',
-                exception_message_args=(task_name,),
+            self.alert_stream_multiplexer.add_source(
+                NvrAlarmMonitoringTask(host=nvr_host, cameras=cameras)
             )
 
+    def get_stats(self) -> dict[str, Any]:
+        """Return runtime stats of shared bot components."""
+        return {
+            'Result queue': get_result_queue().stats(),
+            'Process scheduler': get_process_scheduler().stats(),
+            'Stream processes': self.stream_supervisor.stats(),
+            'Alert streams': self.alert_stream_multiplexer.stats(),
+            'API clients': HikvisionAPIClient.get_shared_stats(),
+        }
+
     async def run_forever(self) -> None:
         """That's how we roll."""
         while True:
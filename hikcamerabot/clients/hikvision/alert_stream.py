@@ -0,0 +1,354 @@
+"""Hikvision ISAPI alert stream parser module.
+
+The alert stream is a never-ending `multipart/mixed` HTTP response where each
+part is one `<EventNotificationAlert>` XML document, optionally followed by an
+`image/jpeg` part with the detection picture. Parts can be split across any
+number of TCP reads, so the parser buffers raw bytes and emits an event only
+when its part is complete.
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Final
+
+from hikcamerabot.clients.hikvision.enums import AlertEventState
+from hikcamerabot.enums import DetectionEventName
+
+_DEFAULT_BOUNDARY: Final[bytes] = b'boundary'
+_CRLF: Final[bytes] = b'\r\n'
+_HEADERS_END: Final[bytes] = b'\r\n\r\n'
+_DOC_END_TAG: Final[bytes] = b'</EventNotificationAlert>'
+_IMAGE_CONTENT_TYPE: Final[bytes] = b'image/jpeg'
+
+# Devices send `videoloss` event in `inactive` state about every second as a
+# keep-alive. These make up most of the traffic and carry no useful information.
+_EVENT_TYPE_TAG: Final[bytes] = b'<eventType>'
+_HEARTBEAT_EVENT_TYPE: Final[bytes] = b'videoloss<'
+_HEARTBEAT_EVENT_STATE: Final[bytes] = b'<eventState>inactive<'
+
+# Smart events usually come with a picture when "Upload picture" linkage is on.
+_SMART_EVENT_TYPES: Final[frozenset[str]] = frozenset(
+    (DetectionEventName.INTRUSION.value, DetectionEventName.LINE.value)
+)
+
+
+@dataclass(slots=True)
+class AlertStreamEvent:
+    """Decoded `<EventNotificationAlert>` document."""
+
+    event_type: str
+    state: AlertEventState | None
+    channel_id: int | None
+    dyn_channel_id: int | None
+    channel_name: str | None
+    timestamp: datetime | None
+    active_post_count: int | None
+    # Address of the sending device, used to match pushed events.
+    ip_address: str | None = None
+    # Detection picture from the following part, a view of the stream buffer.
+    image: memoryview | None = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.state is AlertEventState.ACTIVE
+
+
+@dataclass(slots=True)
+class AlertStreamStats:
+    """Alert stream throughput counters."""
+
+    bytes_total: int = 0
+    events_total: int = 0
+    heartbeats_total: int = 0
+    detections_total: int = 0
+    images_total: int = 0
+    parse_time_total: float = 0.0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def add_detection(self) -> None:
+        self.detections_total += 1
+
+    def as_dict(self) -> dict[str, float]:
+        """Return totals along with per second rates since counting started."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            'bytes_total': self.bytes_total,
+            'events_total': self.events_total,
+            'heartbeats_total': self.heartbeats_total,
+            'detections_total': self.detections_total,
+            'images_total': self.images_total,
+            'parse_time_total': self.parse_time_total,
+            'bytes_per_sec': self.bytes_total / elapsed,
+            'events_per_sec': self.events_total / elapsed,
+            'heartbeats_per_sec': self.heartbeats_total / elapsed,
+            'detections_per_sec': self.detections_total / elapsed,
+            'parse_time_per_sec': self.parse_time_total / elapsed,
+        }
+
+
+def get_boundary(content_type: str | None) -> bytes | None:
+    """Return multipart boundary from `Content-Type` header value.
+
+    Return `None` when the stream is not `multipart/*` (some firmwares send bare
+    concatenated XML documents).
+    """
+    if not content_type or not content_type.lower().startswith('multipart/'):
+        return None
+    for param in content_type.split(';')[1:]:
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'boundary' and value:
+            return value.strip('"').encode()
+    return _DEFAULT_BOUNDARY
+
+
+class AlertStreamParser:
+    """Incremental alert stream parser.
+
+    Feed raw bytes as they come from the socket and get back every event whose
+    document has been fully received. Incomplete data stays buffered until the
+    next `feed` call.
+
+    In multipart streams, events of smart event types and of any type which
+    has once come with a picture are held back until the next part starts, so
+    they are emitted along with the picture. Emitted events are never changed:
+    picture of an event which wasn't held, e.g. the first motion event of a
+    device uploading pictures for it, is dropped. Call `flush` at the end of
+    a complete body to get the event still held.
+    """
+
+    def __init__(
+        self,
+        boundary: bytes | None = _DEFAULT_BOUNDARY,
+        stats: AlertStreamStats | None = None,
+    ) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._delimiter = b'--' + boundary if boundary else None
+        self._stats = stats or AlertStreamStats()
+
+        self._buf: bytes = b''
+        self._pos: int = 0
+
+        # Chunks are joined lazily only when there is a chance to complete a part.
+        self._pending: list[bytes] = []
+        self._pending_len: int = 0
+
+        # Size of the part body being awaited (from `Content-Length`), if known.
+        self._body_len: int | None = None
+        self._content_type: bytes | None = None
+        self._in_part: bool = False
+
+        # Event parsed from the previous part, the picture part belongs to it.
+        self._last_event: AlertStreamEvent | None = None
+        self._held_event: AlertStreamEvent | None = None
+        self._image_event_types: set[str] = (
+            set(_SMART_EVENT_TYPES) if self._delimiter else set()
+        )
+
+    def feed(self, data: bytes) -> list[AlertStreamEvent]:
+        """Consume next piece of the stream and return completed events."""
+        if not data:
+            return []
+        self._stats.bytes_total += len(data)
+        self._pending.append(data)
+        self._pending_len += len(data)
+        if (
+            self._body_len is not None
+            and len(self._buf) - self._pos + self._pending_len < self._body_len
+        ):
+            return []
+
+        start = time.perf_counter()
+        self._join_pending()
+        events: list[AlertStreamEvent] = []
+        for content_type, body in self._iter_bodies():
+            if content_type and content_type.startswith(_IMAGE_CONTENT_TYPE):
+                self._attach_image(body, events)
+                continue
+            self._release_held_event(events)
+            doc = bytes(body)
+            if _is_heartbeat(doc):
+                self._last_event = None
+                self._stats.heartbeats_total += 1
+                continue
+            event = self._last_event = self._parse_document(doc)
+            if not event:
+                continue
+            if event.event_type in self._image_event_types:
+                self._held_event = event
+            else:
+                events.append(event)
+        self._stats.events_total += len(events)
+        self._stats.parse_time_total += time.perf_counter() - start
+        return events
+
+    def flush(self) -> list[AlertStreamEvent]:
+        """Return the held event when no more parts follow, e.g. body end."""
+        events: list[AlertStreamEvent] = []
+        self._release_held_event(events)
+        self._last_event = None
+        self._stats.events_total += len(events)
+        return events
+
+    def _attach_image(self, image: memoryview, events: list[AlertStreamEvent]) -> None:
+        event = self._last_event
+        self._last_event = None
+        if not event:
+            return
+        if event is not self._held_event:
+            # Already emitted, hold next events of this type for their picture.
+            self._image_event_types.add(event.event_type)
+            return
+        event.image = image
+        self._stats.images_total += 1
+        self._release_held_event(events)
+
+    def _release_held_event(self, events: list[AlertStreamEvent]) -> None:
+        if self._held_event:
+            events.append(self._held_event)
+            self._held_event = None
+
+    def _join_pending(self) -> None:
+        self._buf = b''.join((self._buf[self._pos :], *self._pending))
+        self._pos = 0
+        self._pending.clear()
+        self._pending_len = 0
+
+    def _iter_bodies(self) -> Iterator[tuple[bytes | None, memoryview]]:
+        """Yield content type and body of every completed part.
+
+        Bodies are zero-copy slices of the buffer, which stays alive while they
+        are referenced.
+        """
+        if self._delimiter is None:
+            yield from self._iter_bare_documents()
+        else:
+            yield from self._iter_multipart_bodies()
+
+    def _iter_bare_documents(self) -> Iterator[tuple[None, memoryview]]:
+        view = memoryview(self._buf)
+        while True:
+            end = self._buf.find(_DOC_END_TAG, self._pos)
+            if end == -1:
+                return
+            end += len(_DOC_END_TAG)
+            body = view[self._pos : end]
+            self._pos = end
+            yield None, body
+
+    def _iter_multipart_bodies(self) -> Iterator[tuple[bytes | None, memoryview]]:
+        buf = self._buf
+        view = memoryview(buf)
+        while True:
+            if not self._in_part:
+                start = buf.find(self._delimiter, self._pos)
+                if start == -1:
+                    # Keep just enough bytes to match a delimiter split in two.
+                    self._pos = max(self._pos, len(buf) - len(self._delimiter))
+                    return
+                headers_start = start + len(self._delimiter)
+                headers_end = buf.find(_HEADERS_END, headers_start)
+                if headers_end == -1:
+                    self._pos = start
+                    return
+                self._body_len, self._content_type = self._parse_headers(
+                    buf[headers_start:headers_end]
+                )
+                self._pos = headers_end + len(_HEADERS_END)
+                self._in_part = True
+
+            if self._body_len is not None:
+                body_end = self._pos + self._body_len
+                if body_end > len(buf):
+                    return
+            else:
+                body_end = buf.find(self._delimiter, self._pos)
+                if body_end == -1:
+                    # Do not wait for the next part if the document is complete.
+                    body_end = buf.find(_DOC_END_TAG, self._pos)
+                    if body_end == -1:
+                        return
+                    body_end += len(_DOC_END_TAG)
+
+            body = view[self._pos : body_end]
+            self._pos = body_end
+            self._in_part = False
+            self._body_len = None
+            yield self._content_type, body
+
+    def _parse_headers(self, headers: bytes) -> tuple[int | None, bytes | None]:
+        """Return part `Content-Length` and lowercase `Content-Type` values."""
+        content_length = content_type = None
+        for line in headers.split(_CRLF):
+            name, _, value = line.partition(b':')
+            name = name.strip().lower()
+            if name == b'content-length':
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    self._log.warning('Invalid alert stream part header: %s', line)
+            elif name == b'content-type':
+                content_type = value.strip().lower()
+        return content_length, content_type
+
+    def _parse_document(self, body: bytes) -> AlertStreamEvent | None:
+        event_type = _get_tag_value(body, b'eventType')
+        if event_type is None:
+            self._log.debug('Skipping non-event alert stream part: %s', body[:100])
+            return None
+        state = _get_tag_value(body, b'eventState')
+        return AlertStreamEvent(
+            event_type=event_type.decode(),
+            state=AlertEventState(state.decode())
+            if state in (b'active', b'inactive')
+            else None,
+            channel_id=_to_int(_get_tag_value(body, b'channelID')),
+            dyn_channel_id=_to_int(_get_tag_value(body, b'dynChannelID')),
+            channel_name=_to_str(_get_tag_value(body, b'channelName')),
+            timestamp=_to_datetime(_get_tag_value(body, b'dateTime')),
+            active_post_count=_to_int(_get_tag_value(body, b'activePostCount')),
+            ip_address=_to_str(_get_tag_value(body, b'ipAddress')),
+        )
+
+
+def _is_heartbeat(doc: bytes) -> bool:
+    """Check raw document for `videoloss`/`inactive` keep-alive event."""
+    pos = doc.find(_EVENT_TYPE_TAG)
+    return (
+        pos != -1
+        and doc.startswith(_HEARTBEAT_EVENT_TYPE, pos + len(_EVENT_TYPE_TAG))
+        and doc.find(_HEARTBEAT_EVENT_STATE, pos) != -1
+    )
+
+
+def _get_tag_value(doc: bytes, tag: bytes) -> bytes | None:
+    """Return stripped text of the first `<tag>...</tag>` element in a document."""
+    open_tag = b'<' + tag + b'>'
+    start = doc.find(open_tag)
+    if start == -1:
+        return None
+    start += len(open_tag)
+    end = doc.find(b'</' + tag + b'>', start)
+    if end == -1:
+        return None
+    return doc[start:end].strip()
+
+
+def _to_int(value: bytes | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def _to_str(value: bytes | None) -> str | None:
+    return value.decode(errors='replace') if value else None
+
+
+def _to_datetime(value: bytes | None) -> datetime | None:
+    try:
+        return datetime.fromisoformat(value.decode()) if value else None
+    except ValueError:
+        return None
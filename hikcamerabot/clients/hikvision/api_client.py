@@ -9,9 +9,17 @@ from tenacity import retry, stop_after_attempt, wait_fixed
 
 from hikcamerabot.clients.hikvision.auth import DigestAuthCached
 from hikcamerabot.clients.hikvision.enums import AuthType, EndpointAddr
-from hikcamerabot.config.schemas.main_config import CamAPISchema
+from hikcamerabot.clients.hikvision.transport import StatsHTTPTransport
+from hikcamerabot.config.schemas.main_config import (
+    CamAPIConnPoolSchema,
+    CamAPISchema,
+)
 from hikcamerabot.constants import CONN_TIMEOUT
-from hikcamerabot.exceptions import APIBadResponseCodeError, APIRequestError
+from hikcamerabot.exceptions import (
+    APIBadResponseCodeError,
+    APIRequestError,
+    ConfigError,
+)
 
 _RETRY_WAIT: Final[float] = 0.5
 _RETRY_STOP_AFTER_ATTEMPT: Final[int] = 3
@@ -28,19 +36,96 @@ class HikvisionAPIClient:
         AuthType.DIGEST_CACHED: DigestAuthCached,
     }
 
+    # Clients shared by cameras with the same API host and credentials,
+    # e.g. cameras behind the same NVR.
+    _SHARED: ClassVar[dict[tuple[str, int, str], 'HikvisionAPIClient']] = {}
+
     def __init__(self, conf: CamAPISchema) -> None:
         self._log = logging.getLogger(self.__class__.__name__)
         self._conf = conf
         self.host = self._conf.host
         self.port = self._conf.port
+
+        self._auth = self.AUTH_CLS[AuthType(self._conf.auth.type)](
+            username=self._conf.auth.user,
+            password=self._conf.auth.password,
+        )
+        pools_conf = self._conf.connection_pools
+        self._request_transport = self._build_transport(pools_conf.request)
+        self._stream_transport = self._build_transport(pools_conf.stream)
         self.session = httpx.AsyncClient(
-            auth=self.AUTH_CLS[AuthType(self._conf.auth.type)](
-                username=self._conf.auth.user,
-                password=self._conf.auth.password,
+            auth=self._auth, transport=self._request_transport
+        )
+        self.stream_session = httpx.AsyncClient(
+            auth=self._auth, transport=self._stream_transport
+        )
+
+    @classmethod
+    def get_shared(cls, conf: CamAPISchema) -> 'HikvisionAPIClient':
+        """Get API client shared by all cameras with the same host and user.
+
+        Raise `ConfigError` when the rest of the API config of the cameras,
+        e.g. password or connection pools, differs.
+        """
+        key = (conf.host, conf.port, conf.auth.user)
+        try:
+            client = cls._SHARED[key]
+        except KeyError:
+            client = cls._SHARED[key] = cls(conf=conf)
+            return client
+        if client._conf != conf:
+            raise ConfigError(
+                f'API client for {conf.host}:{conf.port} user "{conf.auth.user}" '
+                f'is already created with a different config'
+            )
+        return client
+
+    @staticmethod
+    def _build_transport(conf: CamAPIConnPoolSchema) -> StatsHTTPTransport:
+        return StatsHTTPTransport(
+            verify=False,
+            retries=3,
+            limits=httpx.Limits(
+                max_connections=conf.max_connections,
+                max_keepalive_connections=conf.max_keepalive_connections,
+                keepalive_expiry=conf.keepalive_expiry,
             ),
-            transport=httpx.AsyncHTTPTransport(verify=False, retries=3),
         )
 
+    @classmethod
+    def get_shared_stats(cls) -> dict[str, dict[str, Any]]:
+        """Return stats of every shared API client."""
+        return {
+            f'{host}:{port} ({user})': {
+                'pools': client.get_pool_stats(),
+                'auth': client.get_auth_stats(),
+            }
+            for (host, port, user), client in cls._SHARED.items()
+        }
+
+    def get_pool_stats(self) -> dict[str, dict[str, int | float]]:
+        """Connection pool statistics of stream and request pools."""
+        return {
+            'stream': self._stream_transport.get_stats(),
+            'request': self._request_transport.get_stats(),
+        }
+
+    def get_auth_stats(self) -> dict[str, int]:
+        """Digest authentication counters of the host, empty for other auth types.
+
+        Every request of a host with the challenge cached takes one round trip,
+        `retries_total` counts the extra ones.
+        """
+        if not isinstance(self._auth, DigestAuthCached):
+            return {}
+        # Same URL as requests have, authentication state is kept per its host.
+        return DigestAuthCached.get_stats(
+            url=httpx.URL(self.build_url('/')), username=self._conf.auth.user
+        ).as_dict()
+
+    def build_url(self, endpoint: EndpointAddr | str) -> str:
+        return urljoin(f'{self.host}:{self.port}', endpoint)
+
     @retry(
         wait=wait_fixed(_RETRY_WAIT),
         stop=stop_after_attempt(_RETRY_STOP_AFTER_ATTEMPT),
@@ -54,7 +139,7 @@ class HikvisionAPIClient:
         method: str = 'GET',
         timeout: float = CONN_TIMEOUT,  # noqa: ASYNC109
     ) -> httpx.Response:
-        url = urljoin(f'{self.host}:{self.port}', endpoint)
+        url = self.build_url(endpoint)
         self._log.debug('Request: %s - %s - %s', method, url, data)
         try:
             response = await self.session.request(
@@ -4,6 +4,7 @@ from hikcamerabot.clients.hikvision import HikvisionAPIClient
 from hikcamerabot.clients.hikvision.endpoints.endpoints import (
     AlertStreamEndpoint,
     ExposureEndpoint,
+    HttpHostEndpoint,
     IrcutFilterEndpoint,
     SwitchEndpoint,
     TakeSnapshotEndpoint,
@@ -22,3 +23,4 @@ class HikvisionAPI:
         self.set_ircut_filter = IrcutFilterEndpoint(api_client)
         self.set_exposure = ExposureEndpoint(api_client)
         self.switch = SwitchEndpoint(api_client)
+        self.set_http_host = HttpHostEndpoint(api_client)
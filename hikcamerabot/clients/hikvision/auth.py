@@ -1,19 +1,79 @@
 from collections.abc import Generator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, ClassVar
+from urllib.request import parse_http_list
 
 import httpx
 
+if TYPE_CHECKING:
+    from httpx._auth import _DigestAuthChallenge
+
+
+@dataclass(slots=True)
+class DigestAuthStats:
+    """Digest authentication counters of a host."""
+
+    requests_total: int = 0
+    # Requests sent with the cached challenge, without waiting for 401.
+    preemptive_total: int = 0
+    # Extra round trips: 401 responses answered with a new challenge.
+    retries_total: int = 0
+    # Retries due to expired nonce (`stale=true`).
+    stale_total: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return {
+            'requests_total': self.requests_total,
+            'preemptive_total': self.preemptive_total,
+            'retries_total': self.retries_total,
+            'stale_total': self.stale_total,
+        }
+
+
+@dataclass(slots=True)
+class _DigestHostState:
+    challenge: '_DigestAuthChallenge | None' = None
+    nonce_count: int = 0
+    stats: DigestAuthStats = field(default_factory=DigestAuthStats)
+
 
 class DigestAuthCached(httpx.DigestAuth):
-    """Hack from https://github.com/encode/httpx/issues/1467."""
+    """Preemptive digest authentication.
 
-    __challenge = None
+    Based on the hack from https://github.com/encode/httpx/issues/1467.
+    The last challenge of a host is shared by all instances authenticating as
+    the same user, e.g. every client of cameras behind the same NVR, and is
+    sent up front with nonce count increasing per request, so requests take
+    one round trip. Nonce count starts over with every new nonce. When the
+    host rejects the cached nonce, e.g. expired one with `stale=true`, the
+    request is retried once with the new challenge.
+    """
+
+    _HOSTS: ClassVar[dict[tuple[str, int | None, bytes], _DigestHostState]] = {}
+
+    @classmethod
+    def get_stats(cls, url: httpx.URL, username: str) -> DigestAuthStats:
+        """Return authentication counters of the host the URL points to."""
+        return cls._get_host_state(url, username.encode()).stats
+
+    @classmethod
+    def _get_host_state(cls, url: httpx.URL, username: bytes) -> _DigestHostState:
+        key = (url.host, url.port, username)
+        try:
+            return cls._HOSTS[key]
+        except KeyError:
+            state = cls._HOSTS[key] = _DigestHostState()
+            return state
 
     def auth_flow(
         self, request: httpx.Request
     ) -> Generator[httpx.Request, httpx.Response]:
-        if self.__challenge:
-            request.headers['Authorization'] = self._build_auth_header(
-                request, self.__challenge
+        state = self._get_host_state(request.url, self._username)
+        state.stats.requests_total += 1
+        if state.challenge:
+            state.stats.preemptive_total += 1
+            request.headers['Authorization'] = self._build_host_auth_header(
+                request, state
             )
 
         response = yield request
@@ -31,8 +91,29 @@ class DigestAuthCached(httpx.DigestAuth):
             # header, then we don't need to build an authenticated request.
             return
 
-        self.__challenge = self._parse_challenge(request, response, auth_header)
-        request.headers['Authorization'] = self._build_auth_header(
-            request, self.__challenge
-        )
+        state.stats.retries_total += 1
+        if _is_stale(auth_header):
+            state.stats.stale_total += 1
+        state.challenge = self._parse_challenge(request, response, auth_header)
+        state.nonce_count = 0
+        request.headers['Authorization'] = self._build_host_auth_header(request, state)
+        if response.cookies:
+            httpx.Cookies(response.cookies).set_cookie_header(request=request)
         yield request
+
+    def _build_host_auth_header(
+        self, request: httpx.Request, state: _DigestHostState
+    ) -> str:
+        # Header is built synchronously, so concurrent requests never reuse `nc`.
+        state.nonce_count += 1
+        self._nonce_count = state.nonce_count
+        return self._build_auth_header(request, state.challenge)
+
+
+def _is_stale(auth_header: str) -> bool:
+    _, _, fields = auth_header.partition(' ')
+    for param in parse_http_list(fields):
+        name, _, value = param.strip().partition('=')
+        if name.lower() == 'stale':
+            return value.strip('"').lower() == 'true'
+    return False
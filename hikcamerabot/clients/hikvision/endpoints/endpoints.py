@@ -1,10 +1,17 @@
+import ipaddress
 from collections.abc import AsyncGenerator
 from io import BytesIO
 from typing import Any
-from urllib.parse import urljoin
+from xml.sax.saxutils import escape as xml_escape
 
 import httpx
 
+from hikcamerabot.clients.hikvision.alert_stream import (
+    AlertStreamEvent,
+    AlertStreamParser,
+    AlertStreamStats,
+    get_boundary,
+)
 from hikcamerabot.clients.hikvision.endpoints.abstract import AbstractEndpoint
 from hikcamerabot.clients.hikvision.endpoints.config_switch import CameraConfigSwitch
 from hikcamerabot.clients.hikvision.enums import (
@@ -144,21 +151,74 @@ class TakeSnapshotEndpoint(AbstractEndpoint):
 class AlertStreamEndpoint(AbstractEndpoint):
     _METHOD: str = 'GET'
 
-    async def __call__(self) -> AsyncGenerator[str]:
-        # TODO: Rewrite this.
-        url = urljoin(
-            f'{self._api_client.host}:{self._api_client.port}',
-            EndpointAddr.ALERT_STREAM,
-        )
+    async def __call__(
+        self, stats: AlertStreamStats | None = None
+    ) -> AsyncGenerator[AlertStreamEvent]:
+        url = self._api_client.build_url(EndpointAddr.ALERT_STREAM)
         timeout = httpx.Timeout(CONN_TIMEOUT, read=300)
         response: httpx.Response
-        self._log.debug('Alert StreamType Request: %s - %s', self._METHOD, url)
-        async with self._api_client.session.stream(
+        self._log.debug('Alert Stream Request: %s - %s', self._METHOD, url)
+        async with self._api_client.stream_session.stream(
             self._METHOD, url, timeout=timeout
         ) as response:
-            chunk: str
-            async for chunk in response.aiter_text():
-                yield chunk
+            parser = AlertStreamParser(
+                boundary=get_boundary(response.headers.get('content-type')),
+                stats=stats,
+            )
+            data: bytes
+            async for data in response.aiter_bytes():
+                for event in parser.feed(data):
+                    yield event
+
+
+class HttpHostEndpoint(AbstractEndpoint):
+    """Point device event notifications to the HTTP listener of the bot."""
+
+    _XML_PAYLOAD_TPL: str = (
+        '<HttpHostNotification>'
+        '<id>{host_id}</id>'
+        '<url>{path}</url>'
+        '<protocolType>HTTP</protocolType>'
+        '<parameterFormatType>XML</parameterFormatType>'
+        '<addressingFormatType>{addressing_type}</addressingFormatType>'
+        '<{address_tag}>{address}</{address_tag}>'
+        '<portNo>{port}</portNo>'
+        '<httpAuthenticationMethod>none</httpAuthenticationMethod>'
+        '</HttpHostNotification>'
+    )
+
+    async def __call__(
+        self, address: str, port: int, path: str, host_id: int = 1
+    ) -> None:
+        try:
+            response = await self._api_client.request(
+                endpoint=EndpointAddr.HTTP_HOST.value.format(host_id=host_id),
+                headers=XML_HEADERS,
+                data=self._build_payload(
+                    address=address, port=port, path=path, host_id=host_id
+                ),
+                method='PUT',
+            )
+        except APIRequestError:
+            self._log.error('Failed to set HTTP notification host %s', host_id)
+            raise
+        self._validate_xml_response(response)
+
+    def _build_payload(self, address: str, port: int, path: str, host_id: int) -> str:
+        try:
+            ipaddress.ip_address(address)
+        except ValueError:
+            addressing_type, address_tag = 'hostname', 'hostName'
+        else:
+            addressing_type, address_tag = 'ipaddress', 'ipAddress'
+        return self._XML_PAYLOAD_TPL.format(
+            host_id=host_id,
+            path=xml_escape(path),
+            addressing_type=addressing_type,
+            address_tag=address_tag,
+            address=xml_escape(address),
+            port=port,
+        )
 
 
 class SwitchEndpoint(AbstractEndpoint):
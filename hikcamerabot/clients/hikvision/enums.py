@@ -8,9 +8,10 @@ class AuthType(BaseUniqueChoiceStrEnum):
 
 
 class EndpointAddr(BaseUniqueChoiceStrEnum):
-    ALERT_STREAM = 'ISAPI/EventType/notification/alertStream'
+    ALERT_STREAM = 'ISAPI/Event/notification/alertStream'
     CHANNEL_CAPABILITIES = 'ISAPI/Image/channels/1/capabilities'
     EXPOSURE = 'ISAPI/Image/channels/1/exposure'
+    HTTP_HOST = 'ISAPI/Event/notification/httpHosts/{host_id}'
     IRCUT_FILTER = 'ISAPI/Image/channels/1/ircutFilter'
     INTRUSION_DETECTION = 'ISAPI/Smart/FieldDetection/1'
     LINE_CROSSING_DETECTION = 'ISAPI/Smart/LineDetection/1'
@@ -18,6 +19,11 @@ class EndpointAddr(BaseUniqueChoiceStrEnum):
     PICTURE = 'ISAPI/Streaming/channels/{channel}/picture?snapShotImageType=JPEG'
 
 
+class AlertEventState(BaseUniqueChoiceStrEnum):
+    ACTIVE = 'active'
+    INACTIVE = 'inactive'
+
+
 class IrcutFilterType(BaseUniqueChoiceStrEnum):
     AUTO = 'auto'
     DAY = 'day'
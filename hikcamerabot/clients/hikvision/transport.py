@@ -0,0 +1,73 @@
+"""HTTP transport with connection pool statistics."""
+
+import time
+from dataclasses import dataclass
+
+import httpx
+
+_CONNECT_STARTED_EVENTS: frozenset[str] = frozenset(
+    ('connection.connect_tcp.started', 'connection.start_tls.started')
+)
+_CONNECT_COMPLETE_EVENTS: frozenset[str] = frozenset(
+    ('connection.connect_tcp.complete', 'connection.start_tls.complete')
+)
+_SEND_HEADERS_STARTED_EVENT_SUFFIX = 'send_request_headers.started'
+
+
+@dataclass(slots=True)
+class ConnectionPoolStats:
+    """Pool wait time of requests, i.e. time spent waiting for free connection."""
+
+    requests_total: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+
+    def add_wait_time(self, wait_time: float) -> None:
+        self.requests_total += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+
+class StatsHTTPTransport(httpx.AsyncHTTPTransport):
+    """`httpx.AsyncHTTPTransport` which measures connection pool wait time.
+
+    Wait time is taken from httpcore trace events: time from request start until
+    its headers are being sent minus time spent on connecting.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = ConnectionPoolStats()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started_at = time.perf_counter()
+        connect_started_at = 0.0
+        connect_time = 0.0
+
+        async def trace(event_name: str, info: dict) -> None:  # noqa: ARG001
+            nonlocal connect_started_at, connect_time
+            now = time.perf_counter()
+            if event_name in _CONNECT_STARTED_EVENTS:
+                connect_started_at = now
+            elif event_name in _CONNECT_COMPLETE_EVENTS:
+                connect_time += now - connect_started_at
+            elif event_name.endswith(_SEND_HEADERS_STARTED_EVENT_SUFFIX):
+                self.stats.add_wait_time(max(0.0, now - started_at - connect_time))
+
+        request.extensions['trace'] = trace
+        return await super().handle_async_request(request)
+
+    def get_stats(self) -> dict[str, int | float]:
+        connections = self._pool.connections
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            'in_use': len(connections) - idle,
+            'idle': idle,
+            'requests_total': self.stats.requests_total,
+            'wait_time_avg': (
+                self.stats.wait_time_total / self.stats.requests_total
+                if self.stats.requests_total
+                else 0.0
+            ),
+            'wait_time_max': self.stats.wait_time_max,
+        }
@@ -77,6 +77,7 @@ def setup_commands() -> tuple[dict, dict[list[str] | str, Callable]]:
         'version': cb.cmd_app_version,
         'ver': cb.cmd_app_version,
         'v': cb.cmd_app_version,
+        'stats': cb.cmd_stats,
     }
 
     return tpl_cmds, global_cmds
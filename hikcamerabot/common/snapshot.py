@@ -0,0 +1,63 @@
+"""Snapshot request coalescing module."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+
+type SnapshotType = tuple[bytes, int]
+
+
+class SnapshotCoalescer:
+    """Share one snapshot request between concurrent callers.
+
+    Callers asking for the same key while a request is in flight await that
+    request instead of sending another one. Optionally the result is kept for
+    a short TTL so bursts of requests are served from memory.
+    """
+
+    def __init__(self, cache_ttl: float = 0.0) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._cache_ttl = cache_ttl
+        self._in_flight: dict[Hashable, asyncio.Task[SnapshotType]] = {}
+        self._cache: dict[Hashable, tuple[SnapshotType, float]] = {}
+
+    async def get(
+        self, key: Hashable, take: Callable[[], Awaitable[SnapshotType]]
+    ) -> SnapshotType:
+        if cached := self._get_cached(key):
+            self._log.debug('Snapshot "%s" served from cache', key)
+            return cached
+
+        try:
+            task = self._in_flight[key]
+            self._log.debug('Joining in-flight snapshot request "%s"', key)
+        except KeyError:
+            # Exception is retrieved by awaiting callers and in `_on_done`.
+            task = self._in_flight[key] = asyncio.create_task(
+                take(), name=f'{self.__class__.__name__}_{key}'
+            )
+            task.add_done_callback(lambda task_: self._on_done(key, task_))
+        # Shield so one cancelled caller does not cancel request for others.
+        return await asyncio.shield(task)
+
+    def _get_cached(self, key: Hashable) -> SnapshotType | None:
+        try:
+            snapshot, expires_at = self._cache[key]
+        except KeyError:
+            return None
+        if time.monotonic() > expires_at:
+            del self._cache[key]
+            return None
+        return snapshot
+
+    def _on_done(self, key: Hashable, task: asyncio.Task[SnapshotType]) -> None:
+        self._in_flight.pop(key, None)
+        # Always retrieve exception, all callers might be cancelled already.
+        if task.cancelled() or task.exception() or not self._cache_ttl:
+            return
+        now = time.monotonic()
+        self._cache = {
+            key_: value for key_, value in self._cache.items() if value[1] > now
+        }
+        self._cache[key] = (task.result(), now + self._cache_ttl)
@@ -0,0 +1,177 @@
+"""Video ring buffer module."""
+
+import asyncio
+import logging
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+from hikcamerabot.constants import (
+    FFMPEG_INGEST_RELAY_ENCODING,
+    VIDEO_RING_SEGMENT_EXT,
+    VIDEO_RING_SEGMENT_FILENAME,
+)
+from hikcamerabot.services.stream.ingest import ChannelIngest, IngestOutput
+from hikcamerabot.utils.task import create_task
+
+if TYPE_CHECKING:
+    from hikcamerabot.camera import HikvisionCam
+
+
+@dataclass(slots=True)
+class RingSegment:
+    start: int
+    path: Path
+
+
+class VideoSegmentRing:
+    """Continuous stream copy of the camera channel into short tmpfs segments.
+
+    Segments are written by the shared channel ingest and kept for the longest
+    rewind and record time of video gifs recorded from the channel, so clips
+    are assembled from them without opening a new RTSP session.
+    """
+
+    _SHARED: ClassVar[dict[tuple[str, int], 'VideoSegmentRing']] = {}
+
+    _INGEST_OUTPUT_NAME: str = 'video_ring'
+
+    # Extra seconds segments are kept for clips being assembled.
+    _KEEP_MARGIN: int = 30
+    _POLL_INTERVAL: float = 0.5
+    # Seconds to wait for the last clip segment to close.
+    _COLLECT_TIMEOUT: int = 30
+
+    def __init__(self, cam: 'HikvisionCam', channel: int) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._cam = cam
+        self._channel = channel
+        self._conf = cam.conf.video_gif.ring_buffer
+        self._dir = self._conf.storage / f'{cam.id}_{channel}'
+        self._depth = self._get_depth()
+        self._started = False
+
+    @classmethod
+    def get_shared(cls, cam: 'HikvisionCam', channel: int) -> 'VideoSegmentRing':
+        try:
+            return cls._SHARED[cam.id, channel]
+        except KeyError:
+            ring = cls._SHARED[cam.id, channel] = cls(cam, channel)
+            return ring
+
+    @classmethod
+    def get_running(cls, cam_id: str, channel: int) -> 'VideoSegmentRing | None':
+        ring = cls._SHARED.get((cam_id, channel))
+        if not ring or not ring.started:
+            return None
+        return ring if ChannelIngest.get_running(cam_id, channel) else None
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    async def start(self) -> None:
+        if self.started:
+            return
+        self._log.info(
+            '[%s] Starting channel %s video ring, %ss deep',
+            self._cam.id,
+            self._channel,
+            self._depth,
+        )
+        # Segments of the previous run aren't continuous with the new ones.
+        shutil.rmtree(self._dir, ignore_errors=True)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._started = True
+
+        task_name = f'{self.__class__.__name__}_prune_{self._cam.id}_{self._channel}'
+        create_task(
+            self._prune(),
+            task_name=task_name,
+            logger=self._log,
+            exception_message='Task "%s" raised an exception',
+            exception_message_args=(task_name,),
+        )
+        # Supervisor retries the ingest start if it fails.
+        await ChannelIngest.get_shared(self._cam, self._channel).add_output(
+            self._INGEST_OUTPUT_NAME, self._get_ingest_output()
+        )
+
+    async def collect(self, start_at: float, end_at: float) -> list[Path]:
+        """Wait for segments covering the time range and return their paths.
+
+        Clip boundaries are rounded to segments. Empty list is returned when
+        the last segment doesn't close in time, e.g. the ingest is down.
+        """
+        await asyncio.sleep(max(0.0, end_at - time.time()))
+        deadline = end_at + self._COLLECT_TIMEOUT
+        while True:
+            segments = self._get_segments()
+            # The newest segment is still being written.
+            if segments and segments[-1].start >= end_at:
+                break
+            if time.time() > deadline:
+                self._log.error(
+                    '[%s] Channel %s video ring segments till %s were not written',
+                    self._cam.id,
+                    self._channel,
+                    end_at,
+                )
+                return []
+            await asyncio.sleep(self._POLL_INTERVAL)
+
+        first_idx = 0
+        for idx, segment in enumerate(segments):
+            if segment.start > start_at:
+                break
+            first_idx = idx
+        return [
+            segment.path for segment in segments[first_idx:-1] if segment.start < end_at
+        ]
+
+    def _get_segments(self) -> list[RingSegment]:
+        segments = []
+        for path in self._dir.glob(f'*{VIDEO_RING_SEGMENT_EXT}'):
+            try:
+                segments.append(RingSegment(start=int(path.stem), path=path))
+            except ValueError:
+                continue
+        segments.sort(key=lambda segment: segment.start)
+        return segments
+
+    async def _prune(self) -> None:
+        while True:
+            await asyncio.sleep(self._conf.segment_time)
+            expire_before = time.time() - self._depth
+            for segment in self._get_segments()[:-1]:
+                if segment.start >= expire_before:
+                    break
+                segment.path.unlink(missing_ok=True)
+
+    def _get_depth(self) -> int:
+        """Keep the longest clip of the channel and segments being assembled."""
+        clip_times = [
+            conf.rewind_time + conf.record_time
+            for conf in (
+                self._cam.conf.video_gif.on_alert,
+                self._cam.conf.video_gif.on_demand,
+            )
+            if conf.channel == self._channel
+        ]
+        return max(clip_times, default=0) + self._KEEP_MARGIN
+
+    def _get_ingest_output(self) -> IngestOutput:
+        return IngestOutput(
+            encoding_args=FFMPEG_INGEST_RELAY_ENCODING,
+            null_audio=False,
+            format='segment',
+            url=str(self._dir / VIDEO_RING_SEGMENT_FILENAME),
+            options={
+                'segment_time': self._conf.segment_time,
+                'segment_format': 'mpegts',
+                'strftime': 1,
+                'reset_timestamps': 1,
+            },
+        )
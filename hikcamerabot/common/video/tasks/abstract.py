@@ -4,7 +4,10 @@ import signal
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from hikcamerabot.enums import ProcessClass
+from hikcamerabot.exceptions import ProcessSchedulerError
 from hikcamerabot.utils.process import kill_proc
+from hikcamerabot.utils.process_scheduler import get_process_scheduler
 
 
 class AbstractFfBinaryTask(ABC):
@@ -16,9 +19,16 @@ class AbstractFfBinaryTask(ABC):
         self._file_path = file_path
 
     async def _run_proc(self, cmd: str) -> asyncio.subprocess.Process | None:
-        proc = await asyncio.create_subprocess_shell(
-            cmd=cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
+        try:
+            proc = await get_process_scheduler().create_subprocess_shell(
+                cmd,
+                ProcessClass.PROBE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except ProcessSchedulerError as err:
+            self._log.error('Failed to execute %s: %s', cmd, err)
+            return None
         try:
             await asyncio.wait_for(proc.wait(), timeout=self._CMD_TIMEOUT)
         except TimeoutError:
@@ -1,21 +1,69 @@
+import asyncio
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Final
 
 from hikcamerabot.common.video.tasks.abstract import AbstractFfBinaryTask
 from hikcamerabot.utils.process import get_stdout_stderr
 
+# Telegram limits thumbnails to 320px per side and 200 KB.
+_THUMBNAIL_MAX_SIDE: Final[int] = 320
+_THUMBNAIL_QUALITY: Final[int] = 5
+
+# Relative position of the representative keyframe, middle of the video.
+_SEEK_POSITION: Final[float] = 0.5
+
+# Only keyframes are decoded, seek lands on the keyframe before seek time.
+_CMD_INPUT_TPL: Final[str] = (
+    '-skip_frame nokey -noaccurate_seek -ss {seek:.3f} -i {filepath}'
+)
+_CMD_OUTPUT_TPL: Final[str] = (
+    '-map {input_idx}:v:0 -frames:v 1 '
+    f'-vf scale={_THUMBNAIL_MAX_SIDE}:{_THUMBNAIL_MAX_SIDE}'
+    ':force_original_aspect_ratio=decrease '
+    f'-q:v {_THUMBNAIL_QUALITY} {{thumbpath}}'
+)
+
+
+@dataclass(slots=True)
+class ThumbnailJob:
+    file_path: Path
+    thumbnail_path: Path
+    duration: float | None = None
+
+    @property
+    def seek(self) -> float:
+        return self.duration * _SEEK_POSITION if self.duration else 0.0
+
+
+def _build_cmd(jobs: list[ThumbnailJob]) -> str:
+    inputs = ' '.join(
+        _CMD_INPUT_TPL.format(seek=job.seek, filepath=job.file_path) for job in jobs
+    )
+    outputs = ' '.join(
+        _CMD_OUTPUT_TPL.format(input_idx=idx, thumbpath=job.thumbnail_path)
+        for idx, job in enumerate(jobs)
+    )
+    return f'ffmpeg -y -loglevel error {inputs} {outputs}'
+
 
 class MakeThumbnailTask(AbstractFfBinaryTask):
-    _CMD = 'ffmpeg -y -loglevel error -i {filepath} -vframes 1 -q:v 31 {thumbpath}'
+    """Make Telegram-sized thumbnail from a keyframe of the video."""
 
-    def __init__(self, thumbnail_path: Path, *args, **kwargs) -> None:
+    def __init__(
+        self, thumbnail_path: Path, *args, duration: float | None = None, **kwargs
+    ) -> None:
         super().__init__(*args, **kwargs)
         self._thumbnail_path = thumbnail_path
+        self._duration = duration
 
     async def run(self) -> bool:
         return await self._make_thumbnail()
 
     async def _make_thumbnail(self) -> bool:
-        cmd = self._CMD.format(filepath=self._file_path, thumbpath=self._thumbnail_path)
+        cmd = _build_cmd(
+            [ThumbnailJob(self._file_path, self._thumbnail_path, self._duration)]
+        )
         proc = await self._run_proc(cmd)
         if not proc:
             return False
@@ -39,7 +87,7 @@ class MakeThumbnailTask(AbstractFfBinaryTask):
 
         For example, zero-size thumbnail could be created when no space left on device.
         """
-        if self._thumbnail_path.exists():
+        if not self._thumbnail_path.exists():
             return
 
         self._log.info('Cleaning up errored thumbnail: "%s"', self._thumbnail_path)
@@ -49,3 +97,61 @@ class MakeThumbnailTask(AbstractFfBinaryTask):
             self._log.exception(
                 'Cleanup failed for errored thumbnail "%s"', self._thumbnail_path
             )
+
+
+class MakeThumbnailBatchTask(AbstractFfBinaryTask):
+    """Make thumbnails of many videos with one ffmpeg process per batch.
+
+    When a batch fails, e.g. one of the files is broken, thumbnails of that
+    batch are made one by one.
+    """
+
+    BATCH_SIZE: int = 16
+
+    def __init__(self, jobs: list[ThumbnailJob]) -> None:
+        # Batch has no single file, the first one is used only for logging.
+        super().__init__(file_path=jobs[0].file_path if jobs else Path())
+        self._jobs = jobs
+
+    async def run(self) -> list[bool]:
+        """Return thumbnail creation result for each job."""
+        results: list[bool] = []
+        for idx in range(0, len(self._jobs), self.BATCH_SIZE):
+            results.extend(
+                await self._make_batch(self._jobs[idx : idx + self.BATCH_SIZE])
+            )
+        return results
+
+    async def _make_batch(self, jobs: list[ThumbnailJob]) -> list[bool]:
+        if len(jobs) > 1:
+            if await self._make_at_once(jobs):
+                return [True] * len(jobs)
+            self._log.warning(
+                'Failed to make %d thumbnails at once, making one by one', len(jobs)
+            )
+        return list(
+            await asyncio.gather(
+                *(
+                    MakeThumbnailTask(
+                        job.thumbnail_path, job.file_path, duration=job.duration
+                    ).run()
+                    for job in jobs
+                )
+            )
+        )
+
+    async def _make_at_once(self, jobs: list[ThumbnailJob]) -> bool:
+        cmd = _build_cmd(jobs)
+        proc = await self._run_proc(cmd)
+        if not proc:
+            return False
+
+        stdout, stderr = await get_stdout_stderr(proc)
+        self._log.debug(
+            'Process "%s" returncode: %d, stdout: %s, stderr: %s',
+            cmd,
+            proc.returncode,
+            stdout,
+            stderr,
+        )
+        return not proc.returncode and all(job.thumbnail_path.is_file() for job in jobs)
@@ -0,0 +1,47 @@
+import asyncio
+
+from hikcamerabot.common.video.tasks.abstract import AbstractFfBinaryTask
+from hikcamerabot.common.video.tasks.ffprobe_context import GetFfprobeContextTask
+from hikcamerabot.utils.mp4 import VideoMetadata, read_mp4_metadata
+
+
+class GetVideoMetadataTask(AbstractFfBinaryTask):
+    """Get video duration and dimensions.
+
+    MP4 boxes are parsed in-process, `ffprobe` is spawned only for files the
+    parser can't handle. File is read in a thread, `moov` box may be large.
+    """
+
+    async def run(self) -> VideoMetadata | None:
+        try:
+            metadata = await asyncio.to_thread(read_mp4_metadata, self._file_path)
+        except OSError:
+            self._log.exception('Failed to read MP4 metadata of %s', self._file_path)
+            return None
+        if metadata:
+            return metadata
+
+        self._log.debug(
+            'Failed to parse MP4 metadata of %s, falling back to ffprobe',
+            self._file_path,
+        )
+        return await self._get_ffprobe_metadata()
+
+    async def _get_ffprobe_metadata(self) -> VideoMetadata | None:
+        probe_ctx = await GetFfprobeContextTask(self._file_path).run()
+        if not probe_ctx:
+            return None
+        try:
+            video_stream = next(
+                stream
+                for stream in probe_ctx['streams']
+                if stream['codec_type'] == 'video'
+            )
+            return VideoMetadata(
+                duration=float(probe_ctx['format']['duration']),
+                width=video_stream['width'],
+                height=video_stream['height'],
+            )
+        except (KeyError, StopIteration):
+            self._log.exception('Failed to gather video stream metadata: %s', probe_ctx)
+            return None
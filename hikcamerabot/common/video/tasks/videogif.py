@@ -1,5 +1,7 @@
 import asyncio
+import contextlib
 import logging
+import os
 import signal
 import socket
 import time
@@ -9,26 +11,33 @@ from urllib.parse import urlsplit
 
 from pyrogram.types import Message
 
-from hikcamerabot.common.video.tasks.ffprobe_context import GetFfprobeContextTask
+from hikcamerabot.common.video.segment_ring import VideoSegmentRing
 from hikcamerabot.common.video.tasks.thumbnail import MakeThumbnailTask
+from hikcamerabot.common.video.tasks.video_metadata import GetVideoMetadataTask
 from hikcamerabot.constants import (
     FFMPEG_CAM_VIDEO_SRC,
+    FFMPEG_CMD_CONCAT_VIDEO_GIF,
     FFMPEG_CMD_HLS_VIDEO_GIF,
     FFMPEG_CMD_VIDEO_GIF,
+    FFMPEG_HLS_LIVE_START_INDEX,
+    FFMPEG_HLS_REWIND_START_INDEX,
     FFMPEG_SRS_HLS_VIDEO_SRC,
     FFMPEG_SRS_RTMP_VIDEO_SRC,
     RTSP_TRANSPORT_TPL,
     SRS_DOCKER_CONTAINER_NAME,
     SRS_LIVESTREAM_NAME_TPL,
 )
-from hikcamerabot.enums import EventType, VideoGifType
+from hikcamerabot.enums import EventType, ProcessClass, VideoGifType
 from hikcamerabot.event_engine.events.outbound import (
     SendTextOutboundEvent,
     VideoOutboundEvent,
 )
 from hikcamerabot.event_engine.queue import get_result_queue
+from hikcamerabot.exceptions import ProcessSchedulerError
+from hikcamerabot.services.stream.ingest import ChannelIngest
 from hikcamerabot.utils.file import file_size
 from hikcamerabot.utils.process import kill_proc
+from hikcamerabot.utils.process_scheduler import get_process_scheduler
 from hikcamerabot.utils.shared import bold, format_ts, gen_random_str
 
 if TYPE_CHECKING:
@@ -50,6 +59,11 @@ class RecordVideoGifTask:
         VideoGifType.ON_DEMAND: EventType.RECORD_VIDEOGIF,
     }
 
+    _VIDEO_TYPE_TO_PROCESS_CLASS: ClassVar[dict[VideoGifType, ProcessClass]] = {
+        VideoGifType.ON_ALERT: ProcessClass.ALERT_CLIP,
+        VideoGifType.ON_DEMAND: ProcessClass.ON_DEMAND_CLIP,
+    }
+
     FILENAME_TIME_FORMAT: str = '%Y-%b-%d--%H-%M-%S'
 
     def __init__(
@@ -72,26 +86,74 @@ class RecordVideoGifTask:
         self._filename = self._get_filename()
         self._file_path: Path = self._tmp_storage_path / self._filename
         self._thumb_path: Path = self._tmp_storage_path / f'{self._filename}-thumb.jpg'
+        self._concat_list_path: Path = self._tmp_storage_path / f'{self._filename}.txt'
 
         self._thumb_created: bool = False
 
-        self._rec_time = self._gif_conf.record_time
+        self._requested_at = time.time()
+        self._end_at = self._requested_at + self._gif_conf.record_time
+        self._end_changed = asyncio.Event()
+        is_alert = self._video_type is VideoGifType.ON_ALERT
+        # Alert video follows tracked alert events: it ends on `set_end` time,
+        # but not later than the max record time.
+        self._follow_event = is_alert and self._cam.conf.alert.track_events
+        # Otherwise alerts during the recording extend it up to the max time.
+        self._max_record_time = self._gif_conf.max_record_time if is_alert else 0
+        if self._follow_event:
+            self._max_record_time = max(
+                self._max_record_time, self._gif_conf.record_time
+            )
+        self._extendable = (
+            self._follow_event or self._max_record_time > self._gif_conf.record_time
+        )
+
+        self._rec_time = (
+            self._max_record_time if self._extendable else self._gif_conf.record_time
+        )
         if self._rewind:
             self._rec_time += self._gif_conf.rewind_time
 
         self._message = message
         self._event = self._VIDEO_TYPE_TO_EVENT[self._video_type]
         self._result_queue = get_result_queue()
+        self._ring = VideoSegmentRing.get_running(self._cam.id, self._gif_conf.channel)
         self._ffmpeg_cmd = self._build_ffmpeg_cmd()
 
         self._duration: int | None = None
         self._width: int | None = None
         self._height: int | None = None
-        self._probe_ctx: dict | None = None
 
     async def run(self) -> None:
         await asyncio.gather(self._record(), self._send_confirmation_message())
 
+    def extend(self) -> bool:
+        """Extend the recording by the record time from now.
+
+        Followed event moves the end by itself. Return `False` when the
+        recording is already finished or reached the max length.
+        """
+        max_end_at = self._requested_at + self._max_record_time
+        if not self._extendable or self._end_at >= max_end_at:
+            return False
+        if not self._follow_event:
+            self._end_at = min(time.time() + self._gif_conf.record_time, max_end_at)
+        return True
+
+    def set_end(self, end_at: float) -> None:
+        """Move the end of the recording following the alert event."""
+        if not self._follow_event or not self._extendable:
+            return
+        self._end_at = min(end_at, self._requested_at + self._max_record_time)
+        self._end_changed.set()
+
+    async def _wait_end(self) -> None:
+        """Wait for the recording end, which may be moved meanwhile."""
+        while (delay := self._end_at - time.time()) > 0:
+            self._end_changed.clear()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._end_changed.wait(), timeout=delay)
+        self._extendable = False
+
     async def _record(self) -> None:
         """Start Ffmpeg subprocess and return file path and video type."""
         self._log.debug(
@@ -107,7 +169,9 @@ class RecordVideoGifTask:
             await self._post_process_failed_record()
 
     async def _post_process_successful_record(self) -> None:
-        await asyncio.gather(self._get_probe_ctx(), self._make_thumbnail_frame())
+        # Thumbnail is made from the middle of the video, duration comes first.
+        await self._get_metadata()
+        await self._make_thumbnail_frame()
         await self._send_result()
 
     async def _post_process_failed_record(self) -> None:
@@ -125,28 +189,25 @@ class RecordVideoGifTask:
     async def _make_thumbnail_frame(self) -> None:
         # TODO: Refactor duplicate code. Move to mixin.
         self._thumb_created = await MakeThumbnailTask(
-            thumbnail_path=self._thumb_path, file_path=self._file_path
+            thumbnail_path=self._thumb_path,
+            file_path=self._file_path,
+            duration=self._duration,
         ).run()
         if not self._thumb_created:
             self._log.error('Error during making thumbnail of %s', self._file_path)
 
-    async def _get_probe_ctx(self) -> None:
+    async def _get_metadata(self) -> None:
         # TODO: Refactor duplicate code. Move to mixin.
-        self._probe_ctx = await GetFfprobeContextTask(self._file_path).run()
-        if not self._probe_ctx:
+        metadata = await GetVideoMetadataTask(self._file_path).run()
+        if not metadata:
             return
-        video_streams = [
-            stream
-            for stream in self._probe_ctx['streams']
-            if stream['codec_type'] == 'video'
-        ]
-        self._duration = int(float(self._probe_ctx['format']['duration']))
-        self._height = video_streams[0]['height']
-        self._width = video_streams[0]['width']
+        self._duration = int(metadata.duration)
+        self._height = metadata.height
+        self._width = metadata.width
 
     def _post_err_cleanup(self) -> None:
         """Delete video file and thumb if they exist after exception."""
-        for file_path in (self._file_path, self._thumb_path):
+        for file_path in (self._file_path, self._thumb_path, self._concat_list_path):
             if file_path.exists():
                 try:
                     file_path.unlink()
@@ -154,10 +215,52 @@ class RecordVideoGifTask:
                     self._log.warning('File path %s not deleted: %s', file_path, err)
 
     async def _start_ffmpeg_subprocess(self) -> None:
+        if self._ring:
+            if not await self._write_concat_list():
+                return
+            try:
+                await self._run_ffmpeg_subprocess()
+            finally:
+                self._concat_list_path.unlink(missing_ok=True)
+        else:
+            await self._run_ffmpeg_subprocess()
+
+    async def _write_concat_list(self) -> bool:
+        """Wait for the clip segments in the video ring and list them."""
+        start_at = self._requested_at
+        if self._rewind:
+            start_at -= self._gif_conf.rewind_time
+        await self._wait_end()
+        segments = await self._ring.collect(start_at=start_at, end_at=self._end_at)
+        if not segments:
+            self._log.error(
+                'Failed to record "%s": No video ring segments', self._file_path
+            )
+            return False
+        self._concat_list_path.write_text(
+            'ffconcat version 1.0\n'
+            + ''.join(f"file '{segment}'\n" for segment in segments)
+        )
+        return True
+
+    async def _run_ffmpeg_subprocess(self) -> None:
         proc_timeout = self._rec_time + self._PROCESS_TIMEOUT
-        proc = await asyncio.create_subprocess_shell(self._ffmpeg_cmd)
         try:
-            await asyncio.wait_for(proc.wait(), timeout=proc_timeout)
+            # Own process group, the process is stopped with `killpg`.
+            proc = await get_process_scheduler().create_subprocess_shell(
+                self._ffmpeg_cmd,
+                self._VIDEO_TYPE_TO_PROCESS_CLASS[self._video_type],
+                preexec_fn=os.setsid,
+            )
+        except ProcessSchedulerError as err:
+            self._log.error('Failed to record "%s": %s', self._file_path, err)
+            self._extendable = False
+            return
+        if not self._follow_event:
+            # Process may wait for the scheduler, the record time counts from now.
+            self._end_at = max(self._end_at, time.time() + self._gif_conf.record_time)
+        try:
+            await asyncio.wait_for(self._wait_proc(proc), timeout=proc_timeout)
         except TimeoutError:
             self._log.error(
                 'Failed to record "%s": FFMPEG process ran longer than '
@@ -168,6 +271,24 @@ class RecordVideoGifTask:
             await kill_proc(process=proc, signal_=signal.SIGINT, reraise=False)
             self._post_err_cleanup()
 
+    async def _wait_proc(self, proc: asyncio.subprocess.Process) -> None:
+        if self._extendable:
+            await self._stop_on_end(proc)
+        await proc.wait()
+
+    async def _stop_on_end(self, proc: asyncio.subprocess.Process) -> None:
+        """Gracefully stop extendable recording, its `-t` is the max length."""
+        wait_end = asyncio.ensure_future(self._wait_end())
+        exited = asyncio.ensure_future(proc.wait())
+        try:
+            await asyncio.wait((wait_end, exited), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            wait_end.cancel()
+            exited.cancel()
+            self._extendable = False
+        if proc.returncode is None:
+            await kill_proc(process=proc, signal_=signal.SIGINT, reraise=False)
+
     async def _validate_file(self) -> bool:
         """Validate recorded file existence and size."""
         try:
@@ -219,7 +340,30 @@ class RecordVideoGifTask:
             gen_random_str(),
         )
 
+    def _get_relay_playlist(self) -> 'Path | None':
+        """Local HLS relay of the shared channel ingest, if it's running."""
+        if self._is_srs_enabled:
+            return None
+        ingest = ChannelIngest.get_running(self._cam.id, self._gif_conf.channel)
+        return ingest.relay_playlist if ingest else None
+
     def _build_ffmpeg_cmd(self) -> str:
+        if self._ring:
+            return FFMPEG_CMD_CONCAT_VIDEO_GIF.format(
+                loglevel=self._gif_conf.loglevel,
+                concat_list=self._concat_list_path,
+                filepath=self._file_path,
+            )
+        if relay_playlist := self._get_relay_playlist():
+            return FFMPEG_CMD_HLS_VIDEO_GIF.format(
+                live_start_index=FFMPEG_HLS_REWIND_START_INDEX
+                if self._rewind
+                else FFMPEG_HLS_LIVE_START_INDEX,
+                video_source=f'"{relay_playlist}"',
+                rec_time=self._rec_time,
+                loglevel=self._gif_conf.loglevel,
+                filepath=self._file_path,
+            )
         if self._is_srs_enabled:
             livestream_name = SRS_LIVESTREAM_NAME_TPL.format(
                 channel=self._gif_conf.channel, cam_id=self._cam.id
@@ -230,6 +374,7 @@ class RecordVideoGifTask:
                     livestream_name=livestream_name,
                 )
                 return FFMPEG_CMD_HLS_VIDEO_GIF.format(
+                    live_start_index=FFMPEG_HLS_REWIND_START_INDEX,
                     video_source=video_source,
                     rec_time=self._rec_time,
                     loglevel=self._gif_conf.loglevel,
@@ -1,26 +1,54 @@
 """Video managers module."""
 
 import logging
-from collections import deque
 from typing import TYPE_CHECKING
 
 from pyrogram.types import Message
 
+from hikcamerabot.common.video.segment_ring import VideoSegmentRing
 from hikcamerabot.common.video.tasks.videogif import RecordVideoGifTask
 from hikcamerabot.enums import VideoGifType
 from hikcamerabot.utils.task import create_task
 
 if TYPE_CHECKING:
+    import asyncio
+
     from hikcamerabot.camera import HikvisionCam
 
 
 class VideoGifRecorder:
-    """Video Gif Manager Class."""
+    """Video Gif Manager Class.
+
+    Alerts during the running alert recording extend it instead of starting
+    a new one, see `max_record_time` on alert video gif setting. With alert
+    event tracking the alert recording follows the event end instead.
+    """
+
+    # New recordings over the limit are dropped.
+    MAX_IN_FLIGHT: int = 10
 
     def __init__(self, cam: 'HikvisionCam') -> None:
         self._log = logging.getLogger(self.__class__.__name__)
         self._cam = cam
-        self._proc_task_queue = deque()
+        self._tasks: set[asyncio.Task] = set()
+        self._alert_rec_task: RecordVideoGifTask | None = None
+        self._alert_event_end_at: float = 0.0
+
+    async def start_rings(self) -> None:
+        """Start video rings of the channels video gifs are recorded from."""
+        gif_conf = self._cam.conf.video_gif
+        if not gif_conf.ring_buffer.enabled:
+            return
+        for channel in {gif_conf.on_alert.channel, gif_conf.on_demand.channel}:
+            await VideoSegmentRing.get_shared(self._cam, channel).start()
+
+    def follow_alert_event(self, event_end_at: float) -> None:
+        """Move alert recording end after the expected alert event end."""
+        self._alert_event_end_at = (
+            event_end_at + self._cam.conf.video_gif.on_alert.event_tail
+        )
+        if self._alert_rec_task:
+            self._alert_rec_task.set_end(self._alert_event_end_at)
 
     def start_rec(
         self,
@@ -35,12 +63,32 @@ class VideoGifRecorder:
         self, video_type: VideoGifType, rewind: bool, message: Message
     ) -> None:
         """Start rtsp video stream recording to a temporary file."""
+        if (
+            video_type is VideoGifType.ON_ALERT
+            and self._alert_rec_task
+            and self._alert_rec_task.extend()
+        ):
+            self._log.debug('[%s] Alert video recording extended', self._cam.id)
+            return
+        if len(self._tasks) >= self.MAX_IN_FLIGHT:
+            self._log.warning(
+                '[%s] Skipping "%s" video, %d recordings are in progress',
+                self._cam.id,
+                video_type.value,
+                len(self._tasks),
+            )
+            return
+
         rec_task = RecordVideoGifTask(
             rewind=rewind,
             cam=self._cam,
             video_type=video_type,
             message=message,
         )
+        if video_type is VideoGifType.ON_ALERT:
+            self._alert_rec_task = rec_task
+            if self._alert_event_end_at:
+                rec_task.set_end(self._alert_event_end_at)
         task = create_task(
             rec_task.run(),
             task_name=RecordVideoGifTask.__name__,
@@ -48,15 +96,5 @@ class VideoGifRecorder:
             exception_message='Task "%s" raised an exception',
             exception_message_args=(RecordVideoGifTask.__name__,),
         )
-        self._proc_task_queue.appendleft(task)
-
-    def get_recorded_videos(self) -> list[tuple[str, str]]:
-        """Get recorded video file paths."""
-        videos: list[tuple[str, str]] = []
-        for _ in range(len(self._proc_task_queue)):
-            task = self._proc_task_queue.pop()
-            if task.done():
-                videos.append(task.result())
-            else:
-                self._proc_task_queue.appendleft(task)
-        return videos
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -7,6 +7,8 @@ class YoutubeSchema(StrictBaseModel):
     channel: IntMin1
     restart_period: IntMin1
     restart_pause: IntMin0
+    stall_timeout: IntMin0 = 30
+    overlap_timeout: IntMin0 = 0
     url: str
     key: str
 
@@ -15,6 +17,8 @@ class TelegramSchema(StrictBaseModel):
     channel: IntMin1
     restart_period: IntMin1
     restart_pause: IntMin0
+    stall_timeout: IntMin0 = 30
+    overlap_timeout: IntMin0 = 0
     url: str
     key: str
 
@@ -24,6 +28,7 @@ class SrsSchema(StrictBaseModel):
     sub_channel: IntMin1
     restart_period: IntMinus1
     restart_pause: IntMin0
+    stall_timeout: IntMin0 = 30
     url: str
 
 
@@ -32,6 +37,7 @@ class DvrSchema(StrictBaseModel):
     sub_channel: IntMin1
     restart_period: IntMinus1
     restart_pause: IntMin0
+    stall_timeout: IntMin0 = 30
     segment_time: IntMin1
 
 
@@ -49,6 +55,7 @@ class IcecastSchema(StrictBaseModel):
     channel: IntMin1
     restart_period: IntMin1
     restart_pause: IntMin0
+    stall_timeout: IntMin0 = 30
     ice_stream: IceStreamSchema
 
 
@@ -12,8 +12,15 @@ from hikcamerabot.config.schemas._types import (
     PythonLogLevel,
 )
 from hikcamerabot.config.schemas.abstract import StrictBaseModel
-from hikcamerabot.constants import CMD_CAM_ID_REGEX
-from hikcamerabot.enums import RtspTransportType
+from hikcamerabot.constants import CMD_CAM_ID_REGEX, Img
+from hikcamerabot.enums import (
+    ImageExecutorType,
+    ProcessClass,
+    QueueOverflowPolicy,
+    ResampleFilterType,
+    ResultQueueClass,
+    RtspTransportType,
+)
 
 
 class LivestreamConfSchema(StrictBaseModel):
@@ -57,12 +64,20 @@ class DvrLivestreamConfSchema(LivestreamConfSchema):
     upload: DvrUploadConfSchema
 
 
+class IngestConfSchema(StrictBaseModel):
+    enabled: bool = False
+    loglevel: FfmpegLogLevel = 'error'
+    rtsp_transport_type: RtspTransportType = RtspTransportType.TCP
+    stall_timeout: IntMin0 = 30
+
+
 class LivestreamSchema(StrictBaseModel):
     srs: LivestreamConfSchema
     dvr: DvrLivestreamConfSchema
     youtube: LivestreamConfSchema
     telegram: LivestreamConfSchema
     icecast: LivestreamConfSchema
+    ingest: IngestConfSchema = IngestConfSchema()
 
 
 class VideoGifOnDemandSchema(StrictBaseModel):
@@ -76,11 +91,20 @@ class VideoGifOnDemandSchema(StrictBaseModel):
 
 class VideoGifOnAlertSchema(VideoGifOnDemandSchema):
     rewind: bool
+    max_record_time: IntMin0 = 0
+    event_tail: IntMin0 = 5
+
+
+class VideoRingBufferSchema(StrictBaseModel):
+    enabled: bool = False
+    storage: Path = Path('/dev/shm/hikcamerabot')  # noqa: S108
+    segment_time: IntMin1 = 2
 
 
 class VideoGifSchema(StrictBaseModel):
     on_alert: VideoGifOnAlertSchema
     on_demand: VideoGifOnDemandSchema
+    ring_buffer: VideoRingBufferSchema = VideoRingBufferSchema()
 
     def get_schema_by_type(
         self, type_: Literal['on_alert', 'on_demand']
@@ -93,15 +117,25 @@ class VideoGifSchema(StrictBaseModel):
 
 class PictureOnAlertSchema(StrictBaseModel):
     channel: int
+    resize_profile: str = 'alert'
 
 
 class PictureOnDemandSchema(PictureOnAlertSchema):
-    pass
+    resize_profile: str = 'on_demand'
 
 
 class PictureSchema(StrictBaseModel):
     on_alert: PictureOnAlertSchema
     on_demand: PictureOnDemandSchema
+    cache_ttl_ms: IntMin0 = 0
+
+    def get_schema_by_type(
+        self, type_: Literal['on_alert', 'on_demand']
+    ) -> PictureOnAlertSchema | PictureOnDemandSchema:
+        try:
+            return getattr(self, type_)
+        except AttributeError:
+            raise ValueError(f'Invalid PictureType: {type_}') from None
 
 
 class DetectionSchema(StrictBaseModel):
@@ -114,6 +148,7 @@ class DetectionSchema(StrictBaseModel):
 
 class AlertSchema(StrictBaseModel):
     delay: IntMin0
+    track_events: bool = False
     motion_detection: DetectionSchema
     line_crossing_detection: DetectionSchema
     intrusion_detection: DetectionSchema
@@ -136,11 +171,27 @@ class CamAPIAuthSchema(StrictBaseModel):
     type: AuthType
 
 
+class CamAPIConnPoolSchema(StrictBaseModel):
+    max_connections: IntMin1
+    max_keepalive_connections: IntMin0
+    keepalive_expiry: IntMin0
+
+
+class CamAPIConnPoolsSchema(StrictBaseModel):
+    stream: CamAPIConnPoolSchema = CamAPIConnPoolSchema(
+        max_connections=2, max_keepalive_connections=1, keepalive_expiry=30
+    )
+    request: CamAPIConnPoolSchema = CamAPIConnPoolSchema(
+        max_connections=4, max_keepalive_connections=4, keepalive_expiry=30
+    )
+
+
 class CamAPISchema(StrictBaseModel):
     host: str
     port: IntMin1
     auth: CamAPIAuthSchema
     stream_timeout: IntMin1
+    connection_pools: CamAPIConnPoolsSchema = CamAPIConnPoolsSchema()
 
 
 class CmdSectionsVisibilitySchema(StrictBaseModel):
@@ -191,9 +242,160 @@ class TelegramSchema(StrictBaseModel):
     startup_message_users: list[int]
 
 
+class ResultQueueClassSchema(StrictBaseModel):
+    maxsize: IntMin1
+    overflow_policy: QueueOverflowPolicy
+
+
+class ResultQueueSchema(StrictBaseModel):
+    alert: ResultQueueClassSchema = ResultQueueClassSchema(
+        maxsize=100, overflow_policy=QueueOverflowPolicy.COALESCE
+    )
+    interactive: ResultQueueClassSchema = ResultQueueClassSchema(
+        maxsize=100, overflow_policy=QueueOverflowPolicy.BLOCK
+    )
+    video: ResultQueueClassSchema = ResultQueueClassSchema(
+        maxsize=20, overflow_policy=QueueOverflowPolicy.BLOCK
+    )
+
+    def get_class_conf_by_type(self, type_: ResultQueueClass) -> ResultQueueClassSchema:
+        try:
+            return getattr(self, type_.value)
+        except AttributeError:
+            raise ValueError(f'Invalid ResultQueueClass: {type_}') from None
+
+
+class ProcessClassSchema(StrictBaseModel):
+    max_running: IntMin1
+    queue_timeout: IntMin0
+
+
+class ProcessSchedulerSchema(StrictBaseModel):
+    max_running: IntMin1 = 128
+    livestream: ProcessClassSchema = ProcessClassSchema(
+        max_running=64, queue_timeout=30
+    )
+    alert_clip: ProcessClassSchema = ProcessClassSchema(
+        max_running=16, queue_timeout=60
+    )
+    on_demand_clip: ProcessClassSchema = ProcessClassSchema(
+        max_running=8, queue_timeout=60
+    )
+    probe: ProcessClassSchema = ProcessClassSchema(max_running=8, queue_timeout=120)
+    maintenance: ProcessClassSchema = ProcessClassSchema(
+        max_running=2, queue_timeout=30
+    )
+
+    def get_class_conf_by_type(self, type_: ProcessClass) -> ProcessClassSchema:
+        try:
+            return getattr(self, type_.value)
+        except AttributeError:
+            raise ValueError(f'Invalid ProcessClass: {type_}') from None
+
+
+class AlertListenerSchema(StrictBaseModel):
+    enabled: bool = False
+    host: str = '0.0.0.0'  # noqa: S104
+    port: IntMin1 = 8090
+    path: str = '/alerts'
+    # Bot address as seen by the devices, they send events to it.
+    public_address: str | None = None
+    configure_devices: bool = True
+    # Shared secret, last segment of the path devices send events to.
+    token: Annotated[str, Field(pattern=r'^[A-Za-z0-9_-]+$')] | None = None
+    # Match events by `<ipAddress>` they report when sender address is unknown.
+    trust_reported_address: bool = False
+
+    @model_validator(mode='after')
+    def validate_public_address(self) -> Self:
+        if self.enabled and self.configure_devices and not self.public_address:
+            raise ValueError(
+                'When alert listener configures devices, public address must be set'
+            )
+        return self
+
+    @property
+    def notification_path(self) -> str:
+        """Path devices send events to, ends with the token if it's set."""
+        if not self.token:
+            return self.path
+        return f'{self.path.rstrip("/")}/{self.token}'
+
+
+class ResizeProfileSchema(StrictBaseModel):
+    width: IntMin1
+    height: IntMin1
+    resample: ResampleFilterType
+    quality: Annotated[int, Field(ge=1, le=95)]
+    optimize: bool
+    draft: bool
+
+
+_DEFAULT_RESIZE_PROFILES: dict[str, ResizeProfileSchema] = {
+    'alert': ResizeProfileSchema(
+        width=Img.SIZE[0],
+        height=Img.SIZE[1],
+        resample=ResampleFilterType.LANCZOS,
+        quality=Img.QUALITY,
+        optimize=True,
+        draft=True,
+    ),
+    'on_demand': ResizeProfileSchema(
+        width=Img.SIZE[0],
+        height=Img.SIZE[1],
+        resample=ResampleFilterType.LANCZOS,
+        quality=Img.QUALITY,
+        optimize=True,
+        draft=True,
+    ),
+}
+
+
+class ImageProcessingSchema(StrictBaseModel):
+    executor: ImageExecutorType
+    workers: IntMin1
+    profiles: dict[str, ResizeProfileSchema] = _DEFAULT_RESIZE_PROFILES
+
+
 class MainConfigSchema(StrictBaseModel):
     telegram: TelegramSchema
     log_level: PythonLogLevel
+    result_queue: ResultQueueSchema = ResultQueueSchema()
+    process_scheduler: ProcessSchedulerSchema = ProcessSchedulerSchema()
+    alert_listener: AlertListenerSchema = AlertListenerSchema()
+    image_processing: ImageProcessingSchema = ImageProcessingSchema(
+        executor=ImageExecutorType.PROCESS, workers=2
+    )
     camera_list: dict[
         Annotated[str, Field(pattern=CMD_CAM_ID_REGEX)], CameraConfigSchema
     ]
+
+    @model_validator(mode='after')
+    def validate_resize_profiles(self) -> Self:
+        profiles = self.image_processing.profiles
+        for cam_id, cam_conf in self.camera_list.items():
+            for picture_conf in (cam_conf.picture.on_alert, cam_conf.picture.on_demand):
+                if picture_conf.resize_profile not in profiles:
+                    raise ValueError(
+                        f'Unknown resize profile "{picture_conf.resize_profile}" '
+                        f'for camera "{cam_id}", available: {sorted(profiles)}'
+                    )
+        return self
+
+    @model_validator(mode='after')
+    def validate_shared_api_clients(self) -> Self:
+        """Cameras with the same API host and user share one API client."""
+        api_confs: dict[tuple[str, int, str], tuple[str, CamAPISchema]] = {}
+        for cam_id, cam_conf in self.camera_list.items():
+            api_conf = cam_conf.api
+            key = (api_conf.host, api_conf.port, api_conf.auth.user)
+            if key not in api_confs:
+                api_confs[key] = (cam_id, api_conf)
+                continue
+            first_cam_id, first_api_conf = api_confs[key]
+            if api_conf != first_api_conf:
+                raise ValueError(
+                    f'Cameras "{first_cam_id}" and "{cam_id}" use the same API host '
+                    f'and user, their "api" sections must be identical'
+                )
+        return self
@@ -37,6 +37,8 @@ SRS_DOCKER_CONTAINER_NAME: Final[str] = 'hikvision_srs_server'
 
 _FFMPEG_BIN: Final[str] = 'ffmpeg'
 _FFMPEG_LOG_LEVEL: Final[str] = '-loglevel {loglevel}'
+# Machine-readable progress on stdout for supervised long-running processes.
+_FFMPEG_PROGRESS: Final[str] = '-nostats -progress pipe:1'
 
 FFMPEG_CAM_VIDEO_SRC: Final[str] = (
     '"rtsp://{user}:{pw}@{host}:{rtsp_port}/Streaming/Channels/{channel}/"'
@@ -48,6 +50,9 @@ FFMPEG_SRS_HLS_VIDEO_SRC: Final[str] = (
     '"http://{ip_address}:8080/hls/live/{livestream_name}.m3u8"'
 )
 
+FFMPEG_HLS_REWIND_START_INDEX: Final[int] = 0
+FFMPEG_HLS_LIVE_START_INDEX: Final[int] = -1
+
 SRS_LIVESTREAM_NAME_TPL: Final[str] = 'livestream_{channel}_{cam_id}'
 RTSP_TRANSPORT_TPL: Final[str] = '-rtsp_transport {rtsp_transport_type}'
 
@@ -62,9 +67,18 @@ FFMPEG_CMD_VIDEO_GIF: Final[str] = (
     '{filepath}'
 )
 
+# Video gif assembled from the video ring segments listed in concat file.
+FFMPEG_CMD_CONCAT_VIDEO_GIF: Final[str] = (
+    f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} '
+    '-f concat -safe 0 '
+    '-i "{concat_list}" '
+    '-c copy '
+    '{filepath}'
+)
+
 FFMPEG_CMD_HLS_VIDEO_GIF: Final[str] = (
     f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} '
-    '-live_start_index 0 '
+    '-live_start_index {live_start_index} '
     '-i {video_source} '
     '-c copy '
     '-t {rec_time} '
@@ -73,7 +87,7 @@ FFMPEG_CMD_HLS_VIDEO_GIF: Final[str] = (
 
 # Livestream constants.
 FFMPEG_CMD_SRS: Final[str] = (
-    f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} '
+    f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} {_FFMPEG_PROGRESS} '
     '-reorder_queue_size 1000000 '
     '-buffer_size 1000000 '
     '{filter} '
@@ -91,7 +105,7 @@ FFMPEG_CMD_SRS: Final[str] = (
 )
 
 FFMPEG_CMD_LIVESTREAM: Final[str] = (
-    f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} '
+    f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} {_FFMPEG_PROGRESS} '
     '{filter} '
     '{rtsp_transport} '
     '-i {video_source} '
@@ -106,7 +120,7 @@ FFMPEG_CMD_LIVESTREAM: Final[str] = (
 )
 
 FFMPEG_CMD_DVR: Final[str] = (
-    f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} '
+    f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} {_FFMPEG_PROGRESS} '
     '{filter} '
     '{rtsp_transport} '
     '-i {video_source} '
@@ -119,6 +133,35 @@ FFMPEG_CMD_DVR: Final[str] = (
     '"{{output}}"'
 )
 
+# Shared ingest, one RTSP session per camera channel. Outputs with the same
+# encoding args are encoded once and fanned out by the tee muxer.
+FFMPEG_CMD_INGEST: Final[str] = (
+    f'{_FFMPEG_BIN} {_FFMPEG_LOG_LEVEL} {_FFMPEG_PROGRESS} '
+    '{rtsp_transport} '
+    '-i {video_source} '
+    '{null_audio_source} '
+    '{outputs}'
+)
+FFMPEG_INGEST_NULL_AUDIO_SRC: Final[str] = (
+    '-f lavfi -i anullsrc=channel_layout=mono:sample_rate=8000'
+)
+FFMPEG_INGEST_MAP: Final[str] = '-map 0:v:0 -map 0:a:0?'
+FFMPEG_INGEST_NULL_AUDIO_MAP: Final[str] = '-map 0:v:0 -map 1:a:0'
+FFMPEG_INGEST_ENCODING: Final[str] = (
+    '-c:v {vcodec} {inner_args} -c:a {acodec} {abitrate} {asample_rate}'
+)
+# Tee muxer doesn't request global headers from encoders, FLV and MP4 need them.
+FFMPEG_CMD_INGEST_TEE_OUTPUT: Final[str] = (
+    '{map} {encoding_args} -flags +global_header -f tee "{slaves}"'
+)
+# Local HLS relay for video gifs, stream copy with mp4-compatible audio.
+FFMPEG_INGEST_RELAY_ENCODING: Final[str] = '-c:v copy -c:a aac'
+INGEST_RELAY_HLS_TIME: Final[int] = 2
+INGEST_RELAY_PLAYLIST: Final[str] = 'live.m3u8'
+# Video ring segments are named by their start unix time.
+VIDEO_RING_SEGMENT_EXT: Final[str] = '.ts'
+VIDEO_RING_SEGMENT_FILENAME: Final[str] = f'%s{VIDEO_RING_SEGMENT_EXT}'
+
 FFMPEG_CMD_TRANSCODE_GENERAL: Final[str] = (
     '-b:v {average_bitrate} -maxrate {maxrate} '
     '-bufsize {bufsize} '
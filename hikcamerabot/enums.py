@@ -47,6 +47,50 @@ class EventType(BaseUniqueChoiceStrEnum):
     TAKE_SNAPSHOT = 'take_snapshot'
 
 
+class ResultQueueClass(BaseUniqueChoiceStrEnum):
+    """Outbound event priority class, ordered from highest to lowest priority."""
+
+    ALERT = 'alert'
+    INTERACTIVE = 'interactive'
+    VIDEO = 'video'
+
+
+class QueueOverflowPolicy(BaseUniqueChoiceStrEnum):
+    """What to do with new event when its priority class queue is full."""
+
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop_oldest'
+    DROP_NEWEST = 'drop_newest'
+    # Replace queued event with the same key, else drop the oldest one.
+    COALESCE = 'coalesce'
+
+
+class ProcessClass(BaseUniqueChoiceStrEnum):
+    """Subprocess job class, ordered from highest to lowest priority."""
+
+    LIVESTREAM = 'livestream'
+    ALERT_CLIP = 'alert_clip'
+    ON_DEMAND_CLIP = 'on_demand_clip'
+    PROBE = 'probe'
+    MAINTENANCE = 'maintenance'
+
+
+class ImageExecutorType(BaseUniqueChoiceStrEnum):
+    PROCESS = 'process'
+    THREAD = 'thread'
+
+
+class ResampleFilterType(BaseUniqueChoiceStrEnum):
+    """Pillow resample filter, from the fastest to the best quality."""
+
+    NEAREST = 'nearest'
+    BOX = 'box'
+    BILINEAR = 'bilinear'
+    HAMMING = 'hamming'
+    BICUBIC = 'bicubic'
+    LANCZOS = 'lanczos'
+
+
 class CmdSectionType(BaseUniqueChoiceStrEnum):
     general = 'General'
     infrared = 'Infrared Mode'
@@ -73,6 +117,12 @@ class DvrUploadType(BaseUniqueChoiceStrEnum):
     TELEGRAM = 'telegram'
 
 
+class DvrUploadState(BaseUniqueChoiceStrEnum):
+    PENDING = 'pending'
+    UPLOADED = 'uploaded'
+    FAILED = 'failed'
+
+
 class StreamType(BaseUniqueChoiceStrEnum):
     DVR = 'DVR'
     ICECAST = 'ICECAST'
@@ -0,0 +1,168 @@
+"""Alert media fan-out module."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from io import BytesIO
+from pathlib import Path
+
+from pyrogram.types import Message
+from tenacity import AsyncRetrying, stop_after_attempt, wait_fixed
+
+type MediaType = BytesIO | Path | str
+type SendMediaCallable = Callable[[int, MediaType], Awaitable[Message | None]]
+type GetFileIdCallable = Callable[[Message | None], str | None]
+
+
+class FileIdCache:
+    """Telegram file IDs of already uploaded media bounded by size and age."""
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._cache: OrderedDict[Hashable, tuple[str, float]] = OrderedDict()
+
+    def get(self, key: Hashable) -> str | None:
+        try:
+            file_id, expires_at = self._cache[key]
+        except KeyError:
+            return None
+        if time.monotonic() > expires_at:
+            del self._cache[key]
+            return None
+        return file_id
+
+    def delete(self, key: Hashable) -> None:
+        self._cache.pop(key, None)
+
+    def set(self, key: Hashable, file_id: str) -> None:
+        self._cache[key] = (file_id, time.monotonic() + self._ttl)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+
+class AlertFanOut:
+    """Send the same alert media to many chats uploading it only once.
+
+    Media is uploaded to the first chat which accepts it, then the Telegram
+    file ID returned by that upload is sent to the remaining chats concurrently.
+    Each chat is retried on its own, so one failing chat does not delay others.
+
+    File IDs are cached across events by media key, e.g. content digest, so
+    the same media sent again, like a snapshot shared by several alerts, is
+    not uploaded twice. When sending the cached file ID fails, e.g. Telegram
+    no longer accepts it, the entry is dropped and the media is uploaded again
+    to the failed chats.
+    """
+
+    CONCURRENCY: int = 8
+    RETRY_ATTEMPTS: int = 5
+    RETRY_WAIT: float = 0.5
+
+    FILE_ID_CACHE_TTL: float = 3600.0
+    FILE_ID_CACHE_SIZE: int = 256
+
+    def __init__(self, chat_ids: list[int]) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._chat_ids = chat_ids
+        self._semaphore = asyncio.Semaphore(self.CONCURRENCY)
+        self._file_ids = FileIdCache(
+            ttl=self.FILE_ID_CACHE_TTL, maxsize=self.FILE_ID_CACHE_SIZE
+        )
+
+    async def send(
+        self,
+        key: Hashable | None,
+        media: MediaType,
+        send: SendMediaCallable,
+        get_file_id: GetFileIdCallable,
+    ) -> None:
+        """Send media to all chats.
+
+        `send` is called with chat ID and either the media itself or its cached
+        file ID. `get_file_id` extracts file ID from the message `send` returned.
+        Media without `key` is never the same, its file ID is not cached.
+        """
+        chat_ids = list(self._chat_ids)
+        cached_file_id = self._file_ids.get(key) if key is not None else None
+        if cached_file_id is not None:
+            chat_ids = await self._send_file_id(cached_file_id, chat_ids, send)
+            if not chat_ids:
+                return
+            self._log.warning(
+                'Failed to send cached file ID to chat IDs %s, uploading media again',
+                chat_ids,
+            )
+            self._file_ids.delete(key)
+        file_id, chat_ids = await self._upload(
+            key=key,
+            media=media,
+            chat_ids=chat_ids,
+            send=send,
+            get_file_id=get_file_id,
+        )
+        if chat_ids:
+            await self._send_file_id(file_id, chat_ids, send)
+
+    async def _send_file_id(
+        self, file_id: str, chat_ids: list[int], send: SendMediaCallable
+    ) -> list[int]:
+        """Send file ID to chats concurrently and return chats which failed."""
+        results = await asyncio.gather(
+            *(self._send_to_chat(chat_id, file_id, send) for chat_id in chat_ids)
+        )
+        return [
+            chat_id for chat_id, ok in zip(chat_ids, results, strict=True) if not ok
+        ]
+
+    async def _upload(
+        self,
+        key: Hashable | None,
+        media: MediaType,
+        chat_ids: list[int],
+        send: SendMediaCallable,
+        get_file_id: GetFileIdCallable,
+    ) -> tuple[str | None, list[int]]:
+        """Upload media to chats one by one until file ID is obtained.
+
+        Return file ID and chats which still have to receive it.
+        """
+        for idx, chat_id in enumerate(chat_ids):
+            try:
+                message = await self._send_with_retry(chat_id, media, send)
+            except Exception:
+                self._log.exception('Failed to send alert media to chat ID %s', chat_id)
+                continue
+            if file_id := get_file_id(message):
+                if key is not None:
+                    self._file_ids.set(key, file_id)
+                return file_id, chat_ids[idx + 1 :]
+        return None, []
+
+    async def _send_to_chat(
+        self, chat_id: int, file_id: str, send: SendMediaCallable
+    ) -> bool:
+        try:
+            await self._send_with_retry(chat_id, file_id, send)
+        except Exception:
+            self._log.exception('Failed to send alert media to chat ID %s', chat_id)
+            return False
+        return True
+
+    async def _send_with_retry(
+        self, chat_id: int, media: MediaType, send: SendMediaCallable
+    ) -> Message | None:
+        async with self._semaphore:
+            async for attempt in AsyncRetrying(
+                wait=wait_fixed(self.RETRY_WAIT),
+                stop=stop_after_attempt(self.RETRY_ATTEMPTS),
+                reraise=True,
+            ):
+                with attempt:
+                    if isinstance(media, BytesIO):
+                        media.seek(0)
+                    return await send(chat_id, media)
+        return None
@@ -1,5 +1,6 @@
 """Result event handlers module."""
 
+import hashlib
 import logging
 from abc import ABC, abstractmethod
 from io import BytesIO
@@ -22,6 +23,7 @@ from hikcamerabot.event_engine.events.outbound import (
     StreamOutboundEvent,
     VideoOutboundEvent,
 )
+from hikcamerabot.event_engine.fanout import AlertFanOut
 from hikcamerabot.utils.shared import bold, format_ts, send_text
 
 if TYPE_CHECKING:
@@ -44,46 +46,25 @@ class AbstractResultEventHandler(ABC):
 class ResultAlertVideoHandler(AbstractResultEventHandler):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self._video_file_cache: dict[Path, str] = {}
+        self._fanout = AlertFanOut(chat_ids=self._bot.alert_users)
 
     async def _handle(self, event: VideoOutboundEvent) -> None:
-        try:
-            await self.__handle(event)
-        finally:
-            self._cleanup()
-
-    def _cleanup(self) -> None:
-        self._video_file_cache.clear()
-
-    async def __handle(self, event: VideoOutboundEvent) -> None:
         cam = event.cam
         caption = (
             f'{emojize(":rotating_light:", language="alias")} '
             f'Alert video from {cam.description} {cam.hashtag}\n/cmds_{cam.id}, '
             f'/list_cams'
         )
-        try:
-            # Simple for loop because video cache will be used.
-            for uid in self._bot.alert_users:
-                await self._send_video(uid, event, caption)
-        finally:
-            event.video_path.unlink()
-            if event.thumb_path:
-                event.thumb_path.unlink()
 
-    @retry(wait=wait_fixed(0.5), stop=stop_after_attempt(10))
-    async def _send_video(
-        self, uid: int, event: VideoOutboundEvent, caption: str
-    ) -> None:
-        try:
-            file_, is_cached = self._get_file(event.video_path)
-            await self._bot.send_chat_action(
-                chat_id=uid, action=ChatAction.UPLOAD_VIDEO
-            )
+        async def send_video(uid: int, video: Path | str) -> Message | None:
+            if isinstance(video, Path):
+                await self._bot.send_chat_action(
+                    chat_id=uid, action=ChatAction.UPLOAD_VIDEO
+                )
             message = await self._bot.send_video(
                 chat_id=uid,
                 caption=caption,
-                video=str(file_),
+                video=str(video),
                 duration=event.video_duration,
                 height=event.video_height,
                 width=event.video_width,
@@ -91,23 +72,24 @@ class ResultAlertVideoHandler(AbstractResultEventHandler):
                 supports_streaming=True,
             )
             self._log.debug('Debug context message: %s', message)
-            if message and message.video and not is_cached:
-                self._video_file_cache[event.video_path] = message.video.file_id
-        except Exception:
-            self._log.exception(
-                'Failed to send video in %s. Retrying', self.__class__.__name__
-            )
-            raise
+            return message
 
-    def _get_file(self, video_path: Path) -> tuple[str | Path, bool]:
-        """Get str file id from cache or `InputFile` from video path.
-        Indicate whether file is cached or not.
-        """
-        self._log.debug('Video cache: %s', self._video_file_cache)
         try:
-            return self._video_file_cache[video_path], True
-        except KeyError:
-            return video_path, False
+            # Every recording is a new file, don't keep its file ID.
+            await self._fanout.send(
+                key=None,
+                media=event.video_path,
+                send=send_video,
+                get_file_id=self._get_video_file_id,
+            )
+        finally:
+            event.video_path.unlink()
+            if event.thumb_path:
+                event.thumb_path.unlink()
+
+    @staticmethod
+    def _get_video_file_id(message: Message | None) -> str | None:
+        return message.video.file_id if message and message.video else None
 
 
 class ResultRecordVideoGifHandler(AbstractResultEventHandler):
@@ -153,6 +135,10 @@ class ResultRecordVideoGifHandler(AbstractResultEventHandler):
 
 
 class ResultAlertSnapshotHandler(AbstractResultEventHandler):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._fanout = AlertFanOut(chat_ids=self._bot.alert_users)
+
     async def _handle(self, event: AlertSnapshotOutboundEvent) -> None:
         cam = event.cam
 
@@ -160,7 +146,6 @@ class ResultAlertSnapshotHandler(AbstractResultEventHandler):
         detection_type = event.detection_type
         alert_count = event.alert_count
         resized = event.resized
-        photo = event.img
         trigger_name: str = DETECTION_SWITCH_MAP[detection_type]['name'].value
 
         caption = (
@@ -168,7 +153,7 @@ class ResultAlertSnapshotHandler(AbstractResultEventHandler):
             f'(alert #{alert_count}) {cam.hashtag}\n/cmds_{cam.id}, /list_cams'
         )
 
-        async def send_document(photo_: BytesIO | str) -> Message:
+        async def send_document(uid: int, photo_: BytesIO | str) -> Message | None:
             return await self._bot.send_document(
                 chat_id=uid,
                 document=photo_,
@@ -176,22 +161,33 @@ class ResultAlertSnapshotHandler(AbstractResultEventHandler):
                 caption=caption,
             )
 
-        async def send_photo(photo_: BytesIO | str) -> Message:
+        async def send_photo(uid: int, photo_: BytesIO | str) -> Message | None:
             return await self._bot.send_photo(
                 chat_id=uid, photo=photo_, caption=caption
             )
 
-        cached_id: str | None = None
-        for uid in self._bot.alert_users:
-            try:
-                if resized:
-                    message = await send_photo(cached_id or photo)
-                    cached_id = message.photo.file_id
-                else:
-                    message = await send_document(cached_id or photo)
-                    cached_id = message.document.file_id
-            except Exception:
-                self._log.exception('Failed to send message to user ID %s', uid)
+        if resized:
+            send, get_file_id = send_photo, self._get_photo_file_id
+        else:
+            send, get_file_id = send_document, self._get_document_file_id
+        await self._fanout.send(
+            # Snapshot shared by several alerts is uploaded once.
+            key=(
+                hashlib.blake2b(event.img.getbuffer(), digest_size=16).digest(),
+                resized,
+            ),
+            media=event.img,
+            send=send,
+            get_file_id=get_file_id,
+        )
+
+    @staticmethod
+    def _get_photo_file_id(message: Message | None) -> str | None:
+        return message.photo.file_id if message and message.photo else None
+
+    @staticmethod
+    def _get_document_file_id(message: Message | None) -> str | None:
+        return message.document.file_id if message and message.document else None
 
 
 class ResultStreamConfHandler(AbstractResultEventHandler):
@@ -1,10 +1,195 @@
-from asyncio import Queue
+"""Outbound (result) event queue module."""
 
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+from hikcamerabot.config.config import main_conf
+from hikcamerabot.config.schemas.main_config import ResultQueueSchema
+from hikcamerabot.enums import EventType, QueueOverflowPolicy, ResultQueueClass
 from hikcamerabot.event_engine.events.abstract import BaseOutboundEvent
-from hikcamerabot.event_engine.events.outbound import SendTextOutboundEvent
+from hikcamerabot.event_engine.events.outbound import (
+    AlertSnapshotOutboundEvent,
+    SendTextOutboundEvent,
+)
+
+type OutboundEventType = BaseOutboundEvent | SendTextOutboundEvent
+
+_EVENT_TYPE_TO_QUEUE_CLASS: dict[EventType, ResultQueueClass] = {
+    EventType.ALERT_MSG: ResultQueueClass.ALERT,
+    EventType.ALERT_SNAPSHOT: ResultQueueClass.ALERT,
+    EventType.ALERT_VIDEO: ResultQueueClass.VIDEO,
+    EventType.RECORD_VIDEOGIF: ResultQueueClass.VIDEO,
+}
+
+
+def get_queue_class(event: OutboundEventType) -> ResultQueueClass:
+    # Text without message to reply to is an alert text sent to alert users.
+    if event.event is EventType.SEND_TEXT and event.message is None:
+        return ResultQueueClass.ALERT
+    return _EVENT_TYPE_TO_QUEUE_CLASS.get(event.event, ResultQueueClass.INTERACTIVE)
+
+
+def _get_coalesce_key(event: OutboundEventType) -> Hashable | None:
+    """Key of events which may replace each other in the queue.
+
+    Replies to user commands are never coalesced.
+    """
+    if event.message is not None:
+        return None
+    if isinstance(event, SendTextOutboundEvent):
+        return event.event, event.text
+    if isinstance(event, AlertSnapshotOutboundEvent):
+        return event.event, event.cam.id, event.detection_type
+    return event.event, event.cam.id
+
+
+@dataclass(slots=True)
+class _QueueItem:
+    event: OutboundEventType
+    enqueued_at: float
+    coalesce_key: Hashable | None
+
+
+@dataclass(slots=True)
+class QueueLatencyStats:
+    """Enqueue-to-dispatch latency of one event type."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, latency: float) -> None:
+        self.count += 1
+        self.total += latency
+        self.max = max(self.max, latency)
+
+    def as_dict(self) -> dict[str, int | float]:
+        return {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+        }
+
+
+class ResultQueue:
+    """Bounded priority queue of outbound events.
+
+    Events are split into priority classes, each with its own bound and overflow
+    policy. Workers block on `get` which always returns the oldest event of the
+    highest non-empty priority class.
+
+    `COALESCE` policy replaces a queued event with the same key even when the
+    queue isn't full. When the queue is full and there's nothing to replace, it
+    falls back to `DROP_OLDEST`; such drops are counted in `dropped` as well as
+    in `coalesce_fallback` stats.
+    """
+
+    def __init__(self, conf: ResultQueueSchema) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._conf = conf
+        self._queues: dict[ResultQueueClass, deque[_QueueItem]] = {
+            queue_class: deque() for queue_class in ResultQueueClass
+        }
+        lock = asyncio.Lock()
+        self._not_empty = asyncio.Condition(lock)
+        self._not_full = asyncio.Condition(lock)
+
+        self._dropped: dict[ResultQueueClass, int] = defaultdict(int)
+        self._coalesced: dict[ResultQueueClass, int] = defaultdict(int)
+        self._coalesce_fallback: dict[ResultQueueClass, int] = defaultdict(int)
+        self._latency: dict[EventType, QueueLatencyStats] = defaultdict(
+            QueueLatencyStats
+        )
+
+    def qsize(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def put(self, event: OutboundEventType) -> None:
+        queue_class = get_queue_class(event)
+        queue = self._queues[queue_class]
+        class_conf = self._conf.get_class_conf_by_type(queue_class)
+        policy = class_conf.overflow_policy
+        item = _QueueItem(
+            event=event,
+            enqueued_at=time.monotonic(),
+            coalesce_key=_get_coalesce_key(event),
+        )
+
+        async with self._not_full:
+            if policy is QueueOverflowPolicy.COALESCE and self._coalesce(queue, item):
+                self._coalesced[queue_class] += 1
+                return
+
+            while len(queue) >= class_conf.maxsize:
+                if policy is QueueOverflowPolicy.BLOCK:
+                    await self._not_full.wait()
+                    continue
+                self._dropped[queue_class] += 1
+                if policy is QueueOverflowPolicy.DROP_NEWEST:
+                    self._log.warning(
+                        'Result queue "%s" is full, dropping new event: %s',
+                        queue_class,
+                        event.event,
+                    )
+                    return
+                if policy is QueueOverflowPolicy.COALESCE:
+                    self._coalesce_fallback[queue_class] += 1
+                dropped = queue.popleft()
+                self._log.warning(
+                    'Result queue "%s" is full, dropping oldest event: %s',
+                    queue_class,
+                    dropped.event.event,
+                )
+
+            queue.append(item)
+            self._not_empty.notify()
+
+    async def get(self) -> OutboundEventType:
+        async with self._not_empty:
+            while (item := self._pop()) is None:
+                await self._not_empty.wait()
+            self._not_full.notify_all()
+
+        self._latency[item.event.event].add(time.monotonic() - item.enqueued_at)
+        return item.event
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            'size': {
+                queue_class.value: len(queue)
+                for queue_class, queue in self._queues.items()
+            },
+            'dropped': {k.value: v for k, v in self._dropped.items()},
+            'coalesced': {k.value: v for k, v in self._coalesced.items()},
+            'coalesce_fallback': {
+                k.value: v for k, v in self._coalesce_fallback.items()
+            },
+            'latency': {k.value: v.as_dict() for k, v in self._latency.items()},
+        }
+
+    def _pop(self) -> _QueueItem | None:
+        for queue in self._queues.values():
+            if queue:
+                return queue.popleft()
+        return None
+
+    def _coalesce(self, queue: deque[_QueueItem], item: _QueueItem) -> bool:
+        """Replace queued event with the same key keeping its place in the queue."""
+        if item.coalesce_key is None:
+            return False
+        for queued_item in queue:
+            if queued_item.coalesce_key == item.coalesce_key:
+                queued_item.event = item.event
+                return True
+        return False
+
 
-_RESULT_QUEUE = Queue()
+_RESULT_QUEUE = ResultQueue(conf=main_conf.result_queue)
 
 
-def get_result_queue() -> Queue[BaseOutboundEvent | SendTextOutboundEvent]:
+def get_result_queue() -> ResultQueue:
     return _RESULT_QUEUE
@@ -2,7 +2,6 @@ import logging
 from typing import TYPE_CHECKING
 
 from hikcamerabot.event_engine.queue import get_result_queue
-from hikcamerabot.utils.shared import shallow_sleep_async
 
 if TYPE_CHECKING:
     from hikcamerabot.event_engine.dispatchers.outbound import OutboundEventDispatcher
@@ -19,14 +18,12 @@ class ResultWorkerTask:
 
     async def run(self) -> None:
         while True:
-            while not self._res_queue.empty():
-                event = await self._res_queue.get()
-                try:
-                    await self._outbound_dispatcher.dispatch(event)
-                except Exception:
-                    self._log.exception(
-                        'Unhandled exception in result worker %s. EventType context: %s',
-                        self._worker_id,
-                        event,
-                    )
-            await shallow_sleep_async(0.2)
+            event = await self._res_queue.get()
+            try:
+                await self._outbound_dispatcher.dispatch(event)
+            except Exception:
+                self._log.exception(
+                    'Unhandled exception in result worker %s. EventType context: %s',
+                    self._worker_id,
+                    event,
+                )
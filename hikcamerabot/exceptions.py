@@ -41,9 +41,13 @@ class ServiceConfigError(ServiceError):
     pass
 
 
-class AlarmEventChunkDetectorError(CameraBotError):
+class ChunkLoopError(ServiceError):
     pass
 
 
-class ChunkLoopError(ServiceError):
+class ProcessSchedulerError(Exception):
+    pass
+
+
+class ProcessQueueTimeoutError(ProcessSchedulerError):
     pass
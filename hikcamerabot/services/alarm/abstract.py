@@ -0,0 +1,69 @@
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+from hikcamerabot.clients.hikvision.alert_stream import (
+    AlertStreamEvent,
+    AlertStreamStats,
+)
+
+if TYPE_CHECKING:
+    from hikcamerabot.camera import HikvisionCam
+
+
+class AbstractAlarmMonitoringTask(ABC):
+    """Alert stream source served by `AlertStreamMultiplexer`.
+
+    The multiplexer owns the connection: it reads `alert_stream`, tags each event
+    with the camera it belongs to and calls `process_event` from the shared queue.
+    In push mode events come from the device `host` to the HTTP listener instead.
+    """
+
+    def __init__(self) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._cls_name = self.__class__.__name__
+
+    def __str__(self) -> str:
+        return self.source_id
+
+    @property
+    @abstractmethod
+    def source_id(self) -> str:
+        """Unique alert stream source ID, e.g. camera ID or NVR host."""
+
+    @property
+    @abstractmethod
+    def host(self) -> str:
+        """Device host name or IP address, pushed events are matched by it."""
+
+    @property
+    @abstractmethod
+    def stream_stats(self) -> AlertStreamStats:
+        """Alert stream throughput counters of the source."""
+
+    @abstractmethod
+    def alert_stream(self) -> AsyncGenerator[AlertStreamEvent]:
+        """Open alert stream connection and yield decoded events."""
+
+    @abstractmethod
+    async def set_http_host(self, address: str, port: int, path: str) -> None:
+        """Make the device push events to the HTTP listener."""
+
+    @abstractmethod
+    def get_camera(self, event: AlertStreamEvent) -> 'HikvisionCam | None':
+        """Return camera the event belongs to or `None` to skip it."""
+
+    @abstractmethod
+    def process_event(self, cam: 'HikvisionCam', event: AlertStreamEvent) -> None:
+        """Apply per-camera delay and send alerts."""
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return counters of the source shown by the `/stats` command."""
+        return {'stream': self.stream_stats.as_dict()}
+
+    @staticmethod
+    def _get_hostname(url: str) -> str:
+        """Return host part of the device API URL, which may lack the scheme."""
+        return urlsplit(url if '//' in url else f'//{url}').hostname or url
@@ -5,15 +5,19 @@ from collections.abc import AsyncGenerator
 from typing import TYPE_CHECKING, Literal
 
 from hikcamerabot.clients.hikvision import HikvisionAPI
+from hikcamerabot.clients.hikvision.alert_stream import (
+    AlertStreamEvent,
+    AlertStreamStats,
+)
 from hikcamerabot.config.schemas.main_config import AlertSchema
 from hikcamerabot.constants import DETECTION_SWITCH_MAP
 from hikcamerabot.enums import AlarmType, DetectionType, ServiceType
 from hikcamerabot.exceptions import HikvisionAPIError, ServiceRuntimeError
 from hikcamerabot.services.abstract import AbstractService
+from hikcamerabot.services.alarm.camera.event_tracker import AlertEventTracker
 from hikcamerabot.services.alarm.camera.tasks.alarm_monitoring_task import (
     ServiceAlarmMonitoringTask,
 )
-from hikcamerabot.utils.task import create_task
 
 if TYPE_CHECKING:
     from hikcamerabot.camera import HikvisionCam
@@ -41,6 +45,8 @@ class AlarmService(AbstractService):
         self.bot = bot
         self.alert_delay: int = conf.delay
         self._alert_count: int = 0
+        self._stream_stats = AlertStreamStats()
+        self._event_tracker = AlertEventTracker()
 
         self._started: asyncio.Event = asyncio.Event()
 
@@ -51,6 +57,25 @@ class AlarmService(AbstractService):
     def increase_alert_count(self) -> None:
         self._alert_count += 1
 
+    @property
+    def stream_stats(self) -> AlertStreamStats:
+        """Alert stream throughput counters of the camera."""
+        return self._stream_stats
+
+    def track_event(
+        self, detection_type: DetectionType, event: AlertStreamEvent
+    ) -> bool:
+        """Track the event state and return whether the event is a new alert.
+
+        Alert video follows tracked events. Without event tracking every active
+        event is an alert.
+        """
+        if not self._conf.track_events:
+            return event.is_active
+        is_new = self._event_tracker.update(detection_type, event)
+        self.cam.follow_alert_event(self._event_tracker.expected_end_at)
+        return is_new
+
     @property
     def started(self) -> bool:
         """Check if alarm is enabled."""
@@ -79,13 +104,8 @@ class AlarmService(AbstractService):
         self._start_service_task()
 
     def _start_service_task(self) -> None:
-        task_name = f'{ServiceAlarmMonitoringTask.__name__}_{self.cam.id}'
-        create_task(
-            ServiceAlarmMonitoringTask(service=self).run(),
-            task_name=task_name,
-            logger=self._log,
-            exception_message='Task "%s" raised an exception',
-            exception_message_args=(task_name,),
+        self.bot.alert_stream_multiplexer.add_source(
+            ServiceAlarmMonitoringTask(service=self)
         )
 
     async def _enable_triggers_on_camera(self) -> None:
@@ -98,11 +118,16 @@ class AlarmService(AbstractService):
         if not self.started:
             raise ServiceRuntimeError('Alarm alert mode already stopped')
         self._started.clear()
+        self.bot.alert_stream_multiplexer.remove_source(self.cam.id)
+
+    async def alert_stream(self) -> AsyncGenerator[AlertStreamEvent]:
+        """Get Alarm stream events from Hikvision Camera."""
+        async for event in self._api.alert_stream(stats=self._stream_stats):
+            yield event
 
-    async def alert_stream(self) -> AsyncGenerator[str]:
-        """Get Alarm stream from Hikvision Camera."""
-        async for chunk in self._api.alert_stream():
-            yield chunk
+    async def set_http_host(self, address: str, port: int, path: str) -> None:
+        """Make the camera push events to the HTTP listener."""
+        await self._api.set_http_host(address=address, port=port, path=path)
 
     async def trigger_switch(self, trigger: DetectionType, state: bool) -> str | None:
         """Trigger switch."""
@@ -0,0 +1,29 @@
+from typing import Final
+
+from hikcamerabot.clients.hikvision.alert_stream import AlertStreamEvent
+from hikcamerabot.constants import DETECTION_SWITCH_MAP
+from hikcamerabot.enums import DetectionType
+
+_EVENT_NAME_TO_DETECTION_TYPE: Final[dict[str, DetectionType]] = {
+    inner_map['event_name'].value: key
+    for key, inner_map in DETECTION_SWITCH_MAP.items()
+}
+
+
+class AlarmEventDetector:
+    """Detect trigger event from alarm/alert stream."""
+
+    @classmethod
+    def detect(cls, event: AlertStreamEvent) -> DetectionType | None:
+        """Return detection type of active trigger event.
+
+        Inactive and non-detection events (e.g. `videoloss` heartbeats) are ignored.
+        """
+        if not event.is_active:
+            return None
+        return cls.detect_type(event)
+
+    @staticmethod
+    def detect_type(event: AlertStreamEvent) -> DetectionType | None:
+        """Return detection type of trigger event in any state."""
+        return _EVENT_NAME_TO_DETECTION_TYPE.get(event.event_type)
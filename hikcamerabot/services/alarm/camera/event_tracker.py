@@ -0,0 +1,58 @@
+import time
+from dataclasses import dataclass
+
+from hikcamerabot.clients.hikvision.alert_stream import AlertStreamEvent
+from hikcamerabot.enums import DetectionType
+
+
+@dataclass(slots=True)
+class TrackedAlertEvent:
+    last_active_at: float
+    active_post_count: int | None
+
+
+class AlertEventTracker:
+    """Track camera detection events from start to end.
+
+    Devices repeat `active` notification while the event lasts, with growing
+    `activePostCount`, and some of them send `inactive` one when it ends. Event
+    without `active` notifications for `END_TIMEOUT` seconds is ended as well.
+    """
+
+    END_TIMEOUT: float = 5.0
+
+    def __init__(self) -> None:
+        self._events: dict[DetectionType, TrackedAlertEvent] = {}
+        self._last_ended_at: float = 0.0
+
+    @property
+    def expected_end_at(self) -> float:
+        """Unix time all events end at unless new notifications arrive."""
+        active_end_at = max(
+            (event.last_active_at for event in self._events.values()), default=0.0
+        )
+        return max(self._last_ended_at, active_end_at + self.END_TIMEOUT)
+
+    def update(self, detection_type: DetectionType, event: AlertStreamEvent) -> bool:
+        """Update the event state and return `True` when a new event started."""
+        now = time.time()
+        tracked = self._events.get(detection_type)
+        if tracked and now - tracked.last_active_at > self.END_TIMEOUT:
+            tracked = None
+
+        if not event.is_active:
+            self._events.pop(detection_type, None)
+            if tracked:
+                self._last_ended_at = now
+            return False
+
+        # Post count starts over with a new event.
+        is_new = tracked is None or (
+            event.active_post_count is not None
+            and tracked.active_post_count is not None
+            and event.active_post_count < tracked.active_post_count
+        )
+        self._events[detection_type] = TrackedAlertEvent(
+            last_active_at=now, active_post_count=event.active_post_count
+        )
+        return is_new
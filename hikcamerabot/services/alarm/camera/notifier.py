@@ -1,6 +1,7 @@
 import logging
 from typing import TYPE_CHECKING
 
+from hikcamerabot.clients.hikvision.alert_stream import AlertStreamEvent
 from hikcamerabot.enums import DetectionType
 from hikcamerabot.services.alarm.camera.tasks.notifications import (
     AlarmPicNotificationTask,
@@ -25,7 +26,9 @@ class AlarmNotifier:
         self._cam = cam
         self._alert_count = alert_count
 
-    def notify(self, detection_type: DetectionType) -> None:
+    def notify(
+        self, detection_type: DetectionType, event: AlertStreamEvent | None = None
+    ) -> None:
         for task_cls in self.ALARM_NOTIFICATION_TASKS:
             cls_name = task_cls.__name__
             self._log.info(
@@ -38,6 +41,7 @@ class AlarmNotifier:
                 detection_type=detection_type,
                 cam=self._cam,
                 alert_count=self._alert_count,
+                event=event,
             )
             create_task(
                 task.run(),
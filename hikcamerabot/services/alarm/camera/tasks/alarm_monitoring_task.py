@@ -1,86 +1,77 @@
 import time
-from typing import Literal
+from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING
 
-from httpx import ConnectError
-from tenacity import retry, retry_if_exception_type, wait_fixed
-
-from hikcamerabot.enums import DetectionType, ServiceType
-from hikcamerabot.exceptions import AlarmEventChunkDetectorError, ChunkLoopError
-from hikcamerabot.services.abstract import AbstractServiceTask
-from hikcamerabot.services.alarm.camera.chunk import AlarmEventChunkDetector
+from hikcamerabot.clients.hikvision.alert_stream import (
+    AlertStreamEvent,
+    AlertStreamStats,
+)
+from hikcamerabot.enums import DetectionType
+from hikcamerabot.services.alarm.abstract import AbstractAlarmMonitoringTask
+from hikcamerabot.services.alarm.camera.detector import AlarmEventDetector
 from hikcamerabot.services.alarm.camera.notifier import AlarmNotifier
 
+if TYPE_CHECKING:
+    from hikcamerabot.camera import HikvisionCam
+    from hikcamerabot.services.alarm import AlarmService
 
-class ServiceAlarmMonitoringTask(AbstractServiceTask):
-    """Alarm Pusher Service Class."""
-
-    TYPE: Literal[ServiceType.ALARM] = ServiceType.ALARM
 
-    RETRY_WAIT: float = 0.5
+class ServiceAlarmMonitoringTask(AbstractAlarmMonitoringTask):
+    """Alarm Pusher Service Class."""
 
-    def __init__(self, *args, **kwargs) -> None:
-        super().__init__(*args, **kwargs)
+    def __init__(self, service: 'AlarmService') -> None:
+        super().__init__()
+        self.service = service
+        self._cam = service.cam
         self._alert_notifier = AlarmNotifier(
             cam=self._cam,
             alert_count=self.service.alert_count,
         )
+        self._wait_before: int = 0
+
+    @property
+    def source_id(self) -> str:
+        return self._cam.id
+
+    @property
+    def host(self) -> str:
+        return self._get_hostname(self._cam.host)
+
+    @property
+    def stream_stats(self) -> AlertStreamStats:
+        return self.service.stream_stats
 
-    @retry(retry=retry_if_exception_type(Exception), wait=wait_fixed(RETRY_WAIT))
-    async def run(self) -> None:
-        """Monitor and process alarm/alert chunks from Hikvision Camera."""
-        self._log.info('[%s] Starting alert pusher task', self._cam.id)
-        try:
-            await self._process_chunks()
-        except ChunkLoopError:
-            self._log.error(
-                '[%s] Unexpectedly exited from stream chunk processing loop. '
-                'Retrying in %s seconds...',
-                self._cam.id,
-                self.RETRY_WAIT,
-            )
-            raise
-        except ConnectError:
-            self._log.error(
-                '[%s] Failed to connect to Alert StreamType. Retrying in %s seconds...',
-                self._cam.id,
-                self.RETRY_WAIT,
-            )
-            raise
-        except Exception:
-            self._log.exception(
-                '[%s] Unknown exception in %s. Retrying in %s seconds...',
-                self._cam.id,
-                self.__class__.__name__,
-                self.RETRY_WAIT,
-            )
-            raise
+    async def alert_stream(self) -> AsyncGenerator[AlertStreamEvent]:
+        async for event in self.service.alert_stream():
+            yield event
 
-    async def _process_chunks(self) -> None:
-        """Process chunks received from Hikvision camera alert stream."""
-        wait_before = 0
-        async for chunk in self.service.alert_stream():
-            self._log.debug('Alert chunk for cam "%s": %s', self._cam.id, chunk)
-            if not self.service.started:
-                self._log.info('[%s] Exiting alert pusher task', self._cam.id)
-                break
+    async def set_http_host(self, address: str, port: int, path: str) -> None:
+        await self.service.set_http_host(address=address, port=port, path=path)
 
-            if int(time.time()) < wait_before or not chunk:
-                continue
+    def get_camera(self, event: AlertStreamEvent) -> 'HikvisionCam':  # noqa: ARG002
+        return self._cam
 
-            try:
-                detection_type = AlarmEventChunkDetector.detect_chunk(chunk)
-            except AlarmEventChunkDetectorError as err:
-                self._log.error(err)
-                continue
+    def process_event(self, cam: 'HikvisionCam', event: AlertStreamEvent) -> None:
+        """Process event received from Hikvision camera alert stream."""
+        self._log.debug('Alert event for cam "%s": %s', cam.id, event)
+        if not self.service.started:
+            return
 
-            if detection_type:
-                self.service.increase_alert_count()
-                self._send_alerts(detection_type)
-                wait_before = int(time.time()) + self.service.alert_delay
-        else:
-            raise ChunkLoopError
+        detection_type = AlarmEventDetector.detect_type(event)
+        if (
+            not detection_type
+            or not self.service.track_event(detection_type, event)
+            or int(time.time()) < self._wait_before
+        ):
+            return
+        self.service.stream_stats.add_detection()
+        self.service.increase_alert_count()
+        self._send_alerts(detection_type, event)
+        self._wait_before = int(time.time()) + self.service.alert_delay
 
-    def _send_alerts(self, detection_type: DetectionType) -> None:
+    def _send_alerts(
+        self, detection_type: DetectionType, event: AlertStreamEvent
+    ) -> None:
         self._log.info('[%s] Sending %s alerts', self._cam.id, detection_type)
         # TODO: Put to queue and await everything, don't schedule tasks.
-        self._alert_notifier.notify(detection_type)
+        self._alert_notifier.notify(detection_type, event)
@@ -1,12 +1,14 @@
 import logging
+import time
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
 from emoji import emojize
 from pyrogram.enums import ParseMode
 
+from hikcamerabot.clients.hikvision.alert_stream import AlertStreamEvent
 from hikcamerabot.constants import DETECTION_SWITCH_MAP
-from hikcamerabot.enums import DetectionType, EventType, VideoGifType
+from hikcamerabot.enums import DetectionType, EventType, PictureType, VideoGifType
 from hikcamerabot.event_engine.events.outbound import (
     AlertSnapshotOutboundEvent,
     SendTextOutboundEvent,
@@ -19,12 +21,17 @@ if TYPE_CHECKING:
 
 class AbstractAlertNotificationTask(ABC):
     def __init__(
-        self, detection_type: DetectionType, cam: 'HikvisionCam', alert_count: int
+        self,
+        detection_type: DetectionType,
+        cam: 'HikvisionCam',
+        alert_count: int,
+        event: AlertStreamEvent | None = None,
     ) -> None:
         self._log = logging.getLogger(self.__class__.__name__)
         self._detection_type = detection_type
         self._cam = cam
         self._alert_count = alert_count
+        self._event = event
         self._result_queue = get_result_queue()
 
     async def run(self) -> None:
@@ -86,7 +93,20 @@ class AlarmPicNotificationTask(AbstractAlertNotificationTask):
         resize = not self._cam.conf.alert.get_detection_schema_by_type(
             type_=self._detection_type.value
         ).fullpic
-        photo, ts = await self._cam.take_snapshot(channel=channel, resize=resize)
+        if self._event and self._event.image is not None:
+            # Picture taken at the detection moment, no extra API request.
+            photo, ts = await self._cam.process_snapshot(
+                raw_snapshot=bytes(self._event.image),
+                taken_at=int(self._event.timestamp.timestamp())
+                if self._event.timestamp
+                else int(time.time()),
+                resize=resize,
+                picture_type=PictureType.ON_ALERT,
+            )
+        else:
+            photo, ts = await self._cam.take_snapshot(
+                channel=channel, resize=resize, picture_type=PictureType.ON_ALERT
+            )
         await self._result_queue.put(
             AlertSnapshotOutboundEvent(
                 cam=self._cam,
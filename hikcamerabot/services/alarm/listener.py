@@ -0,0 +1,207 @@
+"""Alert HTTP listener module."""
+
+import asyncio
+import hmac
+import logging
+from typing import TYPE_CHECKING, Final
+
+from hikcamerabot.clients.hikvision.alert_stream import AlertStreamParser, get_boundary
+
+if TYPE_CHECKING:
+    from hikcamerabot.config.schemas.main_config import AlertListenerSchema
+    from hikcamerabot.services.alarm.multiplexer import AlertStreamMultiplexer
+
+_HEADERS_END: Final[bytes] = b'\r\n\r\n'
+_CRLF: Final[bytes] = b'\r\n'
+
+_RESPONSE_TPL: Final[str] = (
+    'HTTP/1.1 {status}\r\nContent-Length: 0\r\nConnection: {connection}\r\n\r\n'
+)
+_STATUS_OK: Final[str] = '200 OK'
+_STATUS_BAD_REQUEST: Final[str] = '400 Bad Request'
+_STATUS_NOT_FOUND: Final[str] = '404 Not Found'
+_STATUS_METHOD_NOT_ALLOWED: Final[str] = '405 Method Not Allowed'
+_STATUS_TOO_LARGE: Final[str] = '413 Content Too Large'
+
+
+class _BadRequestError(Exception):
+    def __init__(self, status: str) -> None:
+        super().__init__(status)
+        self.status = status
+
+
+class AlertHttpListener:
+    """Receive events cameras and NVRs POST to the configured HTTP host.
+
+    Each request body is one or more `<EventNotificationAlert>` documents,
+    `multipart/form-data` with the detection picture or bare XML. Bodies are
+    parsed by the same parser as alert streams and the events are put into the
+    multiplexer queue, tagged with the source matched by the sender address.
+    Connections are kept alive, so devices don't reconnect for every event.
+    """
+
+    # Idle keep-alive connection and slow request timeout.
+    READ_TIMEOUT: float = 30.0
+    MAX_HEADERS_SIZE: int = 64 * 1024
+    MAX_BODY_SIZE: int = 8 * 1024 * 1024
+
+    def __init__(
+        self, conf: 'AlertListenerSchema', multiplexer: 'AlertStreamMultiplexer'
+    ) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._conf = conf
+        self._multiplexer = multiplexer
+        self._path = conf.notification_path.encode()
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        if self._server:
+            return
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            host=self._conf.host,
+            port=self._conf.port,
+            limit=self.MAX_HEADERS_SIZE,
+        )
+        self._log.info(
+            'Listening for alert events on %s:%s%s',
+            self._conf.host,
+            self._conf.port,
+            self._conf.path,
+        )
+
+    async def stop(self) -> None:
+        if not self._server:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        peer_host = writer.get_extra_info('peername')[0]
+        try:
+            while await self._handle_request(peer_host, reader, writer):
+                pass
+        except (TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception:
+            self._log.exception('Failed to handle alert request from %s', peer_host)
+        finally:
+            writer.close()
+
+    async def _handle_request(
+        self,
+        peer_host: str,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> bool:
+        """Handle one request and return whether the connection is kept alive."""
+        async with asyncio.timeout(self.READ_TIMEOUT):
+            try:
+                head = await reader.readuntil(_HEADERS_END)
+            except asyncio.LimitOverrunError:
+                await self._respond(writer, _STATUS_TOO_LARGE, keep_alive=False)
+                return False
+            try:
+                method, path, headers = self._parse_head(head)
+                body = await self._read_body(reader, headers)
+            except _BadRequestError as err:
+                await self._respond(writer, err.status, keep_alive=False)
+                return False
+
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        if method != 'POST':
+            status = _STATUS_METHOD_NOT_ALLOWED
+        elif not self._is_notification_path(path):
+            status = _STATUS_NOT_FOUND
+        else:
+            status = _STATUS_OK
+            self._dispatch(peer_host, headers.get('content-type'), body)
+        await self._respond(writer, status, keep_alive=keep_alive)
+        return keep_alive
+
+    def _is_notification_path(self, path: str) -> bool:
+        # Constant time comparison, path holds the token.
+        return hmac.compare_digest(path.partition('?')[0].encode('latin-1'), self._path)
+
+    @staticmethod
+    def _parse_head(head: bytes) -> tuple[str, str, dict[str, str]]:
+        request_line, *header_lines = head[: -len(_HEADERS_END)].split(_CRLF)
+        try:
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise _BadRequestError(_STATUS_BAD_REQUEST) from None
+        headers: dict[str, str] = {}
+        for line in header_lines:
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        return method.upper(), path, headers
+
+    async def _read_body(
+        self, reader: asyncio.StreamReader, headers: dict[str, str]
+    ) -> bytes:
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            return await self._read_chunked_body(reader)
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise _BadRequestError(_STATUS_BAD_REQUEST) from None
+        if length < 0:
+            raise _BadRequestError(_STATUS_BAD_REQUEST)
+        if length > self.MAX_BODY_SIZE:
+            raise _BadRequestError(_STATUS_TOO_LARGE)
+        return await reader.readexactly(length)
+
+    async def _read_chunked_body(self, reader: asyncio.StreamReader) -> bytes:
+        chunks: list[bytes] = []
+        size = 0
+        while True:
+            size_line = await reader.readuntil(_CRLF)
+            try:
+                chunk_size = int(size_line.split(b';', 1)[0], 16)
+            except ValueError:
+                raise _BadRequestError(_STATUS_BAD_REQUEST) from None
+            if not chunk_size:
+                # Skip trailer headers.
+                while await reader.readuntil(_CRLF) != _CRLF:
+                    pass
+                return b''.join(chunks)
+            size += chunk_size
+            if size > self.MAX_BODY_SIZE:
+                raise _BadRequestError(_STATUS_TOO_LARGE)
+            chunks.append(await reader.readexactly(chunk_size))
+            await reader.readexactly(len(_CRLF))
+
+    def _dispatch(self, peer_host: str, content_type: str | None, body: bytes) -> None:
+        source = self._multiplexer.get_push_source(peer_host)
+        parser = AlertStreamParser(
+            boundary=get_boundary(content_type),
+            stats=source.stream_stats if source else None,
+        )
+        events = parser.feed(body) + parser.flush()
+        if not events:
+            return
+        if not source and self._conf.trust_reported_address:
+            # Device behind NAT or with several interfaces, use reported address.
+            source = self._multiplexer.get_push_source(events[0].ip_address or '')
+        if not source:
+            self._log.warning(
+                'Skipping %d alert events from unknown device %s',
+                len(events),
+                peer_host,
+            )
+            return
+        self._multiplexer.put_events(source, events)
+
+    @staticmethod
+    async def _respond(
+        writer: asyncio.StreamWriter, status: str, keep_alive: bool
+    ) -> None:
+        writer.write(
+            _RESPONSE_TPL.format(
+                status=status, connection='keep-alive' if keep_alive else 'close'
+            ).encode()
+        )
+        await writer.drain()
@@ -0,0 +1,255 @@
+"""Alert stream multiplexer module."""
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from typing import TYPE_CHECKING, Any, Final
+
+from httpx import ConnectError
+
+from hikcamerabot.exceptions import ChunkLoopError
+from hikcamerabot.utils.backoff import ExponentialBackoff
+from hikcamerabot.utils.task import create_task
+
+if TYPE_CHECKING:
+    from hikcamerabot.camera import HikvisionCam
+    from hikcamerabot.clients.hikvision.alert_stream import AlertStreamEvent
+    from hikcamerabot.config.schemas.main_config import AlertListenerSchema
+    from hikcamerabot.services.alarm.abstract import AbstractAlarmMonitoringTask
+
+type AlertStreamQueueItem = tuple[
+    'AbstractAlarmMonitoringTask', 'HikvisionCam', 'AlertStreamEvent'
+]
+
+_QUEUE_MAXSIZE: Final[int] = 1000
+
+
+class AlertStreamMultiplexer:
+    """Own all camera and NVR alert stream connections.
+
+    Every source gets a reader that reconnects with jittered exponential backoff
+    and puts decoded events tagged with the camera into one bounded queue.
+    A single consumer takes events off the queue and hands them to the source
+    for per-camera delay handling and alert sending.
+
+    In push mode no connections are held: devices POST events to the HTTP
+    listener, which puts them into the same queue with `put_events`.
+    """
+
+    RECONNECT_WAIT_BASE: float = 0.5
+    RECONNECT_WAIT_MAX: float = 60.0
+
+    # Connection which stayed up that long is considered healthy again.
+    RECONNECT_RESET_AFTER: float = 60.0
+
+    def __init__(
+        self,
+        queue_maxsize: int = _QUEUE_MAXSIZE,
+        listener_conf: 'AlertListenerSchema | None' = None,
+    ) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._queue: asyncio.Queue[AlertStreamQueueItem] = asyncio.Queue(
+            maxsize=queue_maxsize
+        )
+        self._listener_conf = (
+            listener_conf if listener_conf and listener_conf.enabled else None
+        )
+        self._sources: dict[str, AbstractAlarmMonitoringTask] = {}
+        # Reader or, in push mode, device configuration task of every source.
+        self._readers: dict[str, asyncio.Task] = {}
+        self._push_sources: dict[str, AbstractAlarmMonitoringTask] = {}
+        self._consumer: asyncio.Task | None = None
+
+    @property
+    def queue_size(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def is_push_mode(self) -> bool:
+        return self._listener_conf is not None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'queue_size': self.queue_size,
+            'sources': {
+                source_id: source.get_stats()
+                for source_id, source in self._sources.items()
+            },
+        }
+
+    def start(self) -> None:
+        """Start the consumer task."""
+        if self._consumer:
+            return
+        task_name = f'{self.__class__.__name__}_consumer'
+        self._consumer = create_task(
+            self._consume(),
+            task_name=task_name,
+            logger=self._log,
+            exception_message='Task "%s" raised an exception',
+            exception_message_args=(task_name,),
+        )
+
+    def add_source(self, source: 'AbstractAlarmMonitoringTask') -> None:
+        """Start reading alert stream of the source or accept its pushed events."""
+        if source.source_id in self._readers:
+            self._log.warning('[%s] Alert stream is already monitored', source)
+            return
+        self._sources[source.source_id] = source
+        if self.is_push_mode:
+            self._push_sources[source.host] = source
+            task_name = f'{self.__class__.__name__}_configure_{source.source_id}'
+            coro = self._configure_source(source)
+        else:
+            task_name = f'{self.__class__.__name__}_reader_{source.source_id}'
+            coro = self._read_source(source)
+        self._readers[source.source_id] = create_task(
+            coro,
+            task_name=task_name,
+            logger=self._log,
+            exception_message='Task "%s" raised an exception',
+            exception_message_args=(task_name,),
+        )
+
+    def remove_source(self, source_id: str) -> None:
+        """Stop reading alert stream and close its connection."""
+        self._sources.pop(source_id, None)
+        task = self._readers.pop(source_id, None)
+        if task:
+            self._log.info('[%s] Closing alert stream', source_id)
+            task.cancel()
+        for host, source in list(self._push_sources.items()):
+            if source.source_id == source_id:
+                del self._push_sources[host]
+
+    def get_push_source(self, host: str) -> 'AbstractAlarmMonitoringTask | None':
+        """Return source of the device pushing events from the host."""
+        return self._push_sources.get(host)
+
+    def put_events(
+        self,
+        source: 'AbstractAlarmMonitoringTask',
+        events: 'list[AlertStreamEvent]',
+    ) -> None:
+        """Queue events pushed by the source device, drop them if it's full."""
+        for event in events:
+            cam = source.get_camera(event)
+            if not cam:
+                continue
+            try:
+                self._queue.put_nowait((source, cam, event))
+            except asyncio.QueueFull:
+                self._log.warning(
+                    '[%s] Alert queue is full, dropping pushed event: %s', cam.id, event
+                )
+
+    async def _configure_source(self, source: 'AbstractAlarmMonitoringTask') -> None:
+        await self._resolve_push_source(source)
+        conf = self._listener_conf
+        if not conf.configure_devices:
+            self._log.info('[%s] Waiting for pushed alert events', source)
+            return
+        backoff = ExponentialBackoff(
+            base=self.RECONNECT_WAIT_BASE, cap=self.RECONNECT_WAIT_MAX
+        )
+        while True:
+            try:
+                await source.set_http_host(
+                    address=conf.public_address,
+                    port=conf.port,
+                    path=conf.notification_path,
+                )
+            except Exception:
+                self._log.exception('[%s] Failed to set HTTP notification host', source)
+            else:
+                self._log.info(
+                    '[%s] Device pushes alert events to %s:%s%s',
+                    source,
+                    conf.public_address,
+                    conf.port,
+                    conf.path,
+                )
+                return
+            await asyncio.sleep(backoff.next_delay())
+
+    async def _resolve_push_source(self, source: 'AbstractAlarmMonitoringTask') -> None:
+        """Match pushed events of a device configured by host name.
+
+        Events are matched by the sender IP address, so the name is resolved
+        once and the source is registered by every address of the host.
+        """
+        try:
+            ipaddress.ip_address(source.host)
+        except ValueError:
+            pass
+        else:
+            return
+        backoff = ExponentialBackoff(
+            base=self.RECONNECT_WAIT_BASE, cap=self.RECONNECT_WAIT_MAX
+        )
+        while True:
+            try:
+                addr_infos = await asyncio.get_running_loop().getaddrinfo(
+                    source.host, None, type=socket.SOCK_STREAM
+                )
+            except OSError as err:
+                self._log.error(
+                    '[%s] Failed to resolve "%s": %s', source, source.host, err
+                )
+            else:
+                addresses = {sockaddr[0] for *_, sockaddr in addr_infos}
+                for address in addresses:
+                    self._push_sources[address] = source
+                self._log.info(
+                    '[%s] Matching pushed alert events from %s',
+                    source,
+                    ', '.join(sorted(addresses)),
+                )
+                return
+            await asyncio.sleep(backoff.next_delay())
+
+    async def _read_source(self, source: 'AbstractAlarmMonitoringTask') -> None:
+        backoff = ExponentialBackoff(
+            base=self.RECONNECT_WAIT_BASE, cap=self.RECONNECT_WAIT_MAX
+        )
+        while True:
+            self._log.info('[%s] Connecting to alert stream', source)
+            connected_at = time.monotonic()
+            try:
+                await self._read_events(source)
+            except ChunkLoopError:
+                self._log.error('[%s] Alert stream unexpectedly closed', source)
+            except ConnectError:
+                self._log.error('[%s] Failed to connect to alert stream', source)
+            except Exception:
+                self._log.exception('[%s] Unknown alert stream exception', source)
+
+            if time.monotonic() - connected_at > self.RECONNECT_RESET_AFTER:
+                backoff.reset()
+            delay = backoff.next_delay()
+            self._log.info(
+                '[%s] Reconnecting to alert stream in %.1f seconds (attempt %d)',
+                source,
+                delay,
+                backoff.attempt,
+            )
+            await asyncio.sleep(delay)
+
+    async def _read_events(self, source: 'AbstractAlarmMonitoringTask') -> None:
+        async for event in source.alert_stream():
+            cam = source.get_camera(event)
+            if cam:
+                await self._queue.put((source, cam, event))
+        raise ChunkLoopError
+
+    async def _consume(self) -> None:
+        while True:
+            source, cam, event = await self._queue.get()
+            try:
+                source.process_event(cam, event)
+            except Exception:
+                self._log.exception(
+                    '[%s] Failed to process alert stream event: %s', cam.id, event
+                )
@@ -0,0 +1,59 @@
+import logging
+from collections import Counter
+
+from hikcamerabot.camera import HikvisionCam
+from hikcamerabot.clients.hikvision.alert_stream import AlertStreamEvent
+
+
+class NvrChannelRouter:
+    """Route NVR alert stream events to cameras by channel.
+
+    Camera config `nvr.channel_name` may hold either NVR channel ID or name.
+    Event `channelID`, `dynChannelID` and `channelName` are looked up in this
+    order in the index built once from camera configs. Events of unknown
+    channels are counted and skipped.
+    """
+
+    def __init__(self, cameras: list[HikvisionCam]) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._cams_by_id: dict[int, HikvisionCam] = {}
+        self._cams_by_name: dict[str, HikvisionCam] = {}
+        for cam in cameras:
+            self._cams_by_name[cam.nvr_channel_name] = cam
+            if cam.nvr_channel_name.isdigit():
+                self._cams_by_id[int(cam.nvr_channel_name)] = cam
+        self._unknown_channels: Counter[str] = Counter()
+
+    @property
+    def unknown_channels(self) -> dict[str, int]:
+        """Skipped event count per unknown channel."""
+        return dict(self._unknown_channels)
+
+    def get_camera(self, event: AlertStreamEvent) -> HikvisionCam | None:
+        for channel_id in (event.channel_id, event.dyn_channel_id):
+            if channel_id is not None and channel_id in self._cams_by_id:
+                return self._cams_by_id[channel_id]
+        if event.channel_name is not None and event.channel_name in self._cams_by_name:
+            return self._cams_by_name[event.channel_name]
+        self._count_unknown(event)
+        return None
+
+    def _count_unknown(self, event: AlertStreamEvent) -> None:
+        channel = next(
+            (
+                str(value)
+                for value in (
+                    event.channel_id,
+                    event.dyn_channel_id,
+                    event.channel_name,
+                )
+                if value is not None
+            ),
+            'no channel',
+        )
+        self._unknown_channels[channel] += 1
+        # Unconfigured channel sends events all the time, warn just once.
+        if self._unknown_channels[channel] == 1:
+            self._log.warning(
+                'Skipping events of unknown NVR channel "%s": %s', channel, event
+            )
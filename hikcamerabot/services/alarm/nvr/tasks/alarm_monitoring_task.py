@@ -1,109 +1,91 @@
-import logging
 import time
-
-from httpx import ConnectError
-from tenacity import retry, retry_if_exception_type, wait_fixed
+from collections.abc import AsyncGenerator
+from typing import Any
 
 from hikcamerabot.camera import HikvisionCam
-from hikcamerabot.enums import DetectionType
-from hikcamerabot.exceptions import AlarmEventChunkDetectorError, ChunkLoopError
-from hikcamerabot.services.alarm.camera.chunk import (
-    AlarmEventChunkDetector,
-    CameraNvrChannelNameDetector,
+from hikcamerabot.clients.hikvision.alert_stream import (
+    AlertStreamEvent,
+    AlertStreamStats,
 )
+from hikcamerabot.enums import DetectionType
+from hikcamerabot.services.alarm.abstract import AbstractAlarmMonitoringTask
+from hikcamerabot.services.alarm.camera.detector import AlarmEventDetector
 from hikcamerabot.services.alarm.camera.notifier import AlarmNotifier
+from hikcamerabot.services.alarm.nvr.router import NvrChannelRouter
 
 
-class NvrAlarmMonitoringTask:
+class NvrAlarmMonitoringTask(AbstractAlarmMonitoringTask):
     """NVR Alarm Pusher Class."""
 
-    RETRY_WAIT: int = 0.5
-
-    def __init__(
-        self,
-        host: str,
-        cameras: list[HikvisionCam],
-        run_forever: bool = True,
-    ) -> None:
-        self._log = logging.getLogger(self.__class__.__name__)
+    def __init__(self, host: str, cameras: list[HikvisionCam]) -> None:
+        super().__init__()
         self._host = host
         self._cameras = cameras
-
-        _channel_name_to_cam_map: dict[str, HikvisionCam] = {}
-        _cam_delays: dict[HikvisionCam, int] = {}
-        for cam in cameras:
-            _channel_name_to_cam_map[cam.nvr_channel_name] = cam
-            _cam_delays[cam] = 0
-
-        self._channel_name_to_cam_map = _channel_name_to_cam_map
-        self._cam_delays = _cam_delays
+        self._router = NvrChannelRouter(cameras)
+        self._wait_before: dict[HikvisionCam, int] = dict.fromkeys(cameras, 0)
 
         # Each camera connects to the same NVR with the same credentials.
-        # We need Hikvision API instance just to get the NVR Alert StreamType.
+        # We need Hikvision API instance just to get the NVR Alert Stream.
         self._api = cameras[0]._api  # noqa: SLF001
+        self._stream_stats = AlertStreamStats()
 
-        self._run_forever = run_forever
-        self._cls_name = self.__class__.__name__
+    @property
+    def source_id(self) -> str:
+        return self._host
 
-    @retry(retry=retry_if_exception_type(Exception), wait=wait_fixed(RETRY_WAIT))
-    async def run(self) -> None:
-        """Monitor and process alarm/alert chunks from NVR Alarm StreamType."""
-        self._log.info('Starting NVR Alarm Monitoring Task')
-        try:
-            await self._process_chunks()
-        except ChunkLoopError:
-            self._log.error(
-                'Unexpectedly exited from NVR "%s" Alert StreamType chunk processing loop. '
-                'Retrying in %s seconds...',
-                self._host,
-                self.RETRY_WAIT,
-            )
-            raise
-        except ConnectError:
-            self._log.error(
-                'Failed to connect to NVR "%s" Alert StreamType. Retrying in %s seconds...',
-                self._host,
-                self.RETRY_WAIT,
-            )
-            raise
-        except Exception:
-            self._log.exception(
-                'Unknown exception in "%s" for "%s". Retrying in %s seconds...',
-                self.__class__.__name__,
-                self._host,
-                self.RETRY_WAIT,
-            )
-            raise
+    @property
+    def host(self) -> str:
+        return self._get_hostname(self._host)
 
-    async def _process_chunks(self) -> None:
-        """Process chunks received from NVR Alert StreamType."""
-        async for chunk in self._api.alert_stream():
-            self._log.debug('Alert chunk from NVR "%s": %s', self._host, chunk)
-            if not chunk:
-                continue
-            try:
-                detection_type = AlarmEventChunkDetector.detect_chunk(chunk)
-            except AlarmEventChunkDetectorError as err:
-                self._log.error(err)
-                continue
+    @property
+    def stream_stats(self) -> AlertStreamStats:
+        """Alert stream throughput counters of the NVR."""
+        return self._stream_stats
 
-            if detection_type:
-                cam = self._parse_cam(chunk)
-                if int(time.time()) < self._cam_delays[cam]:
-                    continue
-                self._send_alerts(cam=cam, detection_type=detection_type)
-                self._cam_delays[cam] = int(time.time()) + 15
-        raise ChunkLoopError
+    @property
+    def unknown_channels(self) -> dict[str, int]:
+        """Skipped event count per unknown NVR channel."""
+        return self._router.unknown_channels
 
-    def _parse_cam(self, chunk: str) -> HikvisionCam:
-        channel_name = CameraNvrChannelNameDetector.detect_channel_name(chunk)
-        if not channel_name:
-            raise RuntimeError(f'Could not find NVR channel name in chunk: "{chunk}"')
-        return self._channel_name_to_cam_map[channel_name]
+    def get_stats(self) -> dict[str, Any]:
+        return {**super().get_stats(), 'unknown_channels': self.unknown_channels}
 
-    def _send_alerts(self, cam: HikvisionCam, detection_type: DetectionType) -> None:
+    async def alert_stream(self) -> AsyncGenerator[AlertStreamEvent]:
+        async for event in self._api.alert_stream(stats=self._stream_stats):
+            yield event
+
+    async def set_http_host(self, address: str, port: int, path: str) -> None:
+        await self._api.set_http_host(address=address, port=port, path=path)
+
+    def get_camera(self, event: AlertStreamEvent) -> HikvisionCam | None:
+        if not AlarmEventDetector.detect_type(event):
+            return None
+        return self._router.get_camera(event)
+
+    def process_event(self, cam: HikvisionCam, event: AlertStreamEvent) -> None:
+        """Process event received from NVR Alert Stream."""
+        self._log.debug('Alert event from NVR "%s": %s', self._host, event)
+        alarm = cam.services.alarm
+        detection_type = AlarmEventDetector.detect_type(event)
+        if not detection_type or not alarm.track_event(detection_type, event):
+            return
+        if int(time.time()) < self._wait_before[cam]:
+            return
+        alarm.stream_stats.add_detection()
+        alarm.increase_alert_count()
+        self._send_alerts(cam=cam, detection_type=detection_type, event=event)
+        self._wait_before[cam] = int(time.time()) + alarm.alert_delay
+
+    def _send_alerts(
+        self,
+        cam: HikvisionCam,
+        detection_type: DetectionType,
+        event: AlertStreamEvent,
+    ) -> None:
         self._log.info(
             '[%s - %s] Sending "%s" alerts', cam.id, cam.description, detection_type
         )
         # TODO: Put to queue and await everything, don't schedule tasks.
-        AlarmNotifier(cam=cam, alert_count=0).notify(detection_type)
+        AlarmNotifier(cam=cam, alert_count=cam.services.alarm.alert_count).notify(
+            detection_type, event
+        )
@@ -15,18 +15,25 @@ from hikcamerabot.constants import (
     FFMPEG_CMD_SCALE_FILTER,
     FFMPEG_CMD_TRANSCODE,
     FFMPEG_CMD_TRANSCODE_GENERAL,
+    FFMPEG_INGEST_ENCODING,
     FFMPEG_SRS_RTMP_VIDEO_SRC,
     RTSP_TRANSPORT_TPL,
     SRS_LIVESTREAM_NAME_TPL,
 )
-from hikcamerabot.enums import ServiceType, StreamType, VideoEncoderType
+from hikcamerabot.enums import (
+    ProcessClass,
+    ServiceType,
+    StreamType,
+    VideoEncoderType,
+)
 from hikcamerabot.exceptions import ServiceConfigError, ServiceRuntimeError
 from hikcamerabot.services.abstract import AbstractService
-from hikcamerabot.services.tasks.livestream import (
-    FfmpegStdoutReaderTask,
-    ServiceStreamerTask,
-)
+from hikcamerabot.services.stream.ingest import ChannelIngest, IngestOutput
+from hikcamerabot.services.stream.supervisor import AbstractSupervisedProcess
+from hikcamerabot.services.tasks.livestream import FfmpegProgressReaderTask
+from hikcamerabot.utils.ffmpeg_progress import FfmpegProgress, FfmpegProgressMonitor
 from hikcamerabot.utils.process import kill_proc
+from hikcamerabot.utils.process_scheduler import get_process_scheduler
 from hikcamerabot.utils.shared import shallow_sleep_async
 from hikcamerabot.utils.task import create_task
 
@@ -36,14 +43,26 @@ if TYPE_CHECKING:
     from hikcamerabot.camera import HikvisionCam
 
 
-class AbstractStreamService(AbstractService, ABC):
+class IngestStreamMixin(ABC):
+    """Stream output which can be fed by the shared channel ingest."""
+
+    @abstractmethod
+    def _get_ingest_output(self) -> IngestOutput:
+        pass
+
+
+class AbstractStreamService(AbstractService, AbstractSupervisedProcess, ABC):
     """livestream Service Base Class."""
 
     NAME: StreamType | None = None
     TYPE: Literal[ServiceType.STREAM] = ServiceType.STREAM
 
+    # Whether the output accepts a second publisher for overlapped restarts.
+    OVERLAP_RESTART_SUPPORTED: bool = False
+
     _FFMPEG_CMD_TPL: str | None = None
     _IGNORE_RESTART_CHECK: int = -1
+    _STOP_TIMEOUT: int = 10
 
     def __init__(
         self,
@@ -66,6 +85,7 @@ class AbstractStreamService(AbstractService, ABC):
         self._hik_host = hik_host
 
         self._proc: asyncio.subprocess.Process | None = None
+        self._progress_monitor = FfmpegProgressMonitor()
         self._start_ts: int | None = None
 
         # TODO: Set type hints.
@@ -73,6 +93,7 @@ class AbstractStreamService(AbstractService, ABC):
         self._enc_conf: None = None
 
         self._cmd: str | None = None
+        self._ingest_encoding_args: str = ''
         self._generate_cmd()
 
         self._started = asyncio.Event()
@@ -84,10 +105,14 @@ class AbstractStreamService(AbstractService, ABC):
             self._log.warning(warn_msg)
             raise ServiceRuntimeError(warn_msg)
 
+        if self._ingest:
+            await self._add_ingest_output()
+            return
+
         await self._start_ffmpeg_process()
         self._start_reader_task()
         if not skip_check:
-            self._start_stream_task()
+            self.cam.bot.stream_supervisor.add_process(self)
 
     def _get_cap_service_name(self) -> str:
         """Get capitalized service name, e.g. "TELEGRAM" -> "Telegram"."""
@@ -98,6 +123,44 @@ class AbstractStreamService(AbstractService, ABC):
         """If SRS StreamType enabled in conf, it will be used as input video source."""
         return self.cam.conf.livestream.srs.enabled
 
+    @property
+    def _ingest(self) -> ChannelIngest | None:
+        """Shared channel ingest if the output is fed by it."""
+        if (
+            not isinstance(self, IngestStreamMixin)
+            or self._srs_enabled
+            or not self.cam.conf.livestream.ingest.enabled
+        ):
+            return None
+        return ChannelIngest.get_shared(self.cam, self._stream_conf.channel)
+
+    async def _add_ingest_output(self) -> None:
+        """Feed the output by the shared ingest, which is supervised by itself."""
+        self._log.debug(
+            '[%s] Adding %s output to channel %s ingest',
+            self.cam.id,
+            self._cls_name,
+            self._stream_conf.channel,
+        )
+        await self._ingest.add_output(self.NAME.value, self._get_ingest_output())
+        self._start_ts = int(time.time())
+        self._started.set()
+
+    def _format_ingest_encoding_args(self, inner_args: str) -> str:
+        encoding_args = FFMPEG_INGEST_ENCODING.format(
+            vcodec=self._enc_conf.vcodec,
+            inner_args=inner_args,
+            acodec=self._enc_conf.acodec,
+            abitrate=FFMPEG_CMD_NULL_AUDIO['bitrate']
+            if self._enc_conf.null_audio
+            else '',
+            asample_rate=f'-ar {self._enc_conf.asample_rate}'
+            if self._enc_conf.asample_rate != -1
+            else '',
+        )
+        # Normalized since outputs with equal args share one encoder.
+        return ' '.join(encoding_args.split())
+
     def _generate_video_source(self) -> str:
         """From direct cam video source or SRS."""
         if self._srs_enabled:
@@ -117,35 +180,30 @@ class AbstractStreamService(AbstractService, ABC):
 
     def _start_reader_task(self) -> None:
         create_task(
-            FfmpegStdoutReaderTask(self._proc, self._cmd).run(),
-            task_name=FfmpegStdoutReaderTask.__name__,
+            FfmpegProgressReaderTask(
+                self._proc, self._cmd, self._progress_monitor
+            ).run(),
+            task_name=FfmpegProgressReaderTask.__name__,
             logger=self._log,
             exception_message='Task "%s" raised an exception',
-            exception_message_args=(FfmpegStdoutReaderTask.__name__,),
-        )
-
-    def _start_stream_task(self) -> None:
-        create_task(
-            ServiceStreamerTask(service=self).run(),
-            task_name=ServiceStreamerTask.__name__,
-            logger=self._log,
-            exception_message='Task "%s" raised an exception',
-            exception_message_args=(ServiceStreamerTask.__name__,),
+            exception_message_args=(FfmpegProgressReaderTask.__name__,),
         )
 
     async def _start_ffmpeg_process(self) -> None:
         self._log.debug('%s ffmpeg command: "%s"', self._cls_name, self._cmd)
         try:
-            self._proc = await asyncio.create_subprocess_shell(
+            self._proc = await get_process_scheduler().create_subprocess_shell(
                 self._cmd,
+                ProcessClass.LIVESTREAM,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT,
+                stderr=asyncio.subprocess.PIPE,
                 preexec_fn=os.setsid,
             )
         except Exception as err:
             err_msg = f'{self._cls_name} failed to start'
             self._log.exception(err_msg)
             raise ServiceRuntimeError(err_msg) from err
+        self._progress_monitor = FfmpegProgressMonitor()
         self._start_ts = int(time.time())
         self._started.set()
 
@@ -155,6 +213,14 @@ class AbstractStreamService(AbstractService, ABC):
             warn_msg = f'{self._get_cap_service_name()} stream already stopped'
             self._log.warning(warn_msg)
             raise ServiceRuntimeError(warn_msg)
+        if self._ingest:
+            await self._ingest.remove_output(self.NAME.value)
+            if disable:
+                self._started.clear()
+            return
+
+        if disable:
+            self.cam.bot.stream_supervisor.remove_process(self.process_id)
         try:
             self._log.info('Killing proc')
             await kill_proc(process=self._proc, signal_=signal.SIGINT, reraise=True)
@@ -164,19 +230,91 @@ class AbstractStreamService(AbstractService, ABC):
             err_msg = f'Failed to kill/disable {self.NAME.value} stream'
             self._log.exception(err_msg)
             raise ServiceRuntimeError(err_msg) from err
+        else:
+            await self._wait_killed(self._proc)
 
         if disable:
             self._started.clear()
 
+    async def _wait_killed(self, proc: asyncio.subprocess.Process) -> None:
+        """Stalled ffmpeg may not react to SIGINT, it's killed after a timeout."""
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=self._STOP_TIMEOUT)
+        except TimeoutError:
+            self._log.warning('Process did not exit on SIGINT, sending SIGKILL')
+            await kill_proc(process=proc, signal_=signal.SIGKILL, reraise=False)
+
+    async def _stop_proc(self, proc: asyncio.subprocess.Process) -> None:
+        await kill_proc(process=proc, signal_=signal.SIGINT, reraise=False)
+        await self._wait_killed(proc)
+
+    @staticmethod
+    async def _wait_flowing(
+        proc: asyncio.subprocess.Process,
+        monitor: FfmpegProgressMonitor,
+        wait_timeout: float | None,
+    ) -> bool:
+        """Wait for the process output to start advancing.
+
+        Return `False` when the process exited or the wait timed out first.
+        """
+        flowing = asyncio.ensure_future(monitor.wait_flowing())
+        exited = asyncio.ensure_future(proc.wait())
+        try:
+            await asyncio.wait(
+                (flowing, exited),
+                timeout=wait_timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            flowing.cancel()
+            exited.cancel()
+        return flowing.done() and not flowing.cancelled()
+
     @property
-    def need_restart(self) -> bool:
-        """Check if the stream needs to be restarted."""
+    def process_id(self) -> str:
+        return f'{self.cam.id}_{self.NAME.value}'
+
+    @property
+    def restart_timeout(self) -> float | None:
+        """Seconds left till the restart period ends."""
         if self._stream_conf.restart_period == self._IGNORE_RESTART_CHECK:
-            return False
-        return int(time.time()) > self._start_ts + self._stream_conf.restart_period
+            return None
+        return max(
+            0, self._start_ts + self._stream_conf.restart_period - int(time.time())
+        )
+
+    @property
+    def progress(self) -> FfmpegProgress | None:
+        return self._progress_monitor.progress
+
+    async def wait_exit(self) -> int | None:
+        return await self._proc.wait()
+
+    async def wait_stall(self) -> None:
+        await self._progress_monitor.wait_stall(self._stream_conf.stall_timeout)
+
+    @property
+    def _overlap_timeout(self) -> int:
+        if not self.OVERLAP_RESTART_SUPPORTED:
+            return 0
+        return self._stream_conf.overlap_timeout
 
     async def restart(self) -> None:
         """Restart the stream."""
+        if self._ingest:
+            await self._ingest.restart()
+            return
+        # Overlap makes sense only while the old process is still streaming.
+        if (
+            self.started
+            and self._overlap_timeout
+            and self._proc.returncode is None
+            and await self._restart_overlapped()
+        ):
+            return
+
+        last_output_at = self._progress_monitor.last_advanced_at
         if self.started:
             await self.stop(disable=False)
         self._log.debug(
@@ -187,6 +325,76 @@ class AbstractStreamService(AbstractService, ABC):
         )
         await shallow_sleep_async(self._stream_conf.restart_pause)
         await self.start(skip_check=True)
+        if last_output_at:
+            task_name = f'{self.process_id}_switchover_gap'
+            create_task(
+                self._log_switchover_gap(
+                    self._proc, self._progress_monitor, last_output_at
+                ),
+                task_name=task_name,
+                logger=self._log,
+                exception_message='Task "%s" raised an exception',
+                exception_message_args=(task_name,),
+            )
+
+    async def _restart_overlapped(self) -> bool:
+        """Start the new process and stop the old one once the new one streams.
+
+        Return `False` when the new process didn't start streaming in time.
+        """
+        old_proc, old_monitor = self._proc, self._progress_monitor
+        self._log.info(
+            '[%s] Restarting %s with overlap up to %ss',
+            self.cam.id,
+            self._cls_name,
+            self._overlap_timeout,
+        )
+        try:
+            await self._start_ffmpeg_process()
+        except ServiceRuntimeError:
+            return False
+        self._start_reader_task()
+
+        if not await self._wait_flowing(
+            self._proc, self._progress_monitor, wait_timeout=self._overlap_timeout
+        ):
+            self._log.warning(
+                '[%s] New %s process did not start streaming in %ss, '
+                'restarting without overlap',
+                self.cam.id,
+                self._cls_name,
+                self._overlap_timeout,
+            )
+            new_proc = self._proc
+            self._proc, self._progress_monitor = old_proc, old_monitor
+            await self._stop_proc(new_proc)
+            return False
+
+        await self._stop_proc(old_proc)
+        first_output_at = self._progress_monitor.first_advanced_at
+        last_output_at = old_monitor.last_advanced_at or first_output_at
+        self._log.info(
+            '[%s] %s switched over to the new process, gap %.2fs, overlap %.2fs',
+            self.cam.id,
+            self._cls_name,
+            max(0.0, first_output_at - last_output_at),
+            max(0.0, last_output_at - first_output_at),
+        )
+        return True
+
+    async def _log_switchover_gap(
+        self,
+        proc: asyncio.subprocess.Process,
+        monitor: FfmpegProgressMonitor,
+        last_output_at: float,
+    ) -> None:
+        if await self._wait_flowing(proc, monitor, wait_timeout=None):
+            self._log.info(
+                '[%s] %s restarted, gap %.2fs',
+                self.cam.id,
+                self._cls_name,
+                monitor.first_advanced_at - last_output_at,
+            )
 
     @property
     def enabled_in_conf(self) -> bool:
@@ -201,6 +409,8 @@ class AbstractStreamService(AbstractService, ABC):
     @property
     def alive(self) -> bool:
         """Check whether the stream (ffmpeg process) is still running."""
+        if self._ingest:
+            return self._ingest.alive
         return self._proc.returncode is None
 
     def _generate_cmd(self) -> None:
@@ -272,6 +482,18 @@ class AbstractStreamService(AbstractService, ABC):
 
 class AbstractExternalLivestreamService(AbstractStreamService, ABC):
     _FFMPEG_CMD_TPL: str = FFMPEG_CMD_LIVESTREAM
+    _FLV_FORMAT: str = 'flv'
+
+    def _get_ingest_output(self) -> IngestOutput:
+        return IngestOutput(
+            encoding_args=self._ingest_encoding_args,
+            null_audio=self._enc_conf.null_audio,
+            format=self._enc_conf.format,
+            url=self._generate_output(),
+            options={'flvflags': 'no_duration_filesize'}
+            if self._enc_conf.format == self._FLV_FORMAT
+            else {},
+        )
 
     def _format_ffmpeg_cmd_tpl(self) -> str:
         null_audio = (
@@ -3,17 +3,29 @@ import logging
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from hikcamerabot.common.video.tasks.ffprobe_context import GetFfprobeContextTask
-from hikcamerabot.common.video.tasks.thumbnail import MakeThumbnailTask
+from hikcamerabot.common.video.tasks.thumbnail import (
+    MakeThumbnailBatchTask,
+    MakeThumbnailTask,
+    ThumbnailJob,
+)
+from hikcamerabot.common.video.tasks.video_metadata import GetVideoMetadataTask
+from hikcamerabot.enums import DvrUploadState, DvrUploadType
 
 if TYPE_CHECKING:
     from hikcamerabot.camera import HikvisionCam
+    from hikcamerabot.services.stream.dvr.index import DvrSegment, DvrSegmentIndex
 
 
 class DvrFile:
     """Recorded DVR File Wrapper Class."""
 
-    def __init__(self, filename: str, lock_count: int, cam: 'HikvisionCam') -> None:
+    def __init__(
+        self,
+        filename: str,
+        lock_count: int,
+        cam: 'HikvisionCam',
+        index: 'DvrSegmentIndex',
+    ) -> None:
         if lock_count <= 0:
             raise RuntimeError('Lock count cannot be lower or equal 0')
 
@@ -21,6 +33,7 @@ class DvrFile:
         self._filename = filename
         self._lock_count = lock_count
         self._cam = cam
+        self._index = index
 
         self._storage_path = Path(self._cam.conf.livestream.dvr.local_storage_path)
         self._full_path = self._storage_path / self._filename
@@ -29,7 +42,6 @@ class DvrFile:
         self._duration: int | None = None
         self._width: int | None = None
         self._height: int | None = None
-        self._probe_ctx: dict | None = None
 
         self._is_broken: bool = False
 
@@ -46,32 +58,61 @@ class DvrFile:
         self._log.warning('Marking file "%s" as broken', self._full_path)
         self._is_broken = True
 
-    async def _get_probe_ctx(self) -> None:
-        self._probe_ctx = await GetFfprobeContextTask(self.full_path).run()
-        if not self._probe_ctx:
+    async def get_metadata(self) -> None:
+        metadata = await GetVideoMetadataTask(self.full_path).run()
+        if not metadata:
             self._mark_as_broken()
             return
-        video_streams = [
-            stream
-            for stream in self._probe_ctx['streams']
-            if stream['codec_type'] == 'video'
-        ]
-        try:
-            self._duration = int(float(self._probe_ctx['format']['duration']))
-            self._height = video_streams[0]['height']
-            self._width = video_streams[0]['width']
-        except KeyError:
-            self._log.exception(
-                'Failed to gather video stream metadata: %s', self._probe_ctx
-            )
-            self._mark_as_broken()
+        self._duration = int(metadata.duration)
+        self._height = metadata.height
+        self._width = metadata.width
 
     async def _make_thumbnail_frame(self) -> None:
-        if not await MakeThumbnailTask(self._thumbnail, self.full_path).run():
+        if not await MakeThumbnailTask(
+            self._thumbnail, self.full_path, duration=self._duration
+        ).run():
             self._log.error('Error during making thumbnail for %s', self.full_path)
 
+    async def save_context(self) -> None:
+        await self._index.update_context(
+            filename=self._filename,
+            size=self.full_path.stat().st_size if self.exists else None,
+            duration=self._duration,
+            width=self._width,
+            height=self._height,
+            thumbnail=self.thumbnail,
+            is_broken=self._is_broken,
+        )
+
     async def make_context(self) -> None:
-        await asyncio.gather(self._get_probe_ctx(), self._make_thumbnail_frame())
+        await self.get_metadata()
+        await self._make_thumbnail_frame()
+        await self.save_context()
+
+    @classmethod
+    async def make_contexts(cls, files: list['DvrFile']) -> None:
+        """Make context of many files with batched thumbnail generation."""
+        await asyncio.gather(*[f.get_metadata() for f in files])
+        # Broken files would fail the whole batch.
+        await MakeThumbnailBatchTask(
+            [f.thumbnail_job for f in files if not f.is_broken]
+        ).run()
+        await asyncio.gather(*[f.save_context() for f in files])
+
+    def restore_context(self, segment: 'DvrSegment') -> None:
+        """Restore context of already probed file from the segment index."""
+        self._duration = segment.duration
+        self._width = segment.width
+        self._height = segment.height
+        self._is_broken = segment.is_broken
+
+    async def set_upload_state(
+        self, storage: DvrUploadType, state: DvrUploadState
+    ) -> None:
+        await self._index.set_upload_state(self._filename, storage, state)
+
+    async def mark_deleted(self) -> None:
+        await self._index.mark_deleted(self._filename)
 
     def decrement_lock_count(self) -> None:
         if self._lock_count > 0:
@@ -93,6 +134,10 @@ class DvrFile:
     def name(self) -> str:
         return self._filename
 
+    @property
+    def thumbnail_job(self) -> ThumbnailJob:
+        return ThumbnailJob(self.full_path, self._thumbnail, self._duration)
+
     @property
     def thumbnail(self) -> Path | None:
         return self._thumbnail if self._thumbnail.is_file() else None
@@ -0,0 +1,352 @@
+"""Persistent DVR segment index module."""
+
+import asyncio
+import json
+import logging
+import re
+import sqlite3
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import ClassVar, Final, Self
+
+from hikcamerabot.enums import DvrUploadState
+
+_INDEX_FILENAME: Final[str] = '.dvr_index.sqlite3'
+
+# Matches DvrStreamService._DVR_FILENAME_TPL, e.g. cam_1_101_300_2024-01-31_14-02-00.mp4
+_SEGMENT_FILENAME_REGEX: Final[re.Pattern] = re.compile(
+    r'^(?P<cam_id>cam_\d+)_(?P<channel>\d+)_(?P<segment_time>\d+)_'
+    r'(?P<started_at>\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})\.mp4$'
+)
+_SEGMENT_TIME_FORMAT: Final[str] = '%Y-%m-%d_%H-%M-%S'
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS segments (
+    filename TEXT PRIMARY KEY,
+    cam_id TEXT NOT NULL,
+    channel INTEGER NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    size INTEGER,
+    duration INTEGER,
+    width INTEGER,
+    height INTEGER,
+    thumbnail TEXT,
+    is_broken INTEGER NOT NULL DEFAULT 0,
+    is_deleted INTEGER NOT NULL DEFAULT 0,
+    created_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_cam_time_idx ON segments (cam_id, start_ts);
+CREATE TABLE IF NOT EXISTS segment_uploads (
+    filename TEXT NOT NULL REFERENCES segments (filename) ON DELETE CASCADE,
+    storage TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at INTEGER NOT NULL,
+    PRIMARY KEY (filename, storage)
+);
+"""
+
+
+@dataclass(slots=True)
+class DvrSegment:
+    filename: str
+    cam_id: str
+    channel: int
+    start_ts: int
+    end_ts: int
+    size: int | None
+    duration: int | None
+    width: int | None
+    height: int | None
+    thumbnail: str | None
+    is_broken: bool
+    is_deleted: bool
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> Self:
+        return cls(
+            filename=row['filename'],
+            cam_id=row['cam_id'],
+            channel=row['channel'],
+            start_ts=row['start_ts'],
+            end_ts=row['end_ts'],
+            size=row['size'],
+            duration=row['duration'],
+            width=row['width'],
+            height=row['height'],
+            thumbnail=row['thumbnail'],
+            is_broken=bool(row['is_broken']),
+            is_deleted=bool(row['is_deleted']),
+        )
+
+
+class DvrSegmentIndex:
+    """SQLite index of recorded DVR segments stored next to the segments.
+
+    Tracks segment metadata, upload state per storage and deletion, so
+    processed segments survive restarts and time-range lookups never list
+    the storage directory. One index is shared by all cameras with the same
+    storage path. Queries run in WAL mode in a dedicated thread of the index,
+    which also opens the database on first use, so a slow disk never blocks
+    the event loop and the connection is used by one thread only.
+    """
+
+    _SHARED: ClassVar[dict[Path, 'DvrSegmentIndex']] = {}
+
+    def __init__(self, storage_path: Path) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._db_path = storage_path / _INDEX_FILENAME
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=self.__class__.__name__
+        )
+        self._conn: sqlite3.Connection | None = None
+        # Longest segment bounds the range scan in `find_segments`.
+        self._max_duration: int = 0
+
+    @classmethod
+    def get_shared(cls, storage_path: Path) -> 'DvrSegmentIndex':
+        """Get index shared by all cameras recording to the storage path."""
+        storage_path = Path(storage_path).resolve()
+        try:
+            return cls._SHARED[storage_path]
+        except KeyError:
+            index = cls._SHARED[storage_path] = cls(storage_path)
+            return index
+
+    async def _run[T](self, func: Callable[..., T], *args) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Lazily open the database in the index thread."""
+        if self._conn:
+            return self._conn
+
+        conn = sqlite3.connect(self._db_path, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.executescript(_SCHEMA)
+        self._max_duration = conn.execute(
+            'SELECT COALESCE(MAX(end_ts - start_ts), 0) FROM segments'
+        ).fetchone()[0]
+        self._conn = conn
+        self._log.info('Opened DVR segment index %s', self._db_path)
+        return conn
+
+    @staticmethod
+    def parse_filename(filename: str) -> tuple[str, int, int, int] | None:
+        """Return camera ID, channel, start and expected end timestamps."""
+        match = _SEGMENT_FILENAME_REGEX.match(filename)
+        if not match:
+            return None
+        # ffmpeg `-strftime` names segments in local time.
+        start_ts = int(
+            datetime.strptime(  # noqa: DTZ007
+                match['started_at'], _SEGMENT_TIME_FORMAT
+            ).timestamp()
+        )
+        return (
+            match['cam_id'],
+            int(match['channel']),
+            start_ts,
+            start_ts + int(match['segment_time']),
+        )
+
+    async def add(self, filename: str) -> bool:
+        """Add finished segment. Return `False` if it is already indexed."""
+        return await self._run(self._add, filename)
+
+    def _add(self, filename: str) -> bool:
+        parsed = self.parse_filename(filename)
+        if not parsed:
+            self._log.warning('Not a DVR segment filename: %s', filename)
+            return False
+        cam_id, channel, start_ts, end_ts = parsed
+        cursor = self._get_conn().execute(
+            'INSERT OR IGNORE INTO segments '
+            '(filename, cam_id, channel, start_ts, end_ts, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (filename, cam_id, channel, start_ts, end_ts, int(time.time())),
+        )
+        if cursor.rowcount:
+            self._max_duration = max(self._max_duration, end_ts - start_ts)
+        return bool(cursor.rowcount)
+
+    async def contains(self, filename: str) -> bool:
+        return await self._run(self._contains, filename)
+
+    def _contains(self, filename: str) -> bool:
+        return (
+            self._get_conn()
+            .execute('SELECT 1 FROM segments WHERE filename = ?', (filename,))
+            .fetchone()
+            is not None
+        )
+
+    async def get(self, filename: str) -> DvrSegment | None:
+        return await self._run(self._get, filename)
+
+    def _get(self, filename: str) -> DvrSegment | None:
+        row = (
+            self._get_conn()
+            .execute('SELECT * FROM segments WHERE filename = ?', (filename,))
+            .fetchone()
+        )
+        return DvrSegment.from_row(row) if row else None
+
+    async def update_context(
+        self,
+        filename: str,
+        *,
+        size: int | None,
+        duration: int | None,
+        width: int | None,
+        height: int | None,
+        thumbnail: Path | None,
+        is_broken: bool,
+    ) -> None:
+        """Store probed segment metadata. Real duration replaces expected one."""
+        await self._run(
+            partial(
+                self._update_context,
+                filename,
+                size=size,
+                duration=duration,
+                width=width,
+                height=height,
+                thumbnail=thumbnail,
+                is_broken=is_broken,
+            )
+        )
+
+    def _update_context(
+        self,
+        filename: str,
+        *,
+        size: int | None,
+        duration: int | None,
+        width: int | None,
+        height: int | None,
+        thumbnail: Path | None,
+        is_broken: bool,
+    ) -> None:
+        with self._get_conn() as conn:
+            conn.execute(
+                'UPDATE segments SET size = ?, duration = ?, width = ?, height = ?, '
+                'thumbnail = ?, is_broken = ?, '
+                'end_ts = CASE WHEN ? IS NULL THEN end_ts ELSE start_ts + ? END '
+                'WHERE filename = ?',
+                (
+                    size,
+                    duration,
+                    width,
+                    height,
+                    str(thumbnail) if thumbnail else None,
+                    int(is_broken),
+                    duration,
+                    duration,
+                    filename,
+                ),
+            )
+        if duration:
+            self._max_duration = max(self._max_duration, duration)
+
+    async def set_upload_state(
+        self, filename: str, storage: str, state: DvrUploadState
+    ) -> None:
+        await self._run(self._set_upload_state, filename, storage, state)
+
+    def _set_upload_state(
+        self, filename: str, storage: str, state: DvrUploadState
+    ) -> None:
+        self._get_conn().execute(
+            'INSERT INTO segment_uploads (filename, storage, state, updated_at) '
+            'VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (filename, storage) '
+            'DO UPDATE SET state = excluded.state, updated_at = excluded.updated_at',
+            (filename, storage, state.value, int(time.time())),
+        )
+
+    async def get_upload_states(self, filename: str) -> dict[str, DvrUploadState]:
+        return await self._run(self._get_upload_states, filename)
+
+    def _get_upload_states(self, filename: str) -> dict[str, DvrUploadState]:
+        return {
+            row['storage']: DvrUploadState(row['state'])
+            for row in self._get_conn().execute(
+                'SELECT storage, state FROM segment_uploads WHERE filename = ?',
+                (filename,),
+            )
+        }
+
+    async def mark_deleted(self, filename: str) -> None:
+        await self._run(self._mark_deleted, filename)
+
+    def _mark_deleted(self, filename: str) -> None:
+        self._get_conn().execute(
+            'UPDATE segments SET is_deleted = 1 WHERE filename = ?', (filename,)
+        )
+
+    async def find_segments(
+        self, cam_id: str, start_ts: int, end_ts: int, with_deleted: bool = False
+    ) -> list[DvrSegment]:
+        """Return camera segments overlapping `[start_ts, end_ts)` by start time.
+
+        E.g. segments covering 14:02-14:20 on cam_3. Lower bound of the index
+        range scan is shifted by the longest known segment.
+        """
+        return await self._run(
+            self._find_segments, cam_id, start_ts, end_ts, with_deleted
+        )
+
+    def _find_segments(
+        self, cam_id: str, start_ts: int, end_ts: int, with_deleted: bool = False
+    ) -> list[DvrSegment]:
+        rows = self._get_conn().execute(
+            'SELECT * FROM segments '
+            'WHERE cam_id = ? AND start_ts >= ? AND start_ts < ? AND end_ts > ? '
+            'AND (? OR NOT is_deleted) '
+            'ORDER BY start_ts',
+            (
+                cam_id,
+                start_ts - self._max_duration,
+                end_ts,
+                start_ts,
+                int(with_deleted),
+            ),
+        )
+        return [DvrSegment.from_row(row) for row in rows]
+
+    async def get_not_uploaded(
+        self, cam_id: str, storages: list[str]
+    ) -> list[DvrSegment]:
+        """Return kept segments not yet uploaded to every given storage."""
+        return await self._run(self._get_not_uploaded, cam_id, storages)
+
+    def _get_not_uploaded(self, cam_id: str, storages: list[str]) -> list[DvrSegment]:
+        if not storages:
+            return []
+        rows = self._get_conn().execute(
+            'SELECT * FROM segments s '
+            'WHERE s.cam_id = ? AND NOT s.is_deleted AND NOT s.is_broken AND ('
+            '  SELECT COUNT(*) FROM segment_uploads u '
+            '  WHERE u.filename = s.filename AND u.state = ? '
+            '  AND u.storage IN (SELECT value FROM json_each(?))'
+            ') < ? '
+            'ORDER BY s.start_ts',
+            (
+                cam_id,
+                DvrUploadState.UPLOADED.value,
+                json.dumps(storages),
+                len(storages),
+            ),
+        )
+        return [DvrSegment.from_row(row) for row in rows]
@@ -7,13 +7,16 @@ from hikcamerabot.constants import (
     RTSP_TRANSPORT_TPL,
 )
 from hikcamerabot.enums import StreamType, VideoEncoderType
-from hikcamerabot.services.stream.abstract import AbstractStreamService
+from hikcamerabot.services.stream.abstract import (
+    AbstractStreamService,
+    IngestStreamMixin,
+)
+from hikcamerabot.services.stream.dvr.index import DvrSegment
 from hikcamerabot.services.stream.dvr.upload.engine import DvrUploadEngine
-from hikcamerabot.services.tasks.livestream import ServiceStreamerTask
-from hikcamerabot.utils.task import create_task
+from hikcamerabot.services.stream.ingest import IngestOutput
 
 
-class DvrStreamService(AbstractStreamService):
+class DvrStreamService(AbstractStreamService, IngestStreamMixin):
     NAME: Literal[StreamType.DVR] = StreamType.DVR
     _FFMPEG_CMD_TPL = FFMPEG_CMD_DVR
     _DVR_FILENAME_TPL: str = (
@@ -60,6 +63,10 @@ class DvrStreamService(AbstractStreamService):
 
         await asyncio.gather(*coros)
 
+    async def find_segments(self, start_ts: int, end_ts: int) -> list[DvrSegment]:
+        """Return recorded segments covering the time range."""
+        return await self._upload_engine.find_segments(start_ts, end_ts)
+
     async def _start_upload_engine(self) -> None:
         """Start Upload Engine only if at least one storage is enabled."""
         # TODO: Right now upload engine will start only if DVR records are set
@@ -78,15 +85,6 @@ class DvrStreamService(AbstractStreamService):
                 return
         self._log.info('[%s] DVR Upload Engine not started', self.cam.id)
 
-    def _start_stream_task(self) -> None:
-        create_task(
-            ServiceStreamerTask(service=self, run_forever=True).run(),
-            task_name=ServiceStreamerTask.__name__,
-            logger=self._log,
-            exception_message='Task "%s" raised an exception',
-            exception_message_args=(ServiceStreamerTask.__name__,),
-        )
-
     def _generate_transcode_cmd(
         self, cmd_tpl: str, cmd_transcode: str, enc_codec_name: VideoEncoderType
     ) -> None:
@@ -95,10 +93,24 @@ class DvrStreamService(AbstractStreamService):
         except KeyError:
             inner_args = ''
         inner_args = cmd_transcode.format(inner_args=inner_args)
+        self._ingest_encoding_args = self._format_ingest_encoding_args(inner_args)
         self._cmd = cmd_tpl.format(
             output=self._generate_output(), inner_args=inner_args
         )
 
+    def _get_ingest_output(self) -> IngestOutput:
+        return IngestOutput(
+            encoding_args=self._ingest_encoding_args,
+            null_audio=self._enc_conf.null_audio,
+            format='segment',
+            url=self._generate_output(),
+            options={
+                'segment_time': self._stream_conf.segment_time,
+                'reset_timestamps': 1,
+                'strftime': 1,
+            },
+        )
+
     def _generate_output(self) -> str:
         return self._DVR_FILENAME_TPL.format(
             storage_path=self.cam.conf.livestream.dvr.local_storage_path,
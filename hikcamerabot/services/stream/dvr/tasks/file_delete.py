@@ -33,14 +33,15 @@ class DvrFileDeleteTask:
                     )
                     locked_files.append(file_)
                 else:
-                    self._perform_file_cleanup(file_)
+                    await self._perform_file_cleanup(file_)
             for file_ in locked_files:
                 await self._queue.put(file_)
             await shallow_sleep_async(self._QUEUE_SLEEP)
 
-    def _perform_file_cleanup(self, file_: 'DvrFile') -> None:
+    async def _perform_file_cleanup(self, file_: 'DvrFile') -> None:
         self._delete_thumbnail(file_)
         self._delete_file(file_)
+        await file_.mark_deleted()
 
     def _delete_file(self, file_: 'DvrFile') -> None:
         self._log.debug('Deleting DVR file %s', file_.full_path)
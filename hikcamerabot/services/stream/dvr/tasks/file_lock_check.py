@@ -2,7 +2,10 @@ import asyncio
 import logging
 import signal
 
+from hikcamerabot.enums import ProcessClass
+from hikcamerabot.exceptions import ProcessSchedulerError
 from hikcamerabot.utils.process import get_stdout_stderr, kill_proc
+from hikcamerabot.utils.process_scheduler import get_process_scheduler
 
 
 class FileLockCheckTask:
@@ -21,11 +24,16 @@ class FileLockCheckTask:
 
     async def _get_unlocked_files(self) -> list[str]:
         """Return list with absolute file paths that are not locked by ffmpeg process during write operation."""
-        proc = await asyncio.create_subprocess_shell(
-            self._LOCKED_FILES_CMD,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        try:
+            proc = await get_process_scheduler().create_subprocess_shell(
+                self._LOCKED_FILES_CMD,
+                ProcessClass.MAINTENANCE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except ProcessSchedulerError as err:
+            self._log.error('Failed to execute %s: %s', self._LOCKED_FILES_CMD, err)
+            return []
         try:
             await asyncio.wait_for(proc.wait(), timeout=self._PROCESS_TIMEOUT)
         except TimeoutError:
@@ -3,7 +3,15 @@ import os
 from typing import TYPE_CHECKING
 
 from hikcamerabot.config.schemas.main_config import CameraConfigSchema
+from hikcamerabot.services.stream.dvr.index import DvrSegmentIndex
 from hikcamerabot.services.stream.dvr.tasks.file_lock_check import FileLockCheckTask
+from hikcamerabot.utils.inotify import (
+    IN_CLOSE_WRITE,
+    IN_IGNORED,
+    IN_MOVED_TO,
+    IN_Q_OVERFLOW,
+    Inotify,
+)
 from hikcamerabot.utils.shared import shallow_sleep_async
 
 if TYPE_CHECKING:
@@ -11,44 +19,130 @@ if TYPE_CHECKING:
 
 
 class DvrFileMonitoringTask:
+    """Detect finished DVR segments and hand them to the upload engine.
+
+    Segments are detected by inotify `IN_CLOSE_WRITE` events as soon as ffmpeg
+    closes them. Where inotify is not available, storage is polled and files
+    still opened by ffmpeg are filtered out with `lsof`. Finished segments are
+    registered in the segment index, already indexed ones are skipped.
+    """
+
     _TASK_SLEEP: int = 30
 
     def __init__(
-        self, engine: 'DvrUploadEngine', conf: CameraConfigSchema, cam_id: str
+        self,
+        engine: 'DvrUploadEngine',
+        conf: CameraConfigSchema,
+        cam_id: str,
+        index: DvrSegmentIndex,
     ) -> None:
         self._log = logging.getLogger(self.__class__.__name__)
         self._engine = engine
         self._conf = conf
         self._storage_path = self._conf.livestream.dvr.local_storage_path
         self._cam_id = cam_id
+        self._index = index
 
     async def run(self) -> None:
+        try:
+            inotify = Inotify()
+        except OSError as err:
+            self._log.warning(
+                '[%s] inotify is not available, polling DVR files every %ds: %s',
+                self._cam_id,
+                self._TASK_SLEEP,
+                err,
+            )
+            await self._monitor_dvr_files()
+            return
+
+        try:
+            await self._watch_dvr_files(inotify)
+        finally:
+            inotify.close()
         await self._monitor_dvr_files()
 
+    async def _watch_dvr_files(self, inotify: Inotify) -> None:
+        """Upload segments when ffmpeg closes them.
+
+        Return when watching is not possible anymore to fall back to polling.
+        """
+        try:
+            inotify.add_watch(self._storage_path, IN_CLOSE_WRITE | IN_MOVED_TO)
+        except OSError as err:
+            self._log.warning(
+                '[%s] Failed to watch %s, polling DVR files every %ds: %s',
+                self._cam_id,
+                self._storage_path,
+                self._TASK_SLEEP,
+                err,
+            )
+            return
+
+        self._log.info(
+            '[%s] Watching %s for finished DVR files', self._cam_id, self._storage_path
+        )
+        # Pick up segments finished before the watch was added.
+        await self._upload_unlocked_files()
+        async for event in inotify.events():
+            if event.mask & IN_IGNORED:
+                self._log.warning(
+                    '[%s] Watch on %s was removed', self._cam_id, self._storage_path
+                )
+                return
+            if event.mask & IN_Q_OVERFLOW:
+                self._log.warning(
+                    '[%s] inotify queue overflow, rescanning %s',
+                    self._cam_id,
+                    self._storage_path,
+                )
+                await self._upload_unlocked_files()
+            elif self._is_dvr_file(event.name):
+                self._log.debug('[%s] DVR file finished: %s', self._cam_id, event.name)
+                await self._upload_files([event.name])
+
     async def _monitor_dvr_files(self) -> None:
         while True:
             self._log.debug(
                 '[%s] Running %s task', self._cam_id, self.__class__.__name__
             )
-            try:
-                await self._engine.upload_files(await self._get_unlocked_files())
-            except Exception:
-                self._log.exception(
-                    '[%s] %s encountered an exception',
-                    self._cam_id,
-                    self.__class__.__name__,
-                )
+            await self._upload_unlocked_files()
             await shallow_sleep_async(self._TASK_SLEEP)
 
+    async def _upload_unlocked_files(self) -> None:
+        try:
+            files = await self._get_unlocked_files()
+        except Exception:
+            self._log.exception(
+                '[%s] Failed to list DVR files in %s', self._cam_id, self._storage_path
+            )
+            return
+        await self._upload_files(files)
+
+    async def _upload_files(self, files: list[str]) -> None:
+        try:
+            await self._engine.upload_files(
+                [f for f in files if await self._index.add(f)]
+            )
+        except Exception:
+            self._log.exception(
+                '[%s] %s encountered an exception',
+                self._cam_id,
+                self.__class__.__name__,
+            )
+
+    def _is_dvr_file(self, filename: str) -> bool:
+        return filename.startswith(f'{self._cam_id}_') and filename.endswith('.mp4')
+
     async def _get_unlocked_files(self) -> list[str]:
         files = [
             f
             for f in os.listdir(self._storage_path)
-            if f.startswith(f'{self._cam_id}_') and f.endswith('.mp4')
+            if self._is_dvr_file(f) and not await self._index.contains(f)
         ]
         if not files:
             self._log.debug(
-                '[%s] No DVR files in storage %s', self._cam_id, self._storage_path
+                '[%s] No new DVR files in storage %s', self._cam_id, self._storage_path
             )
             return []
 
@@ -6,8 +6,9 @@ from hikcamerabot.config.schemas.main_config import (
     BaseDVRStorageUploadConfSchema,
     DvrLivestreamConfSchema,
 )
-from hikcamerabot.enums import DvrUploadType
+from hikcamerabot.enums import DvrUploadState, DvrUploadType
 from hikcamerabot.services.stream.dvr.file_wrapper import DvrFile
+from hikcamerabot.services.stream.dvr.index import DvrSegment, DvrSegmentIndex
 from hikcamerabot.services.stream.dvr.tasks.file_delete import DvrFileDeleteTask
 from hikcamerabot.services.stream.dvr.tasks.file_monitoring import DvrFileMonitoringTask
 from hikcamerabot.services.stream.dvr.upload.tasks.abstract import AbstractDvrUploadTask
@@ -32,7 +33,18 @@ class DvrUploadEngine:
         self._storage_queues = self._create_storage_queues()
         self._delete_after_upload = self._conf.upload.delete_after_upload
         self._delete_candidates_queue: asyncio.Queue[DvrFile] = asyncio.Queue()
-        self._upload_cache: set[str] = set()
+        self._index: DvrSegmentIndex | None = None
+
+    @property
+    def index(self) -> DvrSegmentIndex:
+        """Segment index, opened lazily since storage may not exist yet."""
+        if self._index is None:
+            self._index = DvrSegmentIndex.get_shared(self._conf.local_storage_path)
+        return self._index
+
+    async def find_segments(self, start_ts: int, end_ts: int) -> list[DvrSegment]:
+        """Return camera segments covering the time range without listing storage."""
+        return await self.index.find_segments(self._cam.id, start_ts, end_ts)
 
     def _create_storage_queues(self) -> dict[str, asyncio.Queue]:
         storage_queues: dict[str, asyncio.Queue] = {}
@@ -46,24 +58,62 @@ class DvrUploadEngine:
         return storage_queues
 
     async def upload_files(self, files: list[str]) -> None:
-        files = [f for f in files if f not in self._upload_cache]
+        """Upload new files already registered in the segment index."""
         if not files:
             return
 
         for file_ in await self._wrap_as_dvr_files(files):
-            if self._delete_after_upload:
-                await self._delete_candidates_queue.put(file_)
-            for queue in self._storage_queues.values():
-                await queue.put(file_)
-            self._upload_cache.add(file_.name)
+            await self._enqueue_file(file_, list(self._storage_queues))
+
+    async def _enqueue_file(self, file_: DvrFile, storages: list[str]) -> None:
+        if self._delete_after_upload:
+            await self._delete_candidates_queue.put(file_)
+        for storage in storages:
+            await file_.set_upload_state(DvrUploadType(storage), DvrUploadState.PENDING)
+            await self._storage_queues[storage].put(file_)
 
     async def _wrap_as_dvr_files(self, files: list[str]) -> list[DvrFile]:
         lock_count = len(self._storage_queues)
-        files = [DvrFile(f, lock_count, self._cam) for f in files]
-        await asyncio.gather(*[f.make_context() for f in files])
+        files = [DvrFile(f, lock_count, self._cam, self.index) for f in files]
+        await DvrFile.make_contexts(files)
         return files
 
+    async def _requeue_not_uploaded_files(self) -> None:
+        """Requeue segments which weren't uploaded before the bot restart."""
+        for segment in await self.index.get_not_uploaded(
+            self._cam.id, list(self._storage_queues)
+        ):
+            file_ = DvrFile(
+                segment.filename, len(self._storage_queues), self._cam, self.index
+            )
+            if not file_.exists:
+                self._log.debug('[%s] DVR file %s is gone', self._cam.id, file_)
+                await file_.mark_deleted()
+                continue
+
+            uploaded = {
+                storage
+                for storage, state in (
+                    await self.index.get_upload_states(file_.name)
+                ).items()
+                if state is DvrUploadState.UPLOADED and storage in self._storage_queues
+            }
+            for _ in uploaded:
+                file_.decrement_lock_count()
+            if segment.duration is None:
+                await file_.make_context()
+            else:
+                file_.restore_context(segment)
+
+            self._log.info(
+                '[%s] Requeueing not uploaded DVR file %s', self._cam.id, file_
+            )
+            await self._enqueue_file(
+                file_, [s for s in self._storage_queues if s not in uploaded]
+            )
+
     async def start(self) -> None:
+        await self._requeue_not_uploaded_files()
         await self._start_tasks()
         self._log.debug(
             '[%s] Upload Engine for "%s" has started',
@@ -106,7 +156,7 @@ class DvrUploadEngine:
         )
         create_task(
             DvrFileMonitoringTask(
-                engine=self, conf=self._cam.conf, cam_id=self._cam.id
+                engine=self, conf=self._cam.conf, cam_id=self._cam.id, index=self.index
             ).run(),
             task_name=DvrFileMonitoringTask.__name__,
             logger=self._log,
@@ -3,7 +3,7 @@ from typing import TYPE_CHECKING, Final
 from pyrogram.enums import ChatAction
 from tenacity import retry, stop_after_attempt, wait_fixed
 
-from hikcamerabot.enums import DvrUploadType
+from hikcamerabot.enums import DvrUploadState, DvrUploadType
 from hikcamerabot.services.stream.dvr.upload.tasks.abstract import (
     AbstractDvrUploadTask,
 )
@@ -25,16 +25,24 @@ class TelegramDvrUploadTask(AbstractDvrUploadTask):
     async def _process_queue(self) -> None:
         while True:
             file_ = await self._queue.get()
-            await self._upload_video(file_)
+            try:
+                uploaded = await self._upload_video(file_)
+            except Exception:
+                self._log.exception('Failed to upload video %s', file_.full_path)
+                uploaded = False
+            await file_.set_upload_state(
+                self.UPLOAD_TYPE,
+                DvrUploadState.UPLOADED if uploaded else DvrUploadState.FAILED,
+            )
             file_.decrement_lock_count()
 
     @retry(
         wait=wait_fixed(_UPLOAD_RETRY_WAIT),
         stop=stop_after_attempt(_UPLOAD_RETRY_STOP_AFTER),
     )
-    async def _upload_video(self, file_: 'DvrFile') -> None:
+    async def _upload_video(self, file_: 'DvrFile') -> bool:
         try:
-            await self.__upload(file_)
+            return await self.__upload(file_)
         except Exception:
             self._log.exception('Failed to upload video %s. Retrying', file_.full_path)
             raise
@@ -51,9 +59,9 @@ class TelegramDvrUploadTask(AbstractDvrUploadTask):
             return False
         return True
 
-    async def __upload(self, file_: 'DvrFile') -> None:
+    async def __upload(self, file_: 'DvrFile') -> bool:
         if not self._validate_file(file_):
-            return
+            return False
 
         self._log.debug('Uploading DVR video %s', file_.full_path)
         caption = f'Video from {self._cam.description} {self._cam.hashtag}'
@@ -72,3 +80,4 @@ class TelegramDvrUploadTask(AbstractDvrUploadTask):
             supports_streaming=True,
         )
         self._log.debug('Finished uploading DVR video %s', file_.full_path)
+        return True
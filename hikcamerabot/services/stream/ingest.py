@@ -0,0 +1,326 @@
+"""Shared RTSP ingest module."""
+
+import asyncio
+import contextlib
+import logging
+import math
+import os
+import shutil
+import signal
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+from urllib.parse import urlsplit
+
+from hikcamerabot.constants import (
+    FFMPEG_CAM_VIDEO_SRC,
+    FFMPEG_CMD_INGEST,
+    FFMPEG_CMD_INGEST_TEE_OUTPUT,
+    FFMPEG_INGEST_MAP,
+    FFMPEG_INGEST_NULL_AUDIO_MAP,
+    FFMPEG_INGEST_NULL_AUDIO_SRC,
+    FFMPEG_INGEST_RELAY_ENCODING,
+    INGEST_RELAY_HLS_TIME,
+    INGEST_RELAY_PLAYLIST,
+    RTSP_TRANSPORT_TPL,
+)
+from hikcamerabot.enums import ProcessClass
+from hikcamerabot.exceptions import ServiceRuntimeError
+from hikcamerabot.services.stream.supervisor import AbstractSupervisedProcess
+from hikcamerabot.services.tasks.livestream import FfmpegProgressReaderTask
+from hikcamerabot.utils.ffmpeg_progress import FfmpegProgress, FfmpegProgressMonitor
+from hikcamerabot.utils.process import kill_proc
+from hikcamerabot.utils.process_scheduler import get_process_scheduler
+from hikcamerabot.utils.task import create_task
+
+if TYPE_CHECKING:
+    from hikcamerabot.camera import HikvisionCam
+
+
+@dataclass(slots=True)
+class IngestOutput:
+    """One output of the shared ingest, a slave of the tee muxer."""
+
+    encoding_args: str
+    null_audio: bool
+    format: str
+    url: str
+    options: dict[str, str | int] = field(default_factory=dict)
+
+    @property
+    def tee_slave(self) -> str:
+        """Tee slave spec, failure of one output doesn't stop the others.
+
+        Failed slave, e.g. YouTube ingest server closing the connection, is
+        dropped and ffmpeg logs "Slave muxer #N failed". It stays stopped until
+        the ingest restarts: on outputs change, stall, exit of the process when
+        all slaves failed, or restart of any stream fed by the ingest.
+        """
+        options = ':'.join(
+            f'{key}={value}'
+            for key, value in {
+                'f': self.format,
+                'onfail': 'ignore',
+                **self.options,
+            }.items()
+        )
+        return f'[{options}]{self.url}'
+
+
+class ChannelIngest(AbstractSupervisedProcess):
+    """Pull camera channel RTSP stream once and fan it out to all outputs.
+
+    Outputs with equal encoding args share one encoder, stream copy outputs
+    don't encode at all. The process is restarted by the stream supervisor when
+    it exits unexpectedly and when outputs change, since the tee muxer can't
+    add or remove slaves on the fly. Restart on outputs change interrupts every
+    other output of the channel, so it's delayed by `OUTPUTS_CHANGE_DELAY` to
+    apply changes made meanwhile at once, e.g. all outputs enabled on startup.
+    The last output removal stops the process right away.
+    """
+
+    _SHARED: ClassVar[dict[tuple[str, int], 'ChannelIngest']] = {}
+
+    OUTPUTS_CHANGE_DELAY: float = 3.0
+
+    _STOP_TIMEOUT: int = 10
+
+    def __init__(self, cam: 'HikvisionCam', channel: int) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._cam = cam
+        self._channel = channel
+        self._conf = cam.conf.livestream.ingest
+        self._outputs: dict[str, IngestOutput] = {}
+        self._proc: asyncio.subprocess.Process | None = None
+        self._progress_monitor = FfmpegProgressMonitor()
+        self._lock = asyncio.Lock()
+        self._outputs_changed = False
+        self._restart_task: asyncio.Task | None = None
+        self._relay_output = self._get_relay_output()
+
+    @classmethod
+    def get_shared(cls, cam: 'HikvisionCam', channel: int) -> 'ChannelIngest':
+        """Get ingest shared by all outputs of the camera channel."""
+        try:
+            return cls._SHARED[cam.id, channel]
+        except KeyError:
+            ingest = cls._SHARED[cam.id, channel] = cls(cam, channel)
+            return ingest
+
+    @classmethod
+    def get_running(cls, cam_id: str, channel: int) -> 'ChannelIngest | None':
+        ingest = cls._SHARED.get((cam_id, channel))
+        return ingest if ingest and ingest.alive else None
+
+    @property
+    def process_id(self) -> str:
+        return f'{self._cam.id}_{self._channel}_ingest'
+
+    @property
+    def restart_timeout(self) -> None:
+        return None
+
+    @property
+    def progress(self) -> FfmpegProgress | None:
+        return self._progress_monitor.progress
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    @property
+    def relay_playlist(self) -> Path | None:
+        """Local HLS playlist of the channel, `None` until it's written."""
+        if not self._relay_output or not self.alive:
+            return None
+        playlist = Path(self._relay_output.url)
+        return playlist if playlist.exists() else None
+
+    async def add_output(self, name: str, output: IngestOutput) -> None:
+        async with self._lock:
+            self._outputs[name] = output
+            # Supervisor retries the start if it fails.
+            self._cam.bot.stream_supervisor.add_process(self)
+            self._schedule_restart()
+
+    async def remove_output(self, name: str) -> None:
+        async with self._lock:
+            if self._outputs.pop(name, None) is None:
+                return
+            if self._outputs:
+                self._schedule_restart()
+                return
+            self._cam.bot.stream_supervisor.remove_process(self.process_id)
+            await self._restart()
+
+    async def restart(self) -> None:
+        async with self._lock:
+            await self._restart()
+
+    async def wait_exit(self) -> int | None:
+        """Wait for the process exit, restarts on outputs change aren't exits."""
+        while True:
+            if self._restart_task and not self._restart_task.done():
+                await asyncio.wait((self._restart_task,))
+            async with self._lock:
+                proc = self._proc
+            if not proc:
+                return None
+            returncode = await proc.wait()
+            if proc is self._proc:
+                return returncode
+
+    async def wait_stall(self) -> None:
+        while True:
+            monitor = self._progress_monitor
+            await monitor.wait_stall(self._conf.stall_timeout)
+            if monitor is self._progress_monitor:
+                return
+            # Restarted on outputs change, the new process gets its own timeout.
+
+    def _schedule_restart(self) -> None:
+        self._outputs_changed = True
+        if self._restart_task and not self._restart_task.done():
+            return
+        task_name = f'{self.__class__.__name__}_restart_{self.process_id}'
+        self._restart_task = create_task(
+            self._restart_on_outputs_change(),
+            task_name=task_name,
+            logger=self._log,
+            exception_message='Task "%s" raised an exception',
+            exception_message_args=(task_name,),
+        )
+
+    async def _restart_on_outputs_change(self) -> None:
+        await asyncio.sleep(self.OUTPUTS_CHANGE_DELAY)
+        async with self._lock:
+            # Already applied by the supervisor restart or the last output removal.
+            if not self._outputs_changed:
+                return
+            # Start failure is already logged, supervisor retries the start.
+            with contextlib.suppress(ServiceRuntimeError):
+                await self._restart()
+
+    async def _restart(self) -> None:
+        self._outputs_changed = False
+        # Old process is stopped first, camera shouldn't see two sessions.
+        await self._stop()
+        if self._outputs:
+            await self._start()
+
+    async def _start(self) -> None:
+        cmd = self._build_cmd()
+        self._log.debug(
+            '[%s] Channel %s ingest ffmpeg command: "%s"',
+            self._cam.id,
+            self._channel,
+            cmd,
+        )
+        if self._relay_output:
+            self._prepare_relay_dir()
+        try:
+            proc = await get_process_scheduler().create_subprocess_shell(
+                cmd,
+                ProcessClass.LIVESTREAM,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                preexec_fn=os.setsid,
+            )
+        except Exception as err:
+            err_msg = f'[{self._cam.id}] Channel {self._channel} ingest failed to start'
+            self._log.exception(err_msg)
+            raise ServiceRuntimeError(err_msg) from err
+        self._proc = proc
+        self._progress_monitor = FfmpegProgressMonitor()
+
+        create_task(
+            FfmpegProgressReaderTask(proc, cmd, self._progress_monitor).run(),
+            task_name=FfmpegProgressReaderTask.__name__,
+            logger=self._log,
+            exception_message='Task "%s" raised an exception',
+            exception_message_args=(FfmpegProgressReaderTask.__name__,),
+        )
+
+    async def _stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if not proc or proc.returncode is not None:
+            return
+        self._log.info('[%s] Stopping channel %s ingest', self._cam.id, self._channel)
+        await kill_proc(process=proc, signal_=signal.SIGINT, reraise=False)
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=self._STOP_TIMEOUT)
+        except TimeoutError:
+            await kill_proc(process=proc, signal_=signal.SIGKILL, reraise=False)
+
+    def _build_cmd(self) -> str:
+        outputs = list(self._outputs.values())
+        if self._relay_output:
+            outputs.append(self._relay_output)
+
+        groups: dict[tuple[str, bool], list[IngestOutput]] = {}
+        for output in outputs:
+            groups.setdefault((output.encoding_args, output.null_audio), []).append(
+                output
+            )
+        return FFMPEG_CMD_INGEST.format(
+            loglevel=self._conf.loglevel,
+            rtsp_transport=RTSP_TRANSPORT_TPL.format(
+                rtsp_transport_type=self._conf.rtsp_transport_type
+            ),
+            video_source=FFMPEG_CAM_VIDEO_SRC.format(
+                user=self._cam.conf.api.auth.user,
+                pw=self._cam.conf.api.auth.password,
+                host=urlsplit(self._cam.host).netloc,
+                rtsp_port=self._cam.conf.rtsp_port,
+                channel=self._channel,
+            ),
+            null_audio_source=FFMPEG_INGEST_NULL_AUDIO_SRC
+            if any(null_audio for _, null_audio in groups)
+            else '',
+            outputs=' '.join(
+                FFMPEG_CMD_INGEST_TEE_OUTPUT.format(
+                    map=FFMPEG_INGEST_NULL_AUDIO_MAP
+                    if null_audio
+                    else FFMPEG_INGEST_MAP,
+                    encoding_args=encoding_args,
+                    slaves='|'.join(output.tee_slave for output in group),
+                )
+                for (encoding_args, null_audio), group in groups.items()
+            ),
+        )
+
+    def _get_relay_output(self) -> IngestOutput | None:
+        """Local HLS relay for video gifs recorded from this channel."""
+        if self._cam.conf.video_gif.ring_buffer.enabled:
+            # Video ring output supersedes the relay.
+            return None
+        gif_confs = [
+            conf
+            for conf in (
+                self._cam.conf.video_gif.on_alert,
+                self._cam.conf.video_gif.on_demand,
+            )
+            if conf.channel == self._channel
+        ]
+        if not gif_confs:
+            return None
+
+        rewind_time = max(conf.rewind_time for conf in gif_confs)
+        relay_dir = gif_confs[0].tmp_storage / f'{self._cam.id}_{self._channel}_relay'
+        return IngestOutput(
+            encoding_args=FFMPEG_INGEST_RELAY_ENCODING,
+            null_audio=False,
+            format='hls',
+            url=str(relay_dir / INGEST_RELAY_PLAYLIST),
+            options={
+                'hls_time': INGEST_RELAY_HLS_TIME,
+                'hls_list_size': math.ceil(rewind_time / INGEST_RELAY_HLS_TIME) + 1,
+                'hls_flags': 'delete_segments',
+            },
+        )
+
+    def _prepare_relay_dir(self) -> None:
+        """Drop segments of the previous process, they're not continuous."""
+        relay_dir = Path(self._relay_output.url).parent
+        shutil.rmtree(relay_dir, ignore_errors=True)
+        relay_dir.mkdir(parents=True, exist_ok=True)
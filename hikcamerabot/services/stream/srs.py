@@ -8,8 +8,6 @@ from hikcamerabot.constants import (
 )
 from hikcamerabot.enums import StreamType, VideoEncoderType
 from hikcamerabot.services.stream.abstract import AbstractStreamService
-from hikcamerabot.services.tasks.livestream import ServiceStreamerTask
-from hikcamerabot.utils.task import create_task
 
 
 class SrsStreamService(AbstractStreamService):
@@ -41,15 +39,6 @@ class SrsStreamService(AbstractStreamService):
             vcodec=self._enc_conf.vcodec,
         )
 
-    def _start_stream_task(self) -> None:
-        create_task(
-            ServiceStreamerTask(service=self, run_forever=True).run(),
-            task_name=ServiceStreamerTask.__name__,
-            logger=self._log,
-            exception_message='Task "%s" raised an exception',
-            exception_message_args=(ServiceStreamerTask.__name__,),
-        )
-
     def _generate_transcode_cmd(
         self, cmd_tpl: str, cmd_transcode: str, enc_codec_name: VideoEncoderType
     ) -> None:
@@ -0,0 +1,243 @@
+"""Stream process supervisor module."""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import asdict, dataclass
+
+from hikcamerabot.utils.backoff import ExponentialBackoff
+from hikcamerabot.utils.ffmpeg_progress import FfmpegProgress
+from hikcamerabot.utils.task import create_task
+
+
+class AbstractSupervisedProcess(ABC):
+    """Long-running ffmpeg process kept alive by `StreamProcessSupervisor`."""
+
+    @property
+    @abstractmethod
+    def process_id(self) -> str:
+        """Unique process ID, e.g. camera ID and stream name."""
+
+    @property
+    @abstractmethod
+    def restart_timeout(self) -> float | None:
+        """Seconds left till planned restart or `None` to run until exit."""
+
+    @property
+    @abstractmethod
+    def progress(self) -> FfmpegProgress | None:
+        """Latest ffmpeg progress of the running process."""
+
+    @abstractmethod
+    async def wait_exit(self) -> int | None:
+        """Wait for the process to exit and return its exit code.
+
+        `None` means the process isn't running, e.g. it failed to start.
+        """
+
+    @abstractmethod
+    async def wait_stall(self) -> None:
+        """Wait until the process output stops advancing."""
+
+    @abstractmethod
+    async def restart(self) -> None:
+        """Stop the process if it's running and start it again."""
+
+
+@dataclass(slots=True)
+class SupervisedProcessStats:
+    started_at: float | None = None
+    restarts: int = 0
+    crashes: int = 0
+    last_exit_reason: str | None = None
+    circuit_open_until: float | None = None
+
+    @property
+    def uptime(self) -> float | None:
+        return time.monotonic() - self.started_at if self.started_at else None
+
+
+class StreamProcessSupervisor:
+    """Restart exited and expired stream processes.
+
+    Every process gets a watcher awaiting its exit, output stall or restart
+    period. Exited and stalled processes are restarted with jittered
+    exponential backoff. When a
+    process crashes too often, the circuit opens and restarts are paused for a
+    while; the next crash right after the pause opens it again.
+    """
+
+    RESTART_WAIT_BASE: float = 1.0
+    RESTART_WAIT_MAX: float = 300.0
+
+    # Process which stayed up that long is considered healthy again.
+    RESTART_RESET_AFTER: float = 60.0
+
+    CRASH_LOOP_MAX_CRASHES: int = 5
+    CRASH_LOOP_WINDOW: float = 300.0
+    CIRCUIT_OPEN_TIME: float = 900.0
+
+    def __init__(self) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._watchers: dict[str, asyncio.Task] = {}
+        self._processes: dict[str, AbstractSupervisedProcess] = {}
+        self._stats: dict[str, SupervisedProcessStats] = {}
+
+    def add_process(self, process: AbstractSupervisedProcess) -> None:
+        """Start supervising already started process."""
+        if process.process_id in self._watchers:
+            return
+        stats = self._stats.setdefault(process.process_id, SupervisedProcessStats())
+        stats.started_at = time.monotonic()
+        self._processes[process.process_id] = process
+        task_name = f'{self.__class__.__name__}_watcher_{process.process_id}'
+        self._watchers[process.process_id] = create_task(
+            self._supervise(process, stats),
+            task_name=task_name,
+            logger=self._log,
+            exception_message='Task "%s" raised an exception',
+            exception_message_args=(task_name,),
+        )
+
+    def remove_process(self, process_id: str) -> None:
+        """Stop supervising the process, called before stopping it on purpose."""
+        self._processes.pop(process_id, None)
+        task = self._watchers.pop(process_id, None)
+        if task:
+            task.cancel()
+        if stats := self._stats.get(process_id):
+            stats.started_at = None
+
+    def stats(self) -> dict[str, dict]:
+        now = time.monotonic()
+        return {
+            process_id: {
+                'supervised': process_id in self._watchers,
+                'progress': asdict(progress)
+                if process_id in self._watchers
+                and (progress := self._processes[process_id].progress)
+                else None,
+                'uptime': stats.uptime,
+                'restarts': stats.restarts,
+                'crashes': stats.crashes,
+                'last_exit_reason': stats.last_exit_reason,
+                'circuit_open': bool(
+                    stats.circuit_open_until and stats.circuit_open_until > now
+                ),
+            }
+            for process_id, stats in self._stats.items()
+        }
+
+    async def _supervise(
+        self, process: AbstractSupervisedProcess, stats: SupervisedProcessStats
+    ) -> None:
+        backoff = ExponentialBackoff(
+            base=self.RESTART_WAIT_BASE, cap=self.RESTART_WAIT_MAX
+        )
+        crash_times: deque[float] = deque()
+        while True:
+            stats.last_exit_reason = await self._wait_exit_reason(process)
+            if stats.last_exit_reason is None:
+                stats.last_exit_reason = 'restart period'
+                self._log.info(
+                    '[%s] Restarting process after restart period, uptime %.0fs',
+                    process.process_id,
+                    stats.uptime,
+                )
+                delay = 0.0
+            else:
+                delay = self._get_crash_delay(process, stats, backoff, crash_times)
+            stats.started_at = None
+            await self._restart(process, stats, backoff, crash_times, delay)
+
+    async def _wait_exit_reason(self, process: AbstractSupervisedProcess) -> str | None:
+        """Wait for exit or stall and return its reason, `None` on restart period."""
+        exit_task = asyncio.ensure_future(process.wait_exit())
+        stall_task = asyncio.ensure_future(process.wait_stall())
+        try:
+            await asyncio.wait(
+                (exit_task, stall_task),
+                timeout=process.restart_timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            exit_task.cancel()
+            stall_task.cancel()
+
+        if exit_task.done() and not exit_task.cancelled():
+            returncode = exit_task.result()
+            return (
+                'not running'
+                if returncode is None
+                else f'exited with code {returncode}'
+            )
+        if stall_task.done() and not stall_task.cancelled():
+            return 'output stalled'
+        return None
+
+    async def _restart(
+        self,
+        process: AbstractSupervisedProcess,
+        stats: SupervisedProcessStats,
+        backoff: ExponentialBackoff,
+        crash_times: deque[float],
+        delay: float,
+    ) -> None:
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await process.restart()
+            except Exception as err:
+                stats.last_exit_reason = f'failed to start: {err}'
+                delay = self._get_crash_delay(process, stats, backoff, crash_times)
+                continue
+            stats.started_at = time.monotonic()
+            stats.restarts += 1
+            return
+
+    def _get_crash_delay(
+        self,
+        process: AbstractSupervisedProcess,
+        stats: SupervisedProcessStats,
+        backoff: ExponentialBackoff,
+        crash_times: deque[float],
+    ) -> float:
+        """Count the crash and return delay before the next start."""
+        now = time.monotonic()
+        uptime = stats.uptime or 0.0
+        half_open = stats.circuit_open_until is not None
+        if uptime > self.RESTART_RESET_AFTER:
+            backoff.reset()
+            crash_times.clear()
+            half_open = False
+        stats.circuit_open_until = None
+        stats.crashes += 1
+
+        crash_times.append(now)
+        while now - crash_times[0] > self.CRASH_LOOP_WINDOW:
+            crash_times.popleft()
+        if half_open or len(crash_times) >= self.CRASH_LOOP_MAX_CRASHES:
+            crash_times.clear()
+            stats.circuit_open_until = now + self.CIRCUIT_OPEN_TIME
+            self._log.error(
+                '[%s] Process is crash looping (%s, uptime %.0fs), pausing '
+                'restarts for %.0fs',
+                process.process_id,
+                stats.last_exit_reason,
+                uptime,
+                self.CIRCUIT_OPEN_TIME,
+            )
+            return self.CIRCUIT_OPEN_TIME
+
+        delay = backoff.next_delay()
+        self._log.error(
+            '[%s] Process %s, uptime %.0fs, restarting in %.1f seconds (attempt %d)',
+            process.process_id,
+            stats.last_exit_reason,
+            uptime,
+            delay,
+            backoff.attempt,
+        )
+        return delay
@@ -5,13 +5,15 @@ from typing import Literal
 from hikcamerabot.enums import StreamType, VideoEncoderType
 from hikcamerabot.services.stream.abstract import (
     AbstractExternalLivestreamService,
+    IngestStreamMixin,
 )
 
 
-class TelegramStreamService(AbstractExternalLivestreamService):
+class TelegramStreamService(AbstractExternalLivestreamService, IngestStreamMixin):
     """Telegram Livestream Service Class."""
 
     NAME: Literal[StreamType.TELEGRAM] = StreamType.TELEGRAM
+    OVERLAP_RESTART_SUPPORTED: bool = True
 
     def _generate_transcode_cmd(
         self, cmd_tpl: str, cmd_transcode: str, enc_codec_name: VideoEncoderType
@@ -21,6 +23,7 @@ class TelegramStreamService(AbstractExternalLivestreamService):
         except KeyError:
             inner_args = ''
         inner_args = cmd_transcode.format(inner_args=inner_args)
+        self._ingest_encoding_args = self._format_ingest_encoding_args(inner_args)
         self._cmd = cmd_tpl.format(
             output=self._generate_output(), inner_args=inner_args
         )
@@ -5,13 +5,15 @@ from typing import Literal
 from hikcamerabot.enums import StreamType, VideoEncoderType
 from hikcamerabot.services.stream.abstract import (
     AbstractExternalLivestreamService,
+    IngestStreamMixin,
 )
 
 
-class YouTubeStreamService(AbstractExternalLivestreamService):
+class YouTubeStreamService(AbstractExternalLivestreamService, IngestStreamMixin):
     """YouTube Livestream Service Class."""
 
     NAME: Literal[StreamType.YOUTUBE] = StreamType.YOUTUBE
+    OVERLAP_RESTART_SUPPORTED: bool = True
 
     def _generate_transcode_cmd(
         self, cmd_tpl: str, cmd_transcode: str, enc_codec_name: VideoEncoderType
@@ -22,6 +24,7 @@ class YouTubeStreamService(AbstractExternalLivestreamService):
             inner_args = ''
 
         inner_args = cmd_transcode.format(inner_args=inner_args)
+        self._ingest_encoding_args = self._format_ingest_encoding_args(inner_args)
         self._cmd = cmd_tpl.format(
             output=self._generate_output(), inner_args=inner_args
         )
@@ -0,0 +1,36 @@
+import random
+
+
+class ExponentialBackoff:
+    """Exponential backoff with jitter.
+
+    Each delay is drawn from the upper half of the current exponential window,
+    so consecutive retries keep growing apart while many clients retrying at the
+    same time are spread out instead of reconnecting in lockstep. The window
+    stops growing once it reaches `cap`, so retrying never ends with overflow.
+    """
+
+    def __init__(self, base: float, cap: float, factor: float = 2.0) -> None:
+        self._base = base
+        self._cap = cap
+        self._factor = factor
+        self._attempt = 0
+        self._exponent = 0
+
+    @property
+    def attempt(self) -> int:
+        return self._attempt
+
+    def next_delay(self) -> float:
+        """Return delay before the next attempt and advance the attempt counter."""
+        window = self._base * self._factor**self._exponent
+        if window < self._cap:
+            self._exponent += 1
+        else:
+            window = self._cap
+        self._attempt += 1
+        return window / 2 + random.uniform(0, window / 2)  # noqa: S311
+
+    def reset(self) -> None:
+        self._attempt = 0
+        self._exponent = 0
@@ -0,0 +1,113 @@
+"""Ffmpeg `-progress` output parser module."""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Final
+
+_NOT_AVAILABLE: Final[str] = 'N/A'
+_PROGRESS_KEY: Final[str] = 'progress'
+_PROGRESS_END: Final[str] = 'end'
+
+
+@dataclass(slots=True)
+class FfmpegProgress:
+    """One `-progress` block. Bitrate is in kbit/s, size in bytes."""
+
+    frame: int
+    fps: float
+    bitrate: float | None
+    total_size: int | None
+    out_time_us: int | None
+    dup_frames: int
+    drop_frames: int
+    speed: float | None
+    is_end: bool
+
+
+def _to_int(value: str | None) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: str | None, suffix: str = '') -> float | None:
+    if value is None or value == _NOT_AVAILABLE:
+        return None
+    try:
+        return float(value.removesuffix(suffix))
+    except ValueError:
+        return None
+
+
+class FfmpegProgressParser:
+    """Incremental parser of `key=value` lines, a block ends with `progress` key."""
+
+    def __init__(self) -> None:
+        self._block: dict[str, str] = {}
+
+    def feed(self, line: str) -> FfmpegProgress | None:
+        """Return progress when the line completes a block."""
+        key, sep, value = line.strip().partition('=')
+        if not sep:
+            return None
+        self._block[key] = value.strip()
+        if key != _PROGRESS_KEY:
+            return None
+
+        block, self._block = self._block, {}
+        return FfmpegProgress(
+            frame=_to_int(block.get('frame')) or 0,
+            fps=_to_float(block.get('fps')) or 0.0,
+            bitrate=_to_float(block.get('bitrate'), suffix='kbits/s'),
+            total_size=_to_int(block.get('total_size')),
+            out_time_us=_to_int(block.get('out_time_us')),
+            dup_frames=_to_int(block.get('dup_frames')) or 0,
+            drop_frames=_to_int(block.get('drop_frames')) or 0,
+            speed=_to_float(block.get('speed'), suffix='x'),
+            is_end=block[_PROGRESS_KEY] == _PROGRESS_END,
+        )
+
+
+class FfmpegProgressMonitor:
+    """Latest progress of a running ffmpeg process and its stall detection."""
+
+    def __init__(self) -> None:
+        self.progress: FfmpegProgress | None = None
+        # Monotonic time of the first and the latest output time advance.
+        self.first_advanced_at: float | None = None
+        self.last_advanced_at: float | None = None
+        self._out_time_us = 0
+        self._advanced = asyncio.Event()
+        self._flowing = asyncio.Event()
+
+    def update(self, progress: FfmpegProgress) -> None:
+        self.progress = progress
+        if progress.out_time_us and progress.out_time_us > self._out_time_us:
+            self._out_time_us = progress.out_time_us
+            self.last_advanced_at = time.monotonic()
+            if not self._flowing.is_set():
+                self.first_advanced_at = self.last_advanced_at
+                self._flowing.set()
+            self._advanced.set()
+
+    async def wait_flowing(self) -> None:
+        """Wait for the first output time advance."""
+        await self._flowing.wait()
+
+    async def wait_stall(self, stall_timeout: float) -> None:
+        """Return when output time didn't advance for `stall_timeout` seconds.
+
+        Time before the first output counts too, so a process which never
+        gets the stream is stalled as well. Zero timeout waits forever.
+        """
+        if not stall_timeout:
+            await asyncio.Event().wait()
+        while True:
+            self._advanced.clear()
+            try:
+                async with asyncio.timeout(stall_timeout):
+                    await self._advanced.wait()
+            except TimeoutError:
+                return
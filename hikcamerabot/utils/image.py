@@ -1,59 +1,119 @@
 """Image processing module."""
 
+import asyncio
 import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from io import BytesIO
 
 from PIL import Image, ImageFile
 
+from hikcamerabot.config.config import main_conf
+from hikcamerabot.config.schemas.main_config import ResizeProfileSchema
 from hikcamerabot.constants import Img
+from hikcamerabot.enums import ImageExecutorType, ResampleFilterType
 from hikcamerabot.utils.shared import Singleton
 
+_RESAMPLE_FILTERS: dict[ResampleFilterType, Image.Resampling] = {
+    ResampleFilterType.NEAREST: Image.Resampling.NEAREST,
+    ResampleFilterType.BOX: Image.Resampling.BOX,
+    ResampleFilterType.BILINEAR: Image.Resampling.BILINEAR,
+    ResampleFilterType.HAMMING: Image.Resampling.HAMMING,
+    ResampleFilterType.BICUBIC: Image.Resampling.BICUBIC,
+    ResampleFilterType.LANCZOS: Image.Resampling.LANCZOS,
+}
+
+
+def calculate_size(
+    width: int, height: int, target_size: tuple[int, int] = Img.SIZE
+) -> tuple[int, int]:
+    """Make it work correctly for 4x3 cameras by JulyIghor.
+
+    https://github.com/tropicoo/hikvision-camera-bot/issues/122.
+    """
+    # Calculate new size maintaining aspect ratio
+    target_width, target_height = target_size
+    aspect_ratio = width / height
+
+    # Decide if the image should be scaled based on the target width or height
+    if width / target_width < height / target_height:
+        return int(target_height * aspect_ratio), target_height
+    return target_width, int(target_width / aspect_ratio)
+
+
+def resize_jpeg(raw_snapshot: bytes, profile: ResizeProfileSchema) -> bytes:
+    """Return JPEG snapshot bytes resized according to the profile.
+
+    Runs in the image worker pool, so takes and returns plain bytes.
+    With `profile.draft` the JPEG decoder itself downscales the frame by 1/2, 1/4
+    or 1/8 (never below the target size), which is much cheaper than decoding
+    full 4K/8MP frame and resizing it afterwards.
+    """
+    ImageFile.LOAD_TRUNCATED_IMAGES = True
+    image = Image.open(BytesIO(raw_snapshot))
+    size = calculate_size(
+        image.width, image.height, target_size=(profile.width, profile.height)
+    )
+    if profile.draft:
+        image.draft('RGB', size)
+
+    resized_snapshot = BytesIO()
+    image.resize(size, _RESAMPLE_FILTERS[profile.resample]).save(
+        resized_snapshot,
+        Img.FORMAT,
+        quality=profile.quality,
+        optimize=profile.optimize,
+    )
+    return resized_snapshot.getvalue()
+
 
 class ImageProcessor(metaclass=Singleton):
-    """Image Processor Class. Process raw images taken from Hikvision camera."""
+    """Image Processor Class. Process raw images taken from Hikvision camera.
+
+    CPU-heavy decoding and encoding run in a dedicated worker pool so many
+    simultaneous alerts don't hold the GIL of the event loop thread.
+    """
 
     def __init__(self) -> None:
         self._log = logging.getLogger(self.__class__.__name__)
+        self._conf = main_conf.image_processing
+        self._executor: Executor | None = None
 
-    def resize(self, raw_snapshot: BytesIO) -> BytesIO:
-        """Return resized JPEG snapshot."""
-        self._log.debug('Resizing snapshot')
-        ImageFile.LOAD_TRUNCATED_IMAGES = True
-        raw_snapshot_image = Image.open(raw_snapshot)
-        resized_snapshot = BytesIO()
-
-        size = self._calculate_size(raw_snapshot_image)
-        snapshot: Image.Image = raw_snapshot_image.resize(size, Image.LANCZOS)
-        snapshot.save(
-            resized_snapshot,
-            Img.FORMAT,
-            quality=Img.QUALITY,
-            optimize=True,
+    async def resize(self, raw_snapshot: bytes, profile_name: str) -> bytes:
+        """Return JPEG snapshot resized according to the named profile."""
+        self._log.debug('Resizing snapshot with "%s" profile', profile_name)
+        resized_snapshot = await asyncio.get_running_loop().run_in_executor(
+            self._get_executor(),
+            resize_jpeg,
+            raw_snapshot,
+            self._conf.profiles[profile_name],
         )
-        resized_snapshot.seek(0)
-
         self._log.debug(
-            'Raw snapshot: %s, %s, %s',
-            raw_snapshot_image.format,
-            raw_snapshot_image.mode,
-            raw_snapshot_image.size,
+            'Resized snapshot from %d to %d bytes',
+            len(raw_snapshot),
+            len(resized_snapshot),
         )
-        self._log.debug('Resized snapshot: %s', size)
         return resized_snapshot
 
-    def _calculate_size(self, raw_snapshot_image: Image.Image) -> tuple[int, int]:
-        """Make it work correctly for 4x3 cameras by JulyIghor.
-
-        https://github.com/tropicoo/hikvision-camera-bot/issues/122.
-        """
-        # Calculate new size maintaining aspect ratio
-        target_width, target_height = Img.SIZE
-        aspect_ratio = raw_snapshot_image.width / raw_snapshot_image.height
-
-        # Decide if the image should be scaled based on the target width or height
-        if (
-            raw_snapshot_image.width / target_width
-            < raw_snapshot_image.height / target_height
-        ):
-            return int(target_height * aspect_ratio), target_height
-        return target_width, int(target_width / aspect_ratio)
+    def _get_executor(self) -> Executor:
+        """Lazily create worker pool on first use."""
+        if self._executor:
+            return self._executor
+
+        self._log.info(
+            'Starting image %s pool with %d workers',
+            self._conf.executor.value,
+            self._conf.workers,
+        )
+        if self._conf.executor is ImageExecutorType.PROCESS:
+            # Do not fork the running multithreaded event loop process.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._conf.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._conf.workers,
+                thread_name_prefix=self.__class__.__name__,
+            )
+        return self._executor
@@ -0,0 +1,115 @@
+"""Minimal asyncio-friendly inotify binding built on ctypes."""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Final, NamedTuple
+
+IN_CLOSE_WRITE: Final[int] = 0x00000008
+IN_MOVED_TO: Final[int] = 0x00000080
+IN_Q_OVERFLOW: Final[int] = 0x00004000
+IN_IGNORED: Final[int] = 0x00008000
+
+_IN_NONBLOCK: Final[int] = os.O_NONBLOCK
+_IN_CLOEXEC: Final[int] = os.O_CLOEXEC
+
+# struct inotify_event: int wd; uint32_t mask; uint32_t cookie; uint32_t len;
+_EVENT_HEADER: Final[struct.Struct] = struct.Struct('iIII')
+_READ_BUFFER_SIZE: Final[int] = 64 * 1024
+
+
+class InotifyEvent(NamedTuple):
+    wd: int
+    mask: int
+    cookie: int
+    name: str
+
+
+def _load_libc() -> ctypes.CDLL:
+    libc_name = ctypes.util.find_library('c')
+    if not libc_name:
+        raise OSError('libc not found')
+    libc = ctypes.CDLL(libc_name, use_errno=True)
+    if not hasattr(libc, 'inotify_init1'):
+        raise OSError('inotify is not supported by libc')
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+def _raise_errno(func_name: str) -> None:
+    errno_ = ctypes.get_errno()
+    raise OSError(errno_, f'{func_name} failed: {os.strerror(errno_)}')
+
+
+def parse_events(data: bytes) -> list[InotifyEvent]:
+    """Parse raw buffer read from inotify file descriptor."""
+    events: list[InotifyEvent] = []
+    offset = 0
+    data_len = len(data)
+    header_size = _EVENT_HEADER.size
+    while offset + header_size <= data_len:
+        wd, mask, cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+        offset += header_size
+        name = data[offset : offset + name_len].rstrip(b'\0').decode(errors='replace')
+        offset += name_len
+        events.append(InotifyEvent(wd=wd, mask=mask, cookie=cookie, name=name))
+    return events
+
+
+class Inotify:
+    """Inotify instance watching directories.
+
+    Raises `OSError` when inotify is not available, e.g. not on Linux or when
+    the filesystem doesn't support it, so callers can fall back to polling.
+    """
+
+    def __init__(self) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._libc = _load_libc()
+        self._fd: int = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            _raise_errno('inotify_init1')
+
+    def add_watch(self, path: Path | str, mask: int) -> int:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+        if wd < 0:
+            _raise_errno('inotify_add_watch')
+        return wd
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    async def events(self) -> AsyncGenerator[InotifyEvent]:
+        """Yield events as they arrive without polling."""
+        loop = asyncio.get_running_loop()
+        readable = asyncio.Event()
+        loop.add_reader(self._fd, readable.set)
+        try:
+            while True:
+                await readable.wait()
+                readable.clear()
+                for event in parse_events(self._read()):
+                    yield event
+        finally:
+            loop.remove_reader(self._fd)
+
+    def _read(self) -> bytes:
+        chunks: list[bytes] = []
+        while True:
+            try:
+                chunk = os.read(self._fd, _READ_BUFFER_SIZE)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b''.join(chunks)
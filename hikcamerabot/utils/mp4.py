@@ -0,0 +1,189 @@
+"""Minimal MP4 (ISO BMFF) metadata reader.
+
+Reads only box headers and the `moov` box with a few `pread` calls to get
+video duration and dimensions without spawning `ffprobe`.
+"""
+
+import os
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+
+_BOX_HEADER: Final[struct.Struct] = struct.Struct('>I4s')
+_LARGE_SIZE: Final[struct.Struct] = struct.Struct('>Q')
+_UINT16: Final[struct.Struct] = struct.Struct('>H')
+_UINT32: Final[struct.Struct] = struct.Struct('>I')
+_UINT64: Final[struct.Struct] = struct.Struct('>Q')
+
+# Larger `moov` means unusual file, let ffprobe deal with it.
+_MAX_MOOV_SIZE: Final[int] = 32 * 1024 * 1024
+# Top-level boxes to walk before giving up, `moov` is usually 2nd-4th.
+_MAX_TOP_LEVEL_BOXES: Final[int] = 32
+
+# Full box header (version + flags) precedes box fields.
+_FULL_BOX_HEADER_SIZE: Final[int] = 4
+# Offset of width/height in tkhd after version-dependent fields: reserved(8),
+# layer(2), alternate_group(2), volume(2), reserved(2), matrix(36).
+_TKHD_DIMENSIONS_OFFSET: Final[int] = 52
+# Offset of width/height in VisualSampleEntry after box header: reserved(6),
+# data_reference_index(2), pre_defined(2), reserved(2), pre_defined(12).
+_VISUAL_SAMPLE_ENTRY_DIMENSIONS_OFFSET: Final[int] = 24
+
+
+@dataclass(slots=True)
+class VideoMetadata:
+    duration: float
+    width: int
+    height: int
+
+
+def _iter_boxes(data: bytes, start: int, end: int) -> Iterator[tuple[bytes, int, int]]:
+    """Yield (box type, payload start, payload end) of boxes in `data`."""
+    offset = start
+    while offset + _BOX_HEADER.size <= end:
+        size, type_ = _BOX_HEADER.unpack_from(data, offset)
+        header_size = _BOX_HEADER.size
+        if size == 1:
+            (size,) = _LARGE_SIZE.unpack_from(data, offset + header_size)
+            header_size += _LARGE_SIZE.size
+        elif size == 0:
+            size = end - offset
+        if size < header_size or offset + size > end:
+            return
+        yield type_, offset + header_size, offset + size
+        offset += size
+
+
+def _find_box(data: bytes, start: int, end: int, type_: bytes) -> tuple[int, int]:
+    for box_type, box_start, box_end in _iter_boxes(data, start, end):
+        if box_type == type_:
+            return box_start, box_end
+    raise LookupError(type_)
+
+
+def _read_moov(fd: int) -> bytes | None:
+    file_size = os.fstat(fd).st_size
+    offset = 0
+    for _ in range(_MAX_TOP_LEVEL_BOXES):
+        header = os.pread(fd, _BOX_HEADER.size + _LARGE_SIZE.size, offset)
+        if len(header) < _BOX_HEADER.size:
+            return None
+        size, type_ = _BOX_HEADER.unpack_from(header)
+        header_size = _BOX_HEADER.size
+        if size == 1:
+            if len(header) < _BOX_HEADER.size + _LARGE_SIZE.size:
+                return None
+            (size,) = _LARGE_SIZE.unpack_from(header, _BOX_HEADER.size)
+            header_size += _LARGE_SIZE.size
+        elif size == 0:
+            size = file_size - offset
+        if size < header_size or offset + size > file_size:
+            return None
+        if type_ == b'moov':
+            if size > _MAX_MOOV_SIZE:
+                return None
+            data = os.pread(fd, size - header_size, offset + header_size)
+            return data if len(data) == size - header_size else None
+        offset += size
+    return None
+
+
+def _parse_mvhd_duration(data: bytes, start: int) -> float:
+    version = data[start]
+    offset = start + _FULL_BOX_HEADER_SIZE
+    if version == 1:
+        # creation_time(8), modification_time(8).
+        offset += 16
+        (timescale,) = _UINT32.unpack_from(data, offset)
+        (duration,) = _UINT64.unpack_from(data, offset + 4)
+    else:
+        # creation_time(4), modification_time(4).
+        offset += 8
+        timescale, duration = struct.unpack_from('>II', data, offset)
+    if not timescale:
+        raise ValueError('Zero mvhd timescale')
+    return duration / timescale
+
+
+def _parse_tkhd_dimensions(data: bytes, start: int) -> tuple[int, int]:
+    version = data[start]
+    # creation_time, modification_time, track_ID, reserved, duration.
+    offset = start + _FULL_BOX_HEADER_SIZE + (32 if version == 1 else 20)
+    offset += _TKHD_DIMENSIONS_OFFSET
+    width, height = struct.unpack_from('>II', data, offset)
+    # 16.16 fixed-point.
+    return width >> 16, height >> 16
+
+
+def _parse_stsd_dimensions(data: bytes, start: int, end: int) -> tuple[int, int]:
+    # Skip version/flags and entry_count, first sample entry follows.
+    entry_start = start + _FULL_BOX_HEADER_SIZE + _UINT32.size
+    for _, payload_start, _ in _iter_boxes(data, entry_start, end):
+        offset = payload_start + _VISUAL_SAMPLE_ENTRY_DIMENSIONS_OFFSET
+        (width,) = _UINT16.unpack_from(data, offset)
+        (height,) = _UINT16.unpack_from(data, offset + _UINT16.size)
+        return width, height
+    raise LookupError(b'stsd entry')
+
+
+def _is_video_track(data: bytes, mdia_start: int, mdia_end: int) -> bool:
+    hdlr_start, _ = _find_box(data, mdia_start, mdia_end, b'hdlr')
+    # version/flags(4), pre_defined(4), handler_type(4).
+    offset = hdlr_start + _FULL_BOX_HEADER_SIZE + 4
+    return data[offset : offset + 4] == b'vide'
+
+
+def _parse_video_dimensions(
+    data: bytes, trak_start: int, trak_end: int
+) -> tuple[int, int]:
+    """Return coded dimensions from `stsd` like ffprobe does, else from `tkhd`."""
+    mdia_start, mdia_end = _find_box(data, trak_start, trak_end, b'mdia')
+    try:
+        minf = _find_box(data, mdia_start, mdia_end, b'minf')
+        stbl = _find_box(data, *minf, b'stbl')
+        width, height = _parse_stsd_dimensions(data, *_find_box(data, *stbl, b'stsd'))
+    except LookupError:
+        width = height = 0
+    if width and height:
+        return width, height
+    tkhd_start, _ = _find_box(data, trak_start, trak_end, b'tkhd')
+    return _parse_tkhd_dimensions(data, tkhd_start)
+
+
+def read_mp4_metadata(file_path: Path) -> VideoMetadata | None:
+    """Read duration and dimensions of the first video track.
+
+    Return `None` when file is not a regular complete MP4, e.g. fragmented,
+    still being written or without video track.
+
+    Raises `OSError` when file can't be read.
+    """
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        moov = _read_moov(fd)
+    finally:
+        os.close(fd)
+    if not moov:
+        return None
+
+    try:
+        mvhd_start, _ = _find_box(moov, 0, len(moov), b'mvhd')
+        duration = _parse_mvhd_duration(moov, mvhd_start)
+        for box_type, trak_start, trak_end in _iter_boxes(moov, 0, len(moov)):
+            if box_type != b'trak':
+                continue
+            mdia_start, mdia_end = _find_box(moov, trak_start, trak_end, b'mdia')
+            if not _is_video_track(moov, mdia_start, mdia_end):
+                continue
+            width, height = _parse_video_dimensions(moov, trak_start, trak_end)
+            break
+        else:
+            return None
+    except (LookupError, ValueError, struct.error, IndexError):
+        return None
+
+    if not duration or not width or not height:
+        return None
+    return VideoMetadata(duration=duration, width=width, height=height)
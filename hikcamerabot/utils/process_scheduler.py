@@ -0,0 +1,182 @@
+"""Global subprocess budget scheduler module."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from hikcamerabot.config.config import main_conf
+from hikcamerabot.config.schemas.main_config import ProcessSchedulerSchema
+from hikcamerabot.enums import ProcessClass
+from hikcamerabot.exceptions import ProcessQueueTimeoutError
+from hikcamerabot.utils.task import create_task
+
+
+@dataclass(slots=True)
+class ProcessClassStats:
+    """Admission statistics of one process class."""
+
+    admitted: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    def add_wait(self, wait_time: float) -> None:
+        self.admitted += 1
+        self.wait_total += wait_time
+        self.wait_max = max(self.wait_max, wait_time)
+
+
+class ProcessScheduler:
+    """Admit ffmpeg/ffprobe and other subprocesses within a global budget.
+
+    Every process class has its own cap of running processes, all of them share
+    the global cap. Processes over the caps wait in a per-class FIFO queue,
+    freed slots go to the highest priority class first. A slot is held until
+    the process exits.
+    """
+
+    def __init__(self, conf: ProcessSchedulerSchema) -> None:
+        self._log = logging.getLogger(self.__class__.__name__)
+        self._conf = conf
+        self._waiters: dict[ProcessClass, deque[asyncio.Future[None]]] = {
+            process_class: deque() for process_class in ProcessClass
+        }
+        self._running: dict[ProcessClass, int] = dict.fromkeys(ProcessClass, 0)
+        self._total_running = 0
+        self._stats: dict[ProcessClass, ProcessClassStats] = {
+            process_class: ProcessClassStats() for process_class in ProcessClass
+        }
+
+    async def create_subprocess_shell(
+        self, cmd: str, process_class: ProcessClass, **kwargs
+    ) -> asyncio.subprocess.Process:
+        """Wait for a free slot and start the process.
+
+        Raises `ProcessQueueTimeoutError` when the slot wasn't given within
+        the class queue timeout. Cancelling the caller leaves the queue.
+        """
+        await self._acquire(process_class)
+        try:
+            proc = await asyncio.create_subprocess_shell(cmd, **kwargs)
+        except BaseException:
+            self._release(process_class)
+            raise
+
+        task_name = f'{process_class}_process_{proc.pid}'
+        create_task(
+            self._release_on_exit(proc, process_class),
+            task_name=task_name,
+            logger=self._log,
+            exception_message='Task "%s" raised an exception',
+            exception_message_args=(task_name,),
+        )
+        return proc
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            'running': self._total_running,
+            'max_running': self._conf.max_running,
+            'classes': {
+                process_class.value: {
+                    'running': self._running[process_class],
+                    'max_running': self._conf.get_class_conf_by_type(
+                        process_class
+                    ).max_running,
+                    'queued': len(self._waiters[process_class]),
+                    'admitted': stats.admitted,
+                    'timed_out': stats.timed_out,
+                    'cancelled': stats.cancelled,
+                    'wait_time_avg': stats.wait_total / stats.admitted
+                    if stats.admitted
+                    else 0.0,
+                    'wait_time_max': stats.wait_max,
+                }
+                for process_class, stats in self._stats.items()
+            },
+        }
+
+    async def _release_on_exit(
+        self, proc: asyncio.subprocess.Process, process_class: ProcessClass
+    ) -> None:
+        try:
+            await proc.wait()
+        finally:
+            self._release(process_class)
+
+    def _can_admit(self, process_class: ProcessClass) -> bool:
+        class_conf = self._conf.get_class_conf_by_type(process_class)
+        return (
+            self._total_running < self._conf.max_running
+            and self._running[process_class] < class_conf.max_running
+        )
+
+    def _take_slot(self, process_class: ProcessClass) -> None:
+        self._running[process_class] += 1
+        self._total_running += 1
+
+    async def _acquire(self, process_class: ProcessClass) -> None:
+        stats = self._stats[process_class]
+        waiters = self._waiters[process_class]
+        if not waiters and self._can_admit(process_class):
+            self._take_slot(process_class)
+            stats.add_wait(0.0)
+            return
+
+        queue_timeout = self._conf.get_class_conf_by_type(process_class).queue_timeout
+        self._log.debug(
+            'No free "%s" process slots, queueing. Queue size: %d',
+            process_class,
+            len(waiters) + 1,
+        )
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(queue_timeout or None):
+                await waiter
+        except TimeoutError:
+            self._abandon(process_class, waiter)
+            stats.timed_out += 1
+            raise ProcessQueueTimeoutError(
+                f'No free "{process_class}" process slot in {queue_timeout}s'
+            ) from None
+        except asyncio.CancelledError:
+            self._abandon(process_class, waiter)
+            stats.cancelled += 1
+            raise
+        stats.add_wait(time.monotonic() - started)
+
+    def _abandon(
+        self, process_class: ProcessClass, waiter: asyncio.Future[None]
+    ) -> None:
+        waiters = self._waiters[process_class]
+        if waiter in waiters:
+            waiters.remove(waiter)
+        elif waiter.done() and not waiter.cancelled():
+            # Slot was given right before the timeout or cancellation.
+            self._release(process_class)
+
+    def _release(self, process_class: ProcessClass) -> None:
+        self._running[process_class] -= 1
+        self._total_running -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        """Give free slots to waiters in priority order."""
+        for process_class, waiters in self._waiters.items():
+            while waiters and self._can_admit(process_class):
+                waiter = waiters.popleft()
+                if waiter.done():
+                    continue
+                self._take_slot(process_class)
+                waiter.set_result(None)
+
+
+_PROCESS_SCHEDULER = ProcessScheduler(conf=main_conf.process_scheduler)
+
+
+def get_process_scheduler() -> ProcessScheduler:
+    return _PROCESS_SCHEDULER
@@ -1,6 +1,7 @@
 """Utils module."""
 
 import asyncio
+import html
 import logging
 import random
 import string
@@ -59,6 +60,22 @@ def bold(text: str) -> str:
     return f'<b>{text}</b>'
 
 
+def format_stats(stats: dict[str, Any], indent: int = 0) -> str:
+    """Format nested stats as indented `key: value` lines."""
+    lines: list[str] = []
+    for key, value in stats.items():
+        prefix = f'{" " * indent}{html.escape(str(key))}:'
+        if isinstance(value, dict):
+            lines.append(prefix if value else f'{prefix} -')
+            if value:
+                lines.append(format_stats(value, indent=indent + 2))
+        elif isinstance(value, float):
+            lines.append(f'{prefix} {value:.3f}')
+        else:
+            lines.append(f'{prefix} {html.escape(str(value))}')
+    return '\n'.join(lines)
+
+
 def get_user_info(message: Message) -> str:
     """Return user information who interacts with bot."""
     chat = message.chat
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Benchmark snapshot resizing paths on 2MP/4MP/8MP frames.
+
+Compares the legacy path (full decode + LANCZOS resize in the default thread
+pool) with the image worker pool (thread or process, with and without JPEG
+draft decoding). Every case resizes `--concurrency` frames at once, like many
+cameras alerting simultaneously, and reports total time and the worst event
+loop lag observed meanwhile.
+
+Run from the repository root, configs are loaded as for the bot itself:
+
+    python scripts/bench_image_resize.py --concurrency 8 --rounds 3
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hikcamerabot.config.schemas.main_config import ResizeProfileSchema
+from hikcamerabot.constants import Img
+from hikcamerabot.enums import ResampleFilterType
+from hikcamerabot.utils.image import calculate_size, resize_jpeg
+
+FRAME_SIZES: dict[str, tuple[int, int]] = {
+    '2MP': (1920, 1080),
+    '4MP': (2560, 1440),
+    '8MP': (3840, 2160),
+}
+
+
+def make_frame(size: tuple[int, int]) -> bytes:
+    """Make camera-like JPEG frame: gradient with noise to defeat compression."""
+    gradient = Image.linear_gradient('L').resize(size)
+    noise = Image.effect_noise(size, 40)
+    frame = Image.merge(
+        'RGB', (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT))
+    )
+    out = BytesIO()
+    frame.save(out, 'JPEG', quality=90)
+    return out.getvalue()
+
+
+def legacy_resize(raw_snapshot: bytes) -> bytes:
+    """Resize the way it was done before the image worker pool."""
+    image = Image.open(BytesIO(raw_snapshot))
+    size = calculate_size(image.width, image.height)
+    out = BytesIO()
+    image.resize(size, Image.LANCZOS).save(
+        out, Img.FORMAT, quality=Img.QUALITY, optimize=True
+    )
+    return out.getvalue()
+
+
+# Same output as the legacy path.
+DRAFT_PROFILE = ResizeProfileSchema(
+    width=Img.SIZE[0],
+    height=Img.SIZE[1],
+    resample=ResampleFilterType.LANCZOS,
+    quality=Img.QUALITY,
+    optimize=True,
+    draft=True,
+)
+NO_DRAFT_PROFILE = DRAFT_PROFILE.model_copy(update={'draft': False})
+
+
+def resize_draft(raw_snapshot: bytes) -> bytes:
+    return resize_jpeg(raw_snapshot, DRAFT_PROFILE)
+
+
+def resize_no_draft(raw_snapshot: bytes) -> bytes:
+    return resize_jpeg(raw_snapshot, NO_DRAFT_PROFILE)
+
+
+async def measure_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Return the worst event loop lag while `stop` is not set."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run_case(
+    executor: Executor | None,
+    func: Callable[[bytes], bytes],
+    frame: bytes,
+    concurrency: int,
+) -> tuple[float, float]:
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(stop))
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(loop.run_in_executor(executor, func, frame) for _ in range(concurrency))
+    )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, await lag_task
+
+
+async def main(concurrency: int, rounds: int, workers: int) -> None:
+    thread_pool = ThreadPoolExecutor(max_workers=workers)
+    process_pool = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+    )
+    # Warm up worker processes so spawn time is not measured.
+    await asyncio.gather(
+        *(
+            asyncio.get_running_loop().run_in_executor(process_pool, sum, (1, 2))
+            for _ in range(workers)
+        )
+    )
+    cases: list[tuple[str, Executor | None, Callable[[bytes], bytes]]] = [
+        ('legacy default thread pool', None, legacy_resize),
+        (f'thread pool x{workers}, no draft', thread_pool, resize_no_draft),
+        (f'thread pool x{workers}, draft', thread_pool, resize_draft),
+        (f'process pool x{workers}, no draft', process_pool, resize_no_draft),
+        (f'process pool x{workers}, draft', process_pool, resize_draft),
+    ]
+
+    print(f'{concurrency} concurrent resizes, best of {rounds} rounds')  # noqa: T201
+    print(f'{"frame":<6} {"case":<32} {"total, s":>9} {"max loop lag, ms":>17}')  # noqa: T201
+    for frame_name, size in FRAME_SIZES.items():
+        frame = make_frame(size)
+        for case_name, executor, func in cases:
+            results = [
+                await run_case(executor, func, frame, concurrency)
+                for _ in range(rounds)
+            ]
+            elapsed, lag = min(results)
+            print(  # noqa: T201
+                f'{frame_name:<6} {case_name:<32} {elapsed:>9.3f} {lag * 1000:>17.1f}'
+            )
+
+    thread_pool.shutdown()
+    process_pool.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.rounds, args.workers))
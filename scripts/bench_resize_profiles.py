@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Micro-benchmark CPU cost of snapshot resize profiles.
+
+Resizes 2MP/4MP/8MP frames with every resize profile from the
+`image_processing` config section, with draft decoding as configured and
+forced off, and reports CPU time per snapshot and output size.
+
+Run from the repository root, configs are loaded as for the bot itself:
+
+    python scripts/bench_resize_profiles.py --iterations 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_image_resize import FRAME_SIZES, make_frame
+
+from hikcamerabot.config.config import main_conf
+from hikcamerabot.config.schemas.main_config import ResizeProfileSchema
+from hikcamerabot.utils.image import resize_jpeg
+
+
+def measure(
+    frame: bytes, profile: ResizeProfileSchema, iterations: int
+) -> tuple[float, int]:
+    """Return CPU time in milliseconds per resize and resized snapshot size."""
+    resized = resize_jpeg(frame, profile)
+    started = time.process_time()
+    for _ in range(iterations):
+        resize_jpeg(frame, profile)
+    return (time.process_time() - started) / iterations * 1000, len(resized)
+
+
+def main(iterations: int) -> None:
+    profiles = main_conf.image_processing.profiles
+    print(  # noqa: T201
+        f'{"frame":<6} {"profile":<16} {"draft":<6} {"CPU ms":>8} {"size, KB":>9}'
+    )
+    for frame_name, size in FRAME_SIZES.items():
+        frame = make_frame(size)
+        for profile_name, profile in profiles.items():
+            variants = [profile]
+            if profile.draft:
+                variants.append(profile.model_copy(update={'draft': False}))
+            for variant in variants:
+                cpu_ms, resized_size = measure(frame, variant, iterations)
+                print(  # noqa: T201
+                    f'{frame_name:<6} {profile_name:<16} {variant.draft!s:<6} '
+                    f'{cpu_ms:>8.1f} {resized_size / 1024:>9.1f}'
+                )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    main(parser.parse_args().iterations)
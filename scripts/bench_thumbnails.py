@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Benchmark DVR segment thumbnail generation for 1/10/100 segments.
+
+Compares the legacy path (one full-decode ffmpeg per segment, all started at
+once like `DvrUploadEngine` did) with keyframe-only thumbnails made one by
+one and in batches. Reports wall time and CPU time of ffmpeg processes.
+
+Test segments are generated with ffmpeg `testsrc2` into a temporary
+directory, requires `ffmpeg` in `PATH`:
+
+    python scripts/bench_thumbnails.py --duration 60 --counts 1 10 100
+"""
+
+import argparse
+import asyncio
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from hikcamerabot.common.video.tasks.thumbnail import (
+    MakeThumbnailBatchTask,
+    MakeThumbnailTask,
+    ThumbnailJob,
+)
+
+LEGACY_CMD = 'ffmpeg -y -loglevel error -i {filepath} -vframes 1 -q:v 31 {thumbpath}'
+
+
+async def run_shell(cmd: str) -> None:
+    proc = await asyncio.create_subprocess_shell(
+        cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+    )
+    if await proc.wait():
+        raise RuntimeError(f'Command failed: {cmd}')
+
+
+async def make_segment(path: Path, duration: int) -> None:
+    """Make 1080p H.264 segment with 2s GOP like a typical camera stream."""
+    await run_shell(
+        'ffmpeg -y -loglevel error -f lavfi '
+        f'-i testsrc2=size=1920x1080:rate=25:duration={duration} '
+        f'-c:v libx264 -preset ultrafast -g 50 {path}'
+    )
+
+
+async def legacy(jobs: list[ThumbnailJob]) -> None:
+    await asyncio.gather(
+        *(
+            run_shell(
+                LEGACY_CMD.format(filepath=job.file_path, thumbpath=job.thumbnail_path)
+            )
+            for job in jobs
+        )
+    )
+
+
+async def keyframe_one_by_one(jobs: list[ThumbnailJob]) -> None:
+    await asyncio.gather(
+        *(
+            MakeThumbnailTask(
+                job.thumbnail_path, job.file_path, duration=job.duration
+            ).run()
+            for job in jobs
+        )
+    )
+
+
+async def keyframe_batched(jobs: list[ThumbnailJob]) -> None:
+    await MakeThumbnailBatchTask(jobs).run()
+
+
+def children_cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+async def measure(
+    func: Callable[[list[ThumbnailJob]], Awaitable[None]], jobs: list[ThumbnailJob]
+) -> tuple[float, float]:
+    cpu_started = children_cpu_time()
+    started = time.perf_counter()
+    await func(jobs)
+    return time.perf_counter() - started, children_cpu_time() - cpu_started
+
+
+async def main(duration: int, counts: list[int]) -> None:
+    if not shutil.which('ffmpeg'):
+        sys.exit('ffmpeg not found')
+
+    cases: list[tuple[str, Callable[[list[ThumbnailJob]], Awaitable[None]]]] = [
+        ('legacy full decode', legacy),
+        ('keyframe one by one', keyframe_one_by_one),
+        (f'keyframe batched x{MakeThumbnailBatchTask.BATCH_SIZE}', keyframe_batched),
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        segment = tmp_path / 'segment.mp4'
+        await make_segment(segment, duration)
+
+        print(f'{"segments":>8} {"case":<24} {"wall, s":>8} {"CPU, s":>8}')  # noqa: T201
+        for count in counts:
+            segments = []
+            for idx in range(count):
+                # Distinct paths with the same content, like segments of one camera.
+                path = tmp_path / f'segment-{idx}.mp4'
+                if not path.exists():
+                    path.hardlink_to(segment)
+                segments.append(path)
+            for case_name, func in cases:
+                jobs = [
+                    ThumbnailJob(path, path.with_suffix('.jpg'), duration)
+                    for path in segments
+                ]
+                wall, cpu = await measure(func, jobs)
+                print(f'{count:>8} {case_name:<24} {wall:>8.2f} {cpu:>8.2f}')  # noqa: T201
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--duration', type=int, default=60)
+    parser.add_argument('--counts', type=int, nargs='+', default=[1, 10, 100])
+    args = parser.parse_args()
+    asyncio.run(main(args.duration, args.counts))
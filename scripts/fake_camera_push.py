@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+r"""Fake camera pushing detection events to the bot alert HTTP listener.
+
+Sends one event as a device does: `active` notifications with growing
+`activePostCount` every second for `--duration` seconds and `inactive` one
+at the end, along with `videoloss` heartbeats. With `--picture` every
+`active` notification is `multipart/form-data` with a generated 2MP JPEG,
+like devices with "Upload picture" event linkage.
+
+Point the fake camera to the listener path, ending with `token` if it's set.
+The listener matches events by the sender address, so run it from the host
+of a configured camera (`api.host`) or enable `trust_reported_address` and
+set `--ip-address` to that host:
+
+    python scripts/fake_camera_push.py http://127.0.0.1:8090/alerts/s3cr3t \
+        --ip-address 192.168.1.1 --event-type VMD --duration 10 --picture
+"""
+
+import argparse
+import asyncio
+import uuid
+from datetime import datetime
+from io import BytesIO
+
+import httpx
+from PIL import Image
+
+EVENT_TPL = (
+    '<?xml version="1.0" encoding="UTF-8"?>\r\n'
+    '<EventNotificationAlert version="2.0" '
+    'xmlns="http://www.hikvision.com/ver20/XMLSchema">\r\n'
+    '<ipAddress>{ip_address}</ipAddress>\r\n'
+    '<portNo>80</portNo>\r\n'
+    '<protocol>HTTP</protocol>\r\n'
+    '<channelID>{channel}</channelID>\r\n'
+    '<dateTime>{date_time}</dateTime>\r\n'
+    '<activePostCount>{post_count}</activePostCount>\r\n'
+    '<eventType>{event_type}</eventType>\r\n'
+    '<eventState>{state}</eventState>\r\n'
+    '<eventDescription>{event_type} alarm</eventDescription>\r\n'
+    '<channelName>{channel_name}</channelName>\r\n'
+    '</EventNotificationAlert>\r\n'
+)
+
+
+def make_event(
+    args: argparse.Namespace, event_type: str, state: str, post_count: int
+) -> bytes:
+    return EVENT_TPL.format(
+        ip_address=args.ip_address,
+        channel=args.channel,
+        date_time=datetime.now().astimezone().isoformat(timespec='seconds'),
+        post_count=post_count,
+        event_type=event_type,
+        state=state,
+        channel_name=args.channel_name,
+    ).encode()
+
+
+def make_picture(size: tuple[int, int] = (1920, 1080)) -> bytes:
+    buf = BytesIO()
+    Image.effect_noise(size, 40).convert('RGB').save(buf, format='JPEG', quality=80)
+    return buf.getvalue()
+
+
+def make_multipart(event_type: str, event: bytes, picture: bytes) -> tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts = (
+        (f'Content-Disposition: form-data; name="{event_type}.xml"', event),
+        (
+            (
+                'Content-Disposition: form-data; name="detectionPicture.jpg"; '
+                'filename="detectionPicture.jpg"\r\nContent-Type: image/jpeg'
+            ),
+            picture,
+        ),
+    )
+    body = b''.join(
+        b'--%s\r\n%s\r\nContent-Length: %d\r\n\r\n%s\r\n'
+        % (boundary.encode(), headers.encode(), len(data), data)
+        for headers, data in parts
+    )
+    body += b'--%s--\r\n' % boundary.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+async def post(
+    client: httpx.AsyncClient, url: str, body: bytes, content_type: str
+) -> None:
+    response = await client.post(
+        url, content=body, headers={'Content-Type': content_type}
+    )
+    print(f'{datetime.now():%H:%M:%S} {len(body):>8} bytes -> {response.status_code}')  # noqa: T201, DTZ005
+
+
+async def main(args: argparse.Namespace) -> None:
+    picture = make_picture() if args.picture else None
+    async with httpx.AsyncClient() as client:
+        for post_count in range(1, args.duration + 1):
+            event = make_event(args, args.event_type, 'active', post_count)
+            if picture:
+                await post(
+                    client, args.url, *make_multipart(args.event_type, event, picture)
+                )
+            else:
+                await post(client, args.url, event, 'application/xml')
+            heartbeat = make_event(args, 'videoloss', 'inactive', 0)
+            await post(client, args.url, heartbeat, 'application/xml')
+            await asyncio.sleep(1)
+        event = make_event(args, args.event_type, 'inactive', 0)
+        await post(client, args.url, event, 'application/xml')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('url')
+    parser.add_argument('--ip-address', default='127.0.0.1')
+    parser.add_argument('--event-type', default='VMD')
+    parser.add_argument('--channel', type=int, default=1)
+    parser.add_argument('--channel-name', default='Camera 01')
+    parser.add_argument('--duration', type=int, default=5)
+    parser.add_argument('--picture', action='store_true')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,34 @@
+"""Test session setup.
+
+The bot loads its configs on import, so missing ones are made from the
+templates for the test session and removed afterwards.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+_CONFIGS_DIR = Path(__file__).parent.parent / 'configs'
+_TEMPLATE_SUFFIX = '-template.json'
+
+_created_configs: list[Path] = []
+
+
+def pytest_configure(config: pytest.Config) -> None:  # noqa: ARG001
+    for template in sorted(_CONFIGS_DIR.glob(f'*{_TEMPLATE_SUFFIX}')):
+        path = template.with_name(template.name.replace(_TEMPLATE_SUFFIX, '.json'))
+        if path.exists():
+            continue
+        conf = json.loads(template.read_text())
+        if path.name == 'config.json':
+            # Template leaves NVR channel name empty to be filled in.
+            for cam_conf in conf['camera_list'].values():
+                cam_conf['nvr']['channel_name'] = None
+        path.write_text(json.dumps(conf))
+        _created_configs.append(path)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:  # noqa: ARG001
+    for path in _created_configs:
+        path.unlink(missing_ok=True)
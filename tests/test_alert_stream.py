@@ -0,0 +1,155 @@
+from hikcamerabot.clients.hikvision.alert_stream import (
+    AlertStreamEvent,
+    AlertStreamParser,
+    AlertStreamStats,
+    get_boundary,
+)
+from hikcamerabot.clients.hikvision.enums import AlertEventState
+
+BOUNDARY = b'boundary'
+JPEG = b'\xff\xd8\xff\xe0fake-jpeg\r\n--not-a-delimiter\xff\xd9'
+
+
+def make_event(
+    event_type: str = 'VMD', state: str = 'active', channel_id: int = 1
+) -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\r\n'
+        '<EventNotificationAlert version="2.0">\r\n'
+        '<ipAddress>192.0.2.1</ipAddress>\r\n'
+        f'<channelID>{channel_id}</channelID>\r\n'
+        '<dateTime>2024-01-01T12:00:00+03:00</dateTime>\r\n'
+        '<activePostCount>1</activePostCount>\r\n'
+        f'<eventType>{event_type}</eventType>\r\n'
+        f'<eventState>{state}</eventState>\r\n'
+        '<channelName>Camera 01</channelName>\r\n'
+        '</EventNotificationAlert>\r\n'
+    ).encode()
+
+
+def make_heartbeat() -> bytes:
+    return make_event('videoloss', 'inactive')
+
+
+def make_part(
+    body: bytes, content_type: bytes = b'application/xml', with_length: bool = True
+) -> bytes:
+    headers = b'Content-Type: %s\r\n' % content_type
+    if with_length:
+        headers += b'Content-Length: %d\r\n' % len(body)
+    return b'--%s\r\n%s\r\n%s\r\n' % (BOUNDARY, headers, body)
+
+
+def feed(
+    parser: AlertStreamParser, data: bytes, chunk_size: int | None = None
+) -> list[AlertStreamEvent]:
+    if chunk_size is None:
+        return parser.feed(data)
+    events = []
+    for i in range(0, len(data), chunk_size):
+        events.extend(parser.feed(data[i : i + chunk_size]))
+    return events
+
+
+def test_get_boundary() -> None:
+    assert get_boundary('multipart/mixed; boundary="abc"') == b'abc'
+    assert get_boundary('Multipart/Mixed; charset=utf-8; Boundary=abc') == b'abc'
+    assert get_boundary('multipart/mixed') == b'boundary'
+    assert get_boundary('application/xml') is None
+    assert get_boundary(None) is None
+
+
+def test_event_fields() -> None:
+    (event,) = AlertStreamParser().feed(make_part(make_event()))
+    assert event.event_type == 'VMD'
+    assert event.state is AlertEventState.ACTIVE
+    assert event.is_active
+    assert event.channel_id == 1
+    assert event.dyn_channel_id is None
+    assert event.channel_name == 'Camera 01'
+    assert event.active_post_count == 1
+    assert event.ip_address == '192.0.2.1'
+    assert event.timestamp.isoformat() == '2024-01-01T12:00:00+03:00'
+    assert event.image is None
+
+
+def test_split_input() -> None:
+    stream = b''.join(
+        make_part(make_event(channel_id=channel_id)) for channel_id in range(1, 4)
+    )
+    for chunk_size in (None, 1, 7, 100):
+        parser = AlertStreamParser()
+        events = feed(parser, stream, chunk_size)
+        assert [e.channel_id for e in events] == [1, 2, 3]
+
+
+def test_missing_content_length() -> None:
+    stream = make_part(make_event(), with_length=False) + make_part(
+        make_event(channel_id=2), with_length=False
+    )
+    for chunk_size in (None, 1):
+        events = feed(AlertStreamParser(), stream, chunk_size)
+        assert [e.channel_id for e in events] == [1, 2]
+
+
+def test_heartbeats_are_counted_and_skipped() -> None:
+    stats = AlertStreamStats()
+    parser = AlertStreamParser(stats=stats)
+    stream = make_part(make_heartbeat()) * 3 + make_part(make_event())
+    events = feed(parser, stream, chunk_size=1)
+    assert [e.event_type for e in events] == ['VMD']
+    assert stats.heartbeats_total == 3
+    assert stats.events_total == 1
+    assert stats.bytes_total == len(stream)
+
+
+def test_bare_documents() -> None:
+    stream = make_event() + make_heartbeat() + make_event(channel_id=2)
+    events = feed(AlertStreamParser(boundary=None), stream, chunk_size=1)
+    assert [e.channel_id for e in events] == [1, 2]
+
+
+def test_smart_event_is_held_for_picture() -> None:
+    stats = AlertStreamStats()
+    parser = AlertStreamParser(stats=stats)
+    stream = make_part(make_event('linedetection')) + make_part(
+        JPEG, content_type=b'image/jpeg'
+    )
+    events = feed(parser, stream, chunk_size=1)
+    assert len(events) == 1
+    assert events[0].event_type == 'linedetection'
+    assert bytes(events[0].image) == JPEG
+    assert stats.images_total == 1
+    assert not parser.flush()
+
+
+def test_held_event_is_released_by_next_part_or_flush() -> None:
+    parser = AlertStreamParser()
+    assert not parser.feed(make_part(make_event('fielddetection')))
+    events = parser.feed(make_part(make_event()))
+    assert [e.event_type for e in events] == ['fielddetection', 'VMD']
+    assert events[0].image is None
+
+    assert not parser.feed(make_part(make_event('fielddetection')))
+    (event,) = parser.flush()
+    assert event.event_type == 'fielddetection'
+    assert not parser.flush()
+
+
+def test_picture_of_emitted_event_is_dropped() -> None:
+    parser = AlertStreamParser()
+    (first,) = parser.feed(make_part(make_event()))
+    assert not parser.feed(make_part(JPEG, content_type=b'image/jpeg'))
+    assert first.image is None
+
+    # Event type is learnt to come with a picture, next events wait for it.
+    assert not parser.feed(make_part(make_event()))
+    (second,) = parser.feed(make_part(JPEG, content_type=b'image/jpeg'))
+    assert bytes(second.image) == JPEG
+
+
+def test_picture_after_heartbeat_is_dropped() -> None:
+    parser = AlertStreamParser()
+    stream = make_part(make_heartbeat()) + make_part(JPEG, content_type=b'image/jpeg')
+    assert not parser.feed(stream)
+    assert not parser.flush()
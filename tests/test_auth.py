@@ -0,0 +1,120 @@
+import re
+
+import httpx
+import pytest
+
+from hikcamerabot.clients.hikvision.auth import DigestAuthCached
+
+URL = 'http://192.0.2.1:80/ISAPI/System/status'
+
+
+class DigestServer:
+    """Mock transport handler checking nonce only, not the digest itself."""
+
+    def __init__(self) -> None:
+        self.nonce = 'nonce1'
+        self.stale_nonces: set[str] = set()
+        self.requests: list[dict[str, str]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = dict(
+            re.findall(r'(\w+)="?([^",]+)"?', request.headers.get('authorization', ''))
+        )
+        self.requests.append(params)
+        if params.get('nonce') == self.nonce:
+            return httpx.Response(200)
+        stale = ', stale=true' if params.get('nonce') in self.stale_nonces else ''
+        return httpx.Response(
+            401,
+            headers={
+                'WWW-Authenticate': (
+                    f'Digest realm="DS", nonce="{self.nonce}", qop="auth"{stale}'
+                )
+            },
+        )
+
+    def rotate_nonce(self, nonce: str) -> None:
+        self.stale_nonces.add(self.nonce)
+        self.nonce = nonce
+
+
+@pytest.fixture(autouse=True)
+def hosts(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(DigestAuthCached, '_HOSTS', {})
+
+
+def make_client(server: DigestServer, username: str = 'admin') -> httpx.Client:
+    return httpx.Client(
+        auth=DigestAuthCached(username, 'password'),
+        transport=httpx.MockTransport(server),
+    )
+
+
+def test_challenge_is_cached() -> None:
+    server = DigestServer()
+    with make_client(server) as client:
+        for _ in range(3):
+            assert client.get(URL).status_code == 200
+    assert [r.get('nc') for r in server.requests] == [
+        None,
+        '00000001',
+        '00000002',
+        '00000003',
+    ]
+    stats = DigestAuthCached.get_stats(httpx.URL(URL), 'admin')
+    assert stats.as_dict() == {
+        'requests_total': 3,
+        'preemptive_total': 2,
+        'retries_total': 1,
+        'stale_total': 0,
+    }
+
+
+def test_challenge_is_shared_by_clients_of_host() -> None:
+    server = DigestServer()
+    with make_client(server) as client:
+        client.get(URL)
+    with make_client(server) as client:
+        assert client.get(URL).status_code == 200
+    with make_client(server, username='operator') as client:
+        assert client.get(URL).status_code == 200
+    assert [r.get('nc') for r in server.requests] == [
+        None,
+        '00000001',
+        '00000002',
+        None,
+        '00000001',
+    ]
+
+
+def test_stale_nonce_retry_resets_nonce_count() -> None:
+    server = DigestServer()
+    with make_client(server) as client:
+        client.get(URL)
+        client.get(URL)
+        server.rotate_nonce('nonce2')
+        assert client.get(URL).status_code == 200
+        assert client.get(URL).status_code == 200
+    assert [(r.get('nonce'), r.get('nc')) for r in server.requests[-3:]] == [
+        ('nonce1', '00000003'),
+        ('nonce2', '00000001'),
+        ('nonce2', '00000002'),
+    ]
+    stats = DigestAuthCached.get_stats(httpx.URL(URL), 'admin')
+    assert stats.retries_total == 2
+    assert stats.stale_total == 1
+
+
+def test_rejected_credentials_are_retried_once() -> None:
+    server = DigestServer()
+    server.nonce = 'never-accepted'
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        response = server(request)
+        return httpx.Response(401, headers=response.headers)
+
+    with httpx.Client(
+        auth=DigestAuthCached('admin', 'wrong'), transport=httpx.MockTransport(handler)
+    ) as client:
+        assert client.get(URL).status_code == 401
+    assert len(server.requests) == 2
@@ -0,0 +1,19 @@
+from hikcamerabot.utils.backoff import ExponentialBackoff
+
+
+def test_delays_grow_up_to_cap() -> None:
+    backoff = ExponentialBackoff(base=0.5, cap=60.0)
+    delays = [backoff.next_delay() for _ in range(5000)]
+    assert backoff.attempt == 5000
+    assert all(0.25 <= delay <= 60.0 for delay in delays)
+    assert 0.25 <= delays[0] <= 0.5
+    assert all(delay >= 30.0 for delay in delays[10:])
+
+
+def test_reset() -> None:
+    backoff = ExponentialBackoff(base=1.0, cap=10.0)
+    for _ in range(2000):
+        backoff.next_delay()
+    backoff.reset()
+    assert backoff.attempt == 0
+    assert 0.5 <= backoff.next_delay() <= 1.0
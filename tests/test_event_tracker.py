@@ -0,0 +1,96 @@
+import pytest
+
+from hikcamerabot.clients.hikvision.alert_stream import AlertStreamEvent
+from hikcamerabot.clients.hikvision.enums import AlertEventState
+from hikcamerabot.enums import DetectionType
+from hikcamerabot.services.alarm.camera import event_tracker
+from hikcamerabot.services.alarm.camera.event_tracker import AlertEventTracker
+
+MOTION = DetectionType.MOTION
+LINE = DetectionType.LINE
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(event_tracker.time, 'time', clock)
+    return clock
+
+
+def make_event(
+    state: AlertEventState = AlertEventState.ACTIVE,
+    active_post_count: int | None = 1,
+) -> AlertStreamEvent:
+    return AlertStreamEvent(
+        event_type='VMD',
+        state=state,
+        channel_id=1,
+        dyn_channel_id=None,
+        channel_name=None,
+        timestamp=None,
+        active_post_count=active_post_count,
+    )
+
+
+def test_repeated_notifications_are_one_event(clock: Clock) -> None:
+    tracker = AlertEventTracker()
+    assert tracker.update(MOTION, make_event(active_post_count=1))
+    for post_count in range(2, 5):
+        clock.now += 1
+        assert not tracker.update(MOTION, make_event(active_post_count=post_count))
+    assert tracker.expected_end_at == clock.now + AlertEventTracker.END_TIMEOUT
+
+
+def test_event_types_are_tracked_separately(clock: Clock) -> None:
+    tracker = AlertEventTracker()
+    assert tracker.update(MOTION, make_event())
+    assert tracker.update(LINE, make_event())
+    clock.now += 1
+    assert not tracker.update(LINE, make_event(active_post_count=2))
+
+
+def test_new_event_after_inactive(clock: Clock) -> None:
+    tracker = AlertEventTracker()
+    assert tracker.update(MOTION, make_event())
+    clock.now += 1
+    assert not tracker.update(MOTION, make_event(AlertEventState.INACTIVE))
+    assert tracker.expected_end_at == clock.now
+    clock.now += 1
+    assert tracker.update(MOTION, make_event(active_post_count=2))
+
+
+def test_new_event_after_timeout(clock: Clock) -> None:
+    tracker = AlertEventTracker()
+    assert tracker.update(MOTION, make_event())
+    clock.now += AlertEventTracker.END_TIMEOUT + 1
+    assert tracker.update(MOTION, make_event(active_post_count=2))
+
+
+def test_new_event_on_post_count_reset(clock: Clock) -> None:
+    tracker = AlertEventTracker()
+    assert tracker.update(MOTION, make_event(active_post_count=3))
+    clock.now += 1
+    assert tracker.update(MOTION, make_event(active_post_count=1))
+    clock.now += 1
+    # Unknown post count continues the event.
+    assert not tracker.update(MOTION, make_event(active_post_count=None))
+
+
+def test_inactive_without_event(clock: Clock) -> None:
+    tracker = AlertEventTracker()
+    assert not tracker.update(MOTION, make_event(AlertEventState.INACTIVE))
+    assert tracker.expected_end_at < clock.now
+
+    # Inactive notification of an already timed out event ends nothing.
+    assert tracker.update(MOTION, make_event())
+    clock.now += AlertEventTracker.END_TIMEOUT + 1
+    assert not tracker.update(MOTION, make_event(AlertEventState.INACTIVE))
+    assert tracker.expected_end_at < clock.now
@@ -0,0 +1,74 @@
+import asyncio
+from io import BytesIO
+from types import SimpleNamespace
+
+from hikcamerabot.event_engine.fanout import AlertFanOut, MediaType
+
+CHAT_IDS = [1, 2, 3]
+
+
+class FakeTelegram:
+    def __init__(self) -> None:
+        self.rejected_file_ids: set[str] = set()
+        self.sent: list[tuple[int, str]] = []
+        self._uploads = 0
+
+    async def send(self, chat_id: int, media: MediaType) -> SimpleNamespace:
+        if isinstance(media, str):
+            if media in self.rejected_file_ids:
+                raise ValueError(media)
+            self.sent.append((chat_id, media))
+            return SimpleNamespace(file_id=media)
+        self._uploads += 1
+        file_id = f'file_{self._uploads}'
+        self.sent.append((chat_id, 'upload'))
+        return SimpleNamespace(file_id=file_id)
+
+    @staticmethod
+    def get_file_id(message: SimpleNamespace | None) -> str | None:
+        return message.file_id if message else None
+
+
+def make_fanout() -> AlertFanOut:
+    fanout = AlertFanOut(chat_ids=CHAT_IDS)
+    fanout.RETRY_ATTEMPTS = 1
+    return fanout
+
+
+def test_media_is_uploaded_once_and_cached() -> None:
+    async def main() -> None:
+        fanout = make_fanout()
+        telegram = FakeTelegram()
+        for _ in range(2):
+            await fanout.send(
+                'key', BytesIO(b'jpeg'), telegram.send, telegram.get_file_id
+            )
+        assert telegram.sent == [
+            (1, 'upload'),
+            (2, 'file_1'),
+            (3, 'file_1'),
+            (1, 'file_1'),
+            (2, 'file_1'),
+            (3, 'file_1'),
+        ]
+
+    asyncio.run(main())
+
+
+def test_rejected_cached_file_id_is_uploaded_again() -> None:
+    async def main() -> None:
+        fanout = make_fanout()
+        telegram = FakeTelegram()
+        await fanout.send('key', BytesIO(b'jpeg'), telegram.send, telegram.get_file_id)
+        telegram.rejected_file_ids.add('file_1')
+        telegram.sent.clear()
+
+        await fanout.send('key', BytesIO(b'jpeg'), telegram.send, telegram.get_file_id)
+        assert telegram.sent == [(1, 'upload'), (2, 'file_2'), (3, 'file_2')]
+
+        # New file ID replaces the rejected one in the cache.
+        telegram.sent.clear()
+        await fanout.send('key', BytesIO(b'jpeg'), telegram.send, telegram.get_file_id)
+        assert telegram.sent == [(1, 'file_2'), (2, 'file_2'), (3, 'file_2')]
+
+    asyncio.run(main())
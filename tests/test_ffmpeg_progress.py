@@ -0,0 +1,116 @@
+import asyncio
+
+from hikcamerabot.utils.ffmpeg_progress import (
+    FfmpegProgress,
+    FfmpegProgressMonitor,
+    FfmpegProgressParser,
+)
+
+BLOCK = """\
+frame=250
+fps=25.02
+stream_0_0_q=-1.0
+bitrate=1024.5kbits/s
+total_size=1280000
+out_time_us=10000000
+out_time_ms=10000000
+out_time=00:00:10.000000
+dup_frames=1
+drop_frames=2
+speed=1.01x
+progress=continue
+"""
+
+
+def feed(parser: FfmpegProgressParser, text: str) -> list[FfmpegProgress]:
+    return [p for line in text.splitlines() if (p := parser.feed(line))]
+
+
+def make_progress(out_time_us: int | None) -> FfmpegProgress:
+    return FfmpegProgress(
+        frame=0,
+        fps=0.0,
+        bitrate=None,
+        total_size=None,
+        out_time_us=out_time_us,
+        dup_frames=0,
+        drop_frames=0,
+        speed=None,
+        is_end=False,
+    )
+
+
+def test_block() -> None:
+    assert feed(FfmpegProgressParser(), BLOCK) == [
+        FfmpegProgress(
+            frame=250,
+            fps=25.02,
+            bitrate=1024.5,
+            total_size=1280000,
+            out_time_us=10000000,
+            dup_frames=1,
+            drop_frames=2,
+            speed=1.01,
+            is_end=False,
+        )
+    ]
+
+
+def test_blocks_are_not_mixed() -> None:
+    parser = FfmpegProgressParser()
+    text = BLOCK + 'frame=300\nbitrate=N/A\nspeed=N/A\nprogress=end\n'
+    first, last = feed(parser, text)
+    assert first.frame == 250
+    assert last.frame == 300
+    assert last.is_end
+    assert last.bitrate is None
+    assert last.speed is None
+    # Values of the previous block are not carried over.
+    assert last.total_size is None
+    assert last.out_time_us is None
+    assert last.drop_frames == 0
+
+
+def test_garbage_lines() -> None:
+    parser = FfmpegProgressParser()
+    text = 'some log line\n\nfps=abc\nout_time_us=N/A\nprogress=continue\n'
+    (progress,) = feed(parser, text)
+    assert progress.fps == 0.0
+    assert progress.out_time_us is None
+    assert progress.frame == 0
+
+
+def test_monitor_advances_only_on_out_time_growth() -> None:
+    monitor = FfmpegProgressMonitor()
+    monitor.update(make_progress(None))
+    assert monitor.first_advanced_at is None
+
+    monitor.update(make_progress(1000))
+    first_advanced_at = monitor.first_advanced_at
+    assert first_advanced_at is not None
+    assert monitor.last_advanced_at == first_advanced_at
+
+    monitor.update(make_progress(1000))
+    monitor.update(make_progress(500))
+    assert monitor.last_advanced_at == first_advanced_at
+
+    monitor.update(make_progress(2000))
+    assert monitor.first_advanced_at == first_advanced_at
+    assert monitor.last_advanced_at >= first_advanced_at
+    assert monitor.progress.out_time_us == 2000
+
+
+def test_monitor_stall() -> None:
+    async def main() -> None:
+        monitor = FfmpegProgressMonitor()
+        stall_task = asyncio.create_task(monitor.wait_stall(0.1))
+        flowing_task = asyncio.create_task(monitor.wait_flowing())
+        for out_time_us in range(1, 6):
+            await asyncio.sleep(0.05)
+            monitor.update(make_progress(out_time_us))
+            assert not stall_task.done()
+        assert flowing_task.done()
+        async with asyncio.timeout(1):
+            await stall_task
+
+    asyncio.run(main())
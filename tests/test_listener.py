@@ -0,0 +1,239 @@
+import asyncio
+import socket
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from hikcamerabot.clients.hikvision.alert_stream import (
+    AlertStreamEvent,
+    AlertStreamStats,
+)
+from hikcamerabot.config.schemas.main_config import AlertListenerSchema
+from hikcamerabot.services.alarm.listener import AlertHttpListener
+from hikcamerabot.services.alarm.multiplexer import AlertStreamMultiplexer
+
+TOKEN = 's3cr3t'
+JPEG = b'\xff\xd8\xff\xe0fake-jpeg\xff\xd9'
+
+
+def make_event(event_type: str = 'VMD', ip_address: str = '127.0.0.1') -> bytes:
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\r\n'
+        '<EventNotificationAlert version="2.0">\r\n'
+        f'<ipAddress>{ip_address}</ipAddress>\r\n'
+        '<channelID>1</channelID>\r\n'
+        '<activePostCount>1</activePostCount>\r\n'
+        f'<eventType>{event_type}</eventType>\r\n'
+        '<eventState>active</eventState>\r\n'
+        '</EventNotificationAlert>\r\n'
+    ).encode()
+
+
+def make_multipart(event: bytes, picture: bytes) -> tuple[bytes, str]:
+    boundary = b'MIME_boundary'
+    body = (
+        b'--%s\r\nContent-Disposition: form-data; name="linedetection.xml"\r\n'
+        b'Content-Type: application/xml\r\nContent-Length: %d\r\n\r\n%s\r\n'
+        b'--%s\r\nContent-Disposition: form-data; name="detectionPicture.jpg"\r\n'
+        b'Content-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n%s\r\n'
+        b'--%s--\r\n'
+    ) % (boundary, len(event), event, boundary, len(picture), picture, boundary)
+    return body, f'multipart/form-data; boundary={boundary.decode()}'
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class FakeSource:
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.source_id = f'source_{host}'
+        self.stream_stats = AlertStreamStats()
+        self.events: list[AlertStreamEvent] = []
+        self.http_hosts: list[tuple[str, int, str]] = []
+
+    def __str__(self) -> str:
+        return self.source_id
+
+    async def set_http_host(self, address: str, port: int, path: str) -> None:
+        self.http_hosts.append((address, port, path))
+
+    def get_camera(self, event: AlertStreamEvent) -> str:  # noqa: ARG002
+        return 'cam_1'
+
+    def process_event(self, cam: str, event: AlertStreamEvent) -> None:  # noqa: ARG002
+        self.events.append(event)
+
+
+async def wait_for(predicate: Callable[[], bool], max_wait: float = 2.0) -> None:
+    async with asyncio.timeout(max_wait):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+def run_listener(
+    test: Callable[[httpx.AsyncClient, FakeSource, str], Awaitable[None]],
+    source_host: str = '127.0.0.1',
+    **conf_kwargs,
+) -> None:
+    async def main() -> None:
+        conf = AlertListenerSchema(
+            enabled=True,
+            host='127.0.0.1',
+            port=get_free_port(),
+            public_address='192.0.2.10',
+            token=TOKEN,
+            **conf_kwargs,
+        )
+        multiplexer = AlertStreamMultiplexer(listener_conf=conf)
+        multiplexer.start()
+        source = FakeSource(source_host)
+        multiplexer.add_source(source)
+        listener = AlertHttpListener(conf=conf, multiplexer=multiplexer)
+        await listener.start()
+        try:
+            async with httpx.AsyncClient() as client:
+                await test(client, source, f'http://127.0.0.1:{conf.port}')
+        finally:
+            await listener.stop()
+            multiplexer.remove_source(source.source_id)
+
+    asyncio.run(main())
+
+
+def test_bare_xml_event() -> None:
+    async def test(client: httpx.AsyncClient, source: FakeSource, url: str) -> None:
+        response = await client.post(
+            f'{url}/alerts/{TOKEN}',
+            content=make_event(),
+            headers={'Content-Type': 'application/xml'},
+        )
+        assert response.status_code == 200
+        await wait_for(lambda: source.events)
+        assert source.events[0].event_type == 'VMD'
+        assert source.events[0].image is None
+        assert source.stream_stats.events_total == 1
+
+    run_listener(test)
+
+
+def test_multipart_event_with_picture() -> None:
+    async def test(client: httpx.AsyncClient, source: FakeSource, url: str) -> None:
+        body, content_type = make_multipart(make_event('linedetection'), JPEG)
+        response = await client.post(
+            f'{url}/alerts/{TOKEN}',
+            content=body,
+            headers={'Content-Type': content_type},
+        )
+        assert response.status_code == 200
+        await wait_for(lambda: source.events)
+        assert source.events[0].event_type == 'linedetection'
+        assert bytes(source.events[0].image) == JPEG
+
+    run_listener(test)
+
+
+def test_chunked_body_on_kept_alive_connection() -> None:
+    async def test(client: httpx.AsyncClient, source: FakeSource, url: str) -> None:
+        async def chunks() -> AsyncIterator[bytes]:
+            event = make_event('fielddetection')
+            yield event[:10]
+            yield event[10:]
+
+        for _ in range(2):
+            response = await client.post(
+                f'{url}/alerts/{TOKEN}',
+                content=chunks(),
+                headers={'Content-Type': 'application/xml'},
+            )
+            assert response.status_code == 200
+            assert response.headers['connection'] == 'keep-alive'
+        await wait_for(lambda: len(source.events) == 2)
+        assert [e.event_type for e in source.events] == ['fielddetection'] * 2
+
+    run_listener(test)
+
+
+def test_rejected_requests() -> None:
+    async def test(client: httpx.AsyncClient, source: FakeSource, url: str) -> None:
+        assert (await client.get(f'{url}/alerts/{TOKEN}')).status_code == 405
+        for path in ('/alerts', '/alerts/wrong', f'/other/{TOKEN}'):
+            response = await client.post(f'{url}{path}', content=make_event())
+            assert response.status_code == 404
+        await asyncio.sleep(0.05)
+        assert not source.events
+
+    run_listener(test)
+
+
+def test_malformed_and_too_large_requests() -> None:
+    async def send_raw(url: str, request: bytes) -> bytes:
+        host, port = url.removeprefix('http://').split(':')
+        reader, writer = await asyncio.open_connection(host, int(port))
+        writer.write(request)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    async def test(client: httpx.AsyncClient, source: FakeSource, url: str) -> None:  # noqa: ARG001
+        path = f'/alerts/{TOKEN}'.encode()
+        response = await send_raw(
+            url, b'POST %s HTTP/1.1\r\nContent-Length: abc\r\n\r\n' % path
+        )
+        assert response.startswith(b'HTTP/1.1 400 ')
+        response = await send_raw(url, b'GARBAGE\r\n\r\n')
+        assert response.startswith(b'HTTP/1.1 400 ')
+        response = await send_raw(
+            url,
+            b'POST %s HTTP/1.1\r\nContent-Length: %d\r\n\r\n'
+            % (path, AlertHttpListener.MAX_BODY_SIZE + 1),
+        )
+        assert response.startswith(b'HTTP/1.1 413 ')
+        response = await send_raw(
+            url,
+            b'POST %s HTTP/1.1\r\nX-Big: %s\r\n\r\n'
+            % (path, b'x' * AlertHttpListener.MAX_HEADERS_SIZE),
+        )
+        assert response.startswith(b'HTTP/1.1 413 ')
+        assert not source.events
+
+    run_listener(test)
+
+
+def test_reported_address_is_used_only_when_trusted() -> None:
+    async def send(client: httpx.AsyncClient, url: str) -> None:
+        response = await client.post(
+            f'{url}/alerts/{TOKEN}', content=make_event(ip_address='192.0.2.1')
+        )
+        assert response.status_code == 200
+
+    async def untrusted(
+        client: httpx.AsyncClient, source: FakeSource, url: str
+    ) -> None:
+        await send(client, url)
+        await asyncio.sleep(0.05)
+        assert not source.events
+
+    async def trusted(client: httpx.AsyncClient, source: FakeSource, url: str) -> None:
+        await send(client, url)
+        await wait_for(lambda: source.events)
+
+    run_listener(untrusted, source_host='192.0.2.1')
+    run_listener(trusted, source_host='192.0.2.1', trust_reported_address=True)
+
+
+def test_device_configured_by_host_name() -> None:
+    async def test(client: httpx.AsyncClient, source: FakeSource, url: str) -> None:
+        await wait_for(lambda: source.http_hosts)
+        assert source.http_hosts == [
+            ('192.0.2.10', int(url.rsplit(':', maxsplit=1)[-1]), f'/alerts/{TOKEN}')
+        ]
+        response = await client.post(f'{url}/alerts/{TOKEN}', content=make_event())
+        assert response.status_code == 200
+        await wait_for(lambda: source.events)
+
+    run_listener(test, source_host='localhost')
@@ -0,0 +1,119 @@
+import struct
+from pathlib import Path
+
+from hikcamerabot.utils.mp4 import VideoMetadata, read_mp4_metadata
+
+
+def box(type_: bytes, *payload: bytes) -> bytes:
+    data = b''.join(payload)
+    return struct.pack('>I4s', 8 + len(data), type_) + data
+
+
+def large_box(type_: bytes, payload: bytes) -> bytes:
+    return struct.pack('>I4sQ', 1, type_, 16 + len(payload)) + payload
+
+
+def mvhd(duration: int, timescale: int = 1000, version: int = 0) -> bytes:
+    if version == 1:
+        fields = struct.pack('>QQIQ', 0, 0, timescale, duration)
+    else:
+        fields = struct.pack('>IIII', 0, 0, timescale, duration)
+    return box(b'mvhd', bytes((version, 0, 0, 0)), fields, bytes(80))
+
+
+def tkhd(width: int, height: int) -> bytes:
+    # Version 0 fields, reserved, layer, alternate_group, volume and matrix.
+    return box(
+        b'tkhd',
+        bytes(4),
+        bytes(20),
+        bytes(52),
+        struct.pack('>II', width << 16, height << 16),
+    )
+
+
+def hdlr(handler_type: bytes) -> bytes:
+    return box(b'hdlr', bytes(8), handler_type, bytes(12), b'\x00')
+
+
+def stsd(width: int, height: int) -> bytes:
+    entry = box(b'avc1', bytes(24), struct.pack('>HH', width, height), bytes(50))
+    return box(b'stsd', bytes(4), struct.pack('>I', 1), entry)
+
+
+def trak(
+    handler_type: bytes = b'vide',
+    dimensions: tuple[int, int] = (1920, 1080),
+    track_dimensions: tuple[int, int] = (1920, 1080),
+) -> bytes:
+    minf = box(b'minf', box(b'stbl', stsd(*dimensions)))
+    mdia = box(b'mdia', hdlr(handler_type), minf)
+    return box(b'trak', tkhd(*track_dimensions), mdia)
+
+
+def write_mp4(path: Path, *boxes: bytes) -> Path:
+    path.write_bytes(box(b'ftyp', b'isom', bytes(4)) + b''.join(boxes))
+    return path
+
+
+def test_moov_before_mdat(tmp_path: Path) -> None:
+    path = write_mp4(
+        tmp_path / 'a.mp4', box(b'moov', mvhd(10_500), trak()), box(b'mdat', bytes(64))
+    )
+    assert read_mp4_metadata(path) == VideoMetadata(
+        duration=10.5, width=1920, height=1080
+    )
+
+
+def test_moov_after_large_mdat(tmp_path: Path) -> None:
+    path = write_mp4(
+        tmp_path / 'a.mp4',
+        large_box(b'mdat', bytes(64)),
+        box(b'moov', mvhd(2 * 90_000, timescale=90_000, version=1), trak()),
+    )
+    assert read_mp4_metadata(path) == VideoMetadata(
+        duration=2.0, width=1920, height=1080
+    )
+
+
+def test_first_video_track_is_used(tmp_path: Path) -> None:
+    path = write_mp4(
+        tmp_path / 'a.mp4',
+        box(
+            b'moov',
+            mvhd(1000),
+            trak(b'soun', dimensions=(0, 0), track_dimensions=(0, 0)),
+            trak(dimensions=(640, 480)),
+        ),
+    )
+    assert read_mp4_metadata(path) == VideoMetadata(duration=1.0, width=640, height=480)
+
+
+def test_track_header_dimensions_fallback(tmp_path: Path) -> None:
+    path = write_mp4(
+        tmp_path / 'a.mp4',
+        box(b'moov', mvhd(1000), trak(dimensions=(0, 0), track_dimensions=(1280, 720))),
+    )
+    assert read_mp4_metadata(path) == VideoMetadata(
+        duration=1.0, width=1280, height=720
+    )
+
+
+def test_unsupported_files(tmp_path: Path) -> None:
+    moov = box(b'moov', mvhd(1000), trak())
+    cases = {
+        'no_moov': write_mp4(tmp_path / 'a.mp4', box(b'mdat', bytes(64))),
+        # Still being written, `moov` is not complete yet.
+        'truncated': write_mp4(tmp_path / 'b.mp4', box(b'mdat', bytes(8)), moov[:-10]),
+        # Fragmented file has no duration in `moov`.
+        'no_duration': write_mp4(tmp_path / 'c.mp4', box(b'moov', mvhd(0), trak())),
+        'zero_timescale': write_mp4(
+            tmp_path / 'd.mp4', box(b'moov', mvhd(1000, timescale=0), trak())
+        ),
+        'no_video': write_mp4(
+            tmp_path / 'e.mp4', box(b'moov', mvhd(1000), trak(b'soun'))
+        ),
+        'empty': write_mp4(tmp_path / 'f.mp4'),
+    }
+    for name, path in cases.items():
+        assert read_mp4_metadata(path) is None, name
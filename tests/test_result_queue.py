@@ -0,0 +1,56 @@
+import asyncio
+
+from hikcamerabot.config.schemas.main_config import (
+    ResultQueueClassSchema,
+    ResultQueueSchema,
+)
+from hikcamerabot.enums import EventType, QueueOverflowPolicy
+from hikcamerabot.event_engine.events.outbound import SendTextOutboundEvent
+from hikcamerabot.event_engine.queue import ResultQueue
+
+
+def make_queue(policy: QueueOverflowPolicy, maxsize: int = 2) -> ResultQueue:
+    return ResultQueue(
+        conf=ResultQueueSchema(
+            alert=ResultQueueClassSchema(maxsize=maxsize, overflow_policy=policy)
+        )
+    )
+
+
+def alert_text(text: str) -> SendTextOutboundEvent:
+    return SendTextOutboundEvent(event=EventType.SEND_TEXT, text=text)
+
+
+async def drain(queue: ResultQueue) -> list[str]:
+    return [(await queue.get()).text for _ in range(queue.qsize())]
+
+
+def test_coalesce() -> None:
+    async def main() -> None:
+        queue = make_queue(QueueOverflowPolicy.COALESCE)
+        for text in ('a', 'b', 'a', 'c'):
+            await queue.put(alert_text(text))
+        assert await drain(queue) == ['b', 'c']
+        stats = queue.stats()
+        assert stats['coalesced'] == {'alert': 1}
+        assert stats['dropped'] == {'alert': 1}
+        # Nothing to coalesce with, the oldest event was dropped.
+        assert stats['coalesce_fallback'] == {'alert': 1}
+
+    asyncio.run(main())
+
+
+def test_drop_policies() -> None:
+    async def main() -> None:
+        for policy, expected in (
+            (QueueOverflowPolicy.DROP_OLDEST, ['b', 'c']),
+            (QueueOverflowPolicy.DROP_NEWEST, ['a', 'b']),
+        ):
+            queue = make_queue(policy)
+            for text in ('a', 'b', 'c'):
+                await queue.put(alert_text(text))
+            assert await drain(queue) == expected
+            assert queue.stats()['dropped'] == {'alert': 1}
+            assert not queue.stats()['coalesce_fallback']
+
+    asyncio.run(main())